@@ -8,45 +8,88 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_HOST, CONF_NAME, CONF_PORT, CONF_SCAN_INTERVAL
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
 
 from .client import DuepiEvoClient
 from .const import (
+    CONF_AGGREGATE_WINDOW,
     CONF_AUTO_RESET,
+    CONF_CAPABILITIES,
+    CONF_ENDPOINTS,
     CONF_INIT_COMMAND,
     CONF_MAX_TEMP,
     CONF_MIN_TEMP,
     CONF_NOFEEDBACK,
+    CONF_PERSISTENT_CONNECTION,
+    CONF_PIPELINE,
+    CONF_SPAN_EXPORT,
+    CONF_STATISTICS_IMPORT,
+    CYCLE_STORAGE_VERSION,
+    DEFAULT_AGGREGATE_WINDOW,
     DEFAULT_AUTO_RESET,
+    DEFAULT_ENDPOINTS,
     DEFAULT_INIT_COMMAND,
     DEFAULT_MAX_TEMP,
     DEFAULT_MIN_TEMP,
     DEFAULT_NAME,
     DEFAULT_NOFEEDBACK,
+    DEFAULT_PERSISTENT_CONNECTION,
+    DEFAULT_PIPELINE,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_SPAN_EXPORT,
+    DEFAULT_STATISTICS_IMPORT,
     DOMAIN,
+    HEARTBEAT_CHECK_INTERVAL,
     PLATFORMS,
+    STATE_STORAGE_VERSION,
+    STATISTICS_STORAGE_VERSION,
+    entry_unique_id,
 )
-from .coordinator import DuepiEvoCoordinator
+from .coordinator import DuepiEvoCoordinator, cycle_storage_key, state_storage_key
+from .duepi_core import DuepiEvoCapabilities
+from .duepi_core.hooks import NdjsonSpanExporter
+from .duepi_core.transport import create_transport, parse_endpoints
 from .entity_migration import migrate_climate_entity_registry
+from .statistics import HourlyStatisticsCollector, statistics_storage_key
+from .websocket import async_register_websocket_commands
 
 
 def _build_client_from_entry(entry: ConfigEntry) -> DuepiEvoClient:
     """Build a client from a config entry."""
+    host = entry.data[CONF_HOST]
+    port = entry.data[CONF_PORT]
+    persistent = bool(entry.options.get(CONF_PERSISTENT_CONNECTION, DEFAULT_PERSISTENT_CONNECTION))
     return DuepiEvoClient(
-        host=entry.data[CONF_HOST],
-        port=entry.data[CONF_PORT],
+        host=host,
+        port=port,
         min_temp=float(entry.options.get(CONF_MIN_TEMP, DEFAULT_MIN_TEMP)),
         max_temp=float(entry.options.get(CONF_MAX_TEMP, DEFAULT_MAX_TEMP)),
         no_feedback=float(entry.options.get(CONF_NOFEEDBACK, DEFAULT_NOFEEDBACK)),
         auto_reset=bool(entry.options.get(CONF_AUTO_RESET, DEFAULT_AUTO_RESET)),
         init_command=bool(entry.options.get(CONF_INIT_COMMAND, DEFAULT_INIT_COMMAND)),
+        capabilities=DuepiEvoCapabilities.from_dict(entry.data.get(CONF_CAPABILITIES)),
+        pipeline=bool(entry.options.get(CONF_PIPELINE, DEFAULT_PIPELINE)),
+        transport=create_transport(
+            host,
+            port,
+            parse_endpoints(entry.options.get(CONF_ENDPOINTS, DEFAULT_ENDPOINTS), host),
+            keepalive=persistent,
+        ),
+        persistent=persistent,
     )
 
 
+def span_export_path(hass: HomeAssistant, entry: ConfigEntry) -> str:
+    """Return the NDJSON span file of one entry in the config directory."""
+    return hass.config.path(f"{DOMAIN}_{entry.entry_id}_spans.ndjson")
+
+
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     """Set up Duepi EVO component."""
     del config
     hass.data.setdefault(DOMAIN, {})
+    async_register_websocket_commands(hass)
     return True
 
 
@@ -57,17 +100,57 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     client = _build_client_from_entry(entry)
     scan_interval = int(entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL))
+    aggregate_window = int(entry.options.get(CONF_AGGREGATE_WINDOW, DEFAULT_AGGREGATE_WINDOW))
     coordinator = DuepiEvoCoordinator(
         hass=hass,
         client=client,
         name=entry.data.get(CONF_NAME, DEFAULT_NAME),
         update_interval=timedelta(seconds=scan_interval),
+        storage_key=state_storage_key(entry.entry_id),
+        aggregate_window=timedelta(seconds=aggregate_window) if aggregate_window else None,
+        cycle_storage_key=cycle_storage_key(entry.entry_id),
     )
 
-    await coordinator.async_config_entry_first_refresh()
+    # Entities come up from the last good snapshot; the first live poll must not
+    # hold up Home Assistant startup or block the entry when the stove is offline.
+    await coordinator.async_restore_last_state()
+    await coordinator.async_restore_cycle_stats()
+
+    if entry.options.get(CONF_STATISTICS_IMPORT, DEFAULT_STATISTICS_IMPORT):
+        collector = HourlyStatisticsCollector(
+            hass=hass,
+            unique_base=entry.unique_id or entry_unique_id(entry.data[CONF_HOST], entry.data[CONF_PORT]),
+            name=entry.data.get(CONF_NAME, DEFAULT_NAME),
+            storage_key=statistics_storage_key(entry.entry_id),
+        )
+        await collector.async_restore()
+        entry.async_on_unload(coordinator.async_add_sample_listener(collector.async_add_sample))
+        entry.async_on_unload(collector.async_unload)
+
+    if entry.options.get(CONF_SPAN_EXPORT, DEFAULT_SPAN_EXPORT):
+        exporter = NdjsonSpanExporter(span_export_path(hass, entry))
+        entry.async_on_unload(exporter.attach(client.hooks))
+
+        async def _async_close_exporter() -> None:
+            await hass.async_add_executor_job(exporter.close)
+
+        entry.async_on_unload(_async_close_exporter)
+
+    if client.persistent:
+        entry.async_on_unload(
+            async_track_time_interval(
+                hass, coordinator.async_heartbeat, timedelta(seconds=HEARTBEAT_CHECK_INTERVAL)
+            )
+        )
+        entry.async_on_unload(coordinator.async_close)
 
     hass.data[DOMAIN][entry.entry_id] = coordinator
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_create_background_task(
+        hass,
+        coordinator.async_refresh(),
+        name=f"{DOMAIN} first refresh {entry.entry_id}",
+    )
     return True
 
 
@@ -77,3 +160,12 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id, None)
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Drop the persisted state of a removed config entry."""
+    await Store(hass, STATE_STORAGE_VERSION, state_storage_key(entry.entry_id)).async_remove()
+    await Store(hass, CYCLE_STORAGE_VERSION, cycle_storage_key(entry.entry_id)).async_remove()
+    await Store(
+        hass, STATISTICS_STORAGE_VERSION, statistics_storage_key(entry.entry_id)
+    ).async_remove()
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from collections.abc import Callable
 from dataclasses import dataclass
+from typing import Any
 
 from homeassistant.components.binary_sensor import (
     BinarySensorEntity,
@@ -13,7 +14,6 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_HOST, CONF_NAME, CONF_PORT, EntityCategory
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .client import DuepiEvoState
 from .const import (
@@ -23,7 +23,7 @@ from .const import (
     entry_unique_id,
 )
 from .coordinator import DuepiEvoCoordinator
-from .device import build_device_info
+from .entity import DuepiEvoEntity
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -69,7 +69,7 @@ async def async_setup_entry(
     )
 
 
-class DuepiEvoBinarySensorEntity(CoordinatorEntity[DuepiEvoCoordinator], BinarySensorEntity):
+class DuepiEvoBinarySensorEntity(DuepiEvoEntity, BinarySensorEntity):
     """Coordinator-backed Duepi EVO binary sensor."""
 
     entity_description: DuepiEvoBinarySensorDescription
@@ -96,7 +96,11 @@ class DuepiEvoBinarySensorEntity(CoordinatorEntity[DuepiEvoCoordinator], BinaryS
             return None
         return self.entity_description.value_fn(state)
 
+    def _written_value(self) -> bool | None:
+        """Return the binary sensor value compared between polls."""
+        return self.is_on
+
     @property
-    def device_info(self):
-        """Return the parent stove device information."""
-        return build_device_info(self._unique_base, self._device_name)
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Mark restored values as stale until the first live poll."""
+        return self._stale_attributes
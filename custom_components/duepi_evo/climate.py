@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
 from datetime import timedelta
 import logging
 from typing import Any
@@ -29,10 +30,15 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import slugify
 
-from .client import DuepiEvoClient, DuepiEvoClientError, DuepiEvoState
+from .client import (
+    DuepiEvoClient,
+    DuepiEvoClientError,
+    DuepiEvoState,
+    hvac_action_from_state,
+    hvac_mode_from_state,
+)
 from .const import (
     ATTR_BURNER_STATUS,
     ATTR_ERROR_CODE,
@@ -42,6 +48,7 @@ from .const import (
     ATTR_POWER_LEVEL,
     CONF_AUTO_RESET,
     CONF_INIT_COMMAND,
+    CONF_LEGACY_ATTRIBUTES,
     CONF_MAX_TEMP,
     CONF_MIN_TEMP,
     CONF_NOFEEDBACK,
@@ -49,6 +56,7 @@ from .const import (
     DEFAULT_AUTO_RESET,
     DEFAULT_HOST,
     DEFAULT_INIT_COMMAND,
+    DEFAULT_LEGACY_ATTRIBUTES,
     DEFAULT_MAX_TEMP,
     DEFAULT_MIN_TEMP,
     DEFAULT_NAME,
@@ -63,7 +71,7 @@ from .const import (
     entry_unique_id,
 )
 from .coordinator import DuepiEvoCoordinator
-from .device import build_device_info
+from .entity import DuepiEvoEntity
 from .entity_migration import stable_yaml_fallback_unique_id
 
 _LOGGER = logging.getLogger(__name__)
@@ -231,6 +239,7 @@ async def async_setup_entry(
     min_temp = float(entry.options.get(CONF_MIN_TEMP, DEFAULT_MIN_TEMP))
     max_temp = float(entry.options.get(CONF_MAX_TEMP, DEFAULT_MAX_TEMP))
     no_feedback = float(entry.options.get(CONF_NOFEEDBACK, DEFAULT_NOFEEDBACK))
+    legacy_attributes = bool(entry.options.get(CONF_LEGACY_ATTRIBUTES, DEFAULT_LEGACY_ATTRIBUTES))
 
     async_add_entities(
         [
@@ -242,12 +251,13 @@ async def async_setup_entry(
                 min_temp=min_temp,
                 max_temp=max_temp,
                 no_feedback=no_feedback,
+                legacy_attributes=legacy_attributes,
             )
         ]
     )
 
 
-class DuepiEvoClimateEntity(CoordinatorEntity[DuepiEvoCoordinator], ClimateEntity):
+class DuepiEvoClimateEntity(DuepiEvoEntity, ClimateEntity):
     """Duepi EVO climate entity backed by a DataUpdateCoordinator."""
 
     _attr_supported_features = SUPPORT_FLAGS
@@ -263,6 +273,7 @@ class DuepiEvoClimateEntity(CoordinatorEntity[DuepiEvoCoordinator], ClimateEntit
         min_temp: float,
         max_temp: float,
         no_feedback: float,
+        legacy_attributes: bool = True,
     ) -> None:
         super().__init__(coordinator)
         self._name = name
@@ -272,7 +283,10 @@ class DuepiEvoClimateEntity(CoordinatorEntity[DuepiEvoCoordinator], ClimateEntit
         self._min_temp = min_temp
         self._max_temp = max_temp
         self._no_feedback = no_feedback
+        self._legacy_attributes = legacy_attributes
         self._legacy_attr_warning_logged = False
+        self._cache: dict[str, Any] = {}
+        self._cache_version: tuple[int, bool] | None = None
 
     @property
     def name(self) -> str:
@@ -304,16 +318,23 @@ class DuepiEvoClimateEntity(CoordinatorEntity[DuepiEvoCoordinator], ClimateEntit
         """Return max setpoint."""
         return self._max_temp
 
-    @property
-    def device_info(self):
-        """Return the parent stove device information."""
-        return build_device_info(self._unique_base, self._device_name)
-
     @property
     def _state(self) -> DuepiEvoState | None:
         """Return cached coordinator state."""
         return self.coordinator.data
 
+    def _cached(self, name: str, compute: Callable[[], Any]) -> Any:
+        """Memoize a derived property until the coordinator data version changes."""
+        version = (self.coordinator.data_version, self.coordinator.stale)
+        if self._cache_version != version:
+            self._cache = {}
+            self._cache_version = version
+        try:
+            return self._cache[name]
+        except KeyError:
+            value = self._cache[name] = compute()
+            return value
+
     @property
     def current_temperature(self) -> float | None:
         """Return current ambient temperature."""
@@ -333,24 +354,12 @@ class DuepiEvoClimateEntity(CoordinatorEntity[DuepiEvoCoordinator], ClimateEntit
     @property
     def hvac_mode(self) -> HVACMode:
         """Return current HVAC mode."""
-        state = self._state
-        if state is None:
-            return HVACMode.OFF
-        return state.hvac_mode
+        return self._cached("hvac_mode", lambda: hvac_mode_from_state(self._state))
 
     @property
     def hvac_action(self) -> HVACAction:
         """Return current HVAC action."""
-        state = self._state
-        if state is None:
-            return HVACAction.OFF
-        if state.burner_status in {"Eco idle", "Eco Idle", "Cooling down"}:
-            return HVACAction.IDLE
-        if state.heating:
-            return HVACAction.HEATING
-        if state.hvac_mode == HVACMode.HEAT:
-            return HVACAction.IDLE
-        return HVACAction.OFF
+        return self._cached("hvac_action", lambda: hvac_action_from_state(self._state))
 
     @property
     def fan_mode(self) -> str:
@@ -361,8 +370,15 @@ class DuepiEvoClimateEntity(CoordinatorEntity[DuepiEvoCoordinator], ClimateEntit
         return state.power_level
 
     @property
-    def extra_state_attributes(self) -> dict[str, Any]:
+    def extra_state_attributes(self) -> dict[str, Any] | None:
         """Expose legacy attributes during transition period."""
+        return self._cached("extra_state_attributes", self._build_extra_state_attributes)
+
+    def _build_extra_state_attributes(self) -> dict[str, Any] | None:
+        """Build legacy attributes plus the stale marker."""
+        if not self._legacy_attributes:
+            return self._stale_attributes
+
         if not self._legacy_attr_warning_logged:
             _LOGGER.warning(
                 "Legacy Duepi EVO climate attributes are deprecated and will be removed "
@@ -381,7 +397,7 @@ class DuepiEvoClimateEntity(CoordinatorEntity[DuepiEvoCoordinator], ClimateEntit
                 ATTR_POWER_LEVEL: None,
             }
 
-        return {
+        attributes = {
             ATTR_BURNER_STATUS: state.burner_status,
             ATTR_ERROR_CODE: state.error_code,
             ATTR_EXH_FAN_SPEED: (
@@ -397,6 +413,20 @@ class DuepiEvoClimateEntity(CoordinatorEntity[DuepiEvoCoordinator], ClimateEntit
             ATTR_PELLET_SPEED: state.pellet_speed,
             ATTR_POWER_LEVEL: state.power_level,
         }
+        if stale_attributes := self._stale_attributes:
+            attributes.update(stale_attributes)
+        return attributes
+
+    def _written_value(self) -> tuple[Any, ...]:
+        """Return the climate fields and attributes compared between polls."""
+        return (
+            self.current_temperature,
+            self.target_temperature,
+            self.hvac_mode,
+            self.hvac_action,
+            self.fan_mode,
+            tuple((self.extra_state_attributes or {}).items()),
+        )
 
     async def async_added_to_hass(self) -> None:
         """Set stable entity_id based on configured name."""
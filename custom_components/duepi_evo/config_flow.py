@@ -10,29 +10,50 @@ import voluptuous as vol
 
 from homeassistant import config_entries
 from homeassistant.const import CONF_HOST, CONF_NAME, CONF_PORT, CONF_SCAN_INTERVAL
-from homeassistant.core import callback
+from homeassistant.core import HomeAssistant, callback
 
 from .client import DuepiEvoClient, DuepiEvoClientError
 from .const import (
+    CONF_AGGREGATE_WINDOW,
     CONF_AUTO_RESET,
+    CONF_BRIDGE,
+    CONF_CAPABILITIES,
+    CONF_ENDPOINTS,
     CONF_INIT_COMMAND,
+    CONF_LEGACY_ATTRIBUTES,
     CONF_MAX_TEMP,
     CONF_MIN_TEMP,
+    CONF_NETWORK,
     CONF_NOFEEDBACK,
+    CONF_PERSISTENT_CONNECTION,
+    CONF_PIPELINE,
+    CONF_PROBE_LATENCY,
+    CONF_SPAN_EXPORT,
+    CONF_STATISTICS_IMPORT,
     CONF_UNIQUE_ID,
+    DEFAULT_AGGREGATE_WINDOW,
     DEFAULT_AUTO_RESET,
+    DEFAULT_ENDPOINTS,
     DEFAULT_HOST,
     DEFAULT_INIT_COMMAND,
+    DEFAULT_LEGACY_ATTRIBUTES,
     DEFAULT_MAX_TEMP,
     DEFAULT_MIN_TEMP,
     DEFAULT_NAME,
     DEFAULT_NOFEEDBACK,
+    DEFAULT_PERSISTENT_CONNECTION,
+    DEFAULT_PIPELINE,
     DEFAULT_PORT,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_SPAN_EXPORT,
+    DEFAULT_STATISTICS_IMPORT,
     DEFAULT_UNIQUE_ID,
     DOMAIN,
     entry_unique_id,
 )
+from .duepi_core import DuepiEvoProbeResult
+from .duepi_core.discovery import DiscoveredBridge, async_discover, guess_local_network
+from .duepi_core.transport import create_transport, parse_endpoints
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -44,6 +65,54 @@ def _scan_interval_to_seconds(value: Any) -> int:
     return int(value)
 
 
+async def async_probe_connection(
+    hass: HomeAssistant,
+    data: dict[str, Any],
+    options: dict[str, Any],
+) -> DuepiEvoProbeResult | None:
+    """Probe host/port (and any extra endpoints) with a status read and return the result."""
+    host = data[CONF_HOST]
+    port = data[CONF_PORT]
+    client = DuepiEvoClient(
+        host=host,
+        port=port,
+        min_temp=float(options[CONF_MIN_TEMP]),
+        max_temp=float(options[CONF_MAX_TEMP]),
+        no_feedback=float(options[CONF_NOFEEDBACK]),
+        auto_reset=bool(options[CONF_AUTO_RESET]),
+        init_command=bool(options[CONF_INIT_COMMAND]),
+        transport=create_transport(
+            host, port, parse_endpoints(options.get(CONF_ENDPOINTS, DEFAULT_ENDPOINTS), host)
+        ),
+    )
+
+    try:
+        result = await hass.async_add_executor_job(client.probe)
+    except DuepiEvoClientError as err:
+        _LOGGER.debug("Probe of %s:%s failed: %s", data[CONF_HOST], data[CONF_PORT], err)
+        return None
+
+    _LOGGER.debug(
+        "Probe of %s:%s succeeded (status=%s, connect=%.1f ms, status read=%.1f ms, capabilities=%s)",
+        data[CONF_HOST],
+        data[CONF_PORT],
+        result.burner_status,
+        result.connect_latency_ms,
+        result.status_latency_ms,
+        result.capabilities,
+    )
+    return result
+
+
+def _with_probe_result(data: dict[str, Any], result: DuepiEvoProbeResult) -> dict[str, Any]:
+    """Return entry data holding the capability profile and latency of a probe."""
+    return {
+        **data,
+        CONF_CAPABILITIES: result.capabilities.as_dict(),
+        CONF_PROBE_LATENCY: result.latency_as_dict(),
+    }
+
+
 class DuepiEvoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Duepi EVO."""
 
@@ -55,26 +124,57 @@ class DuepiEvoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """Return options flow."""
         return DuepiEvoOptionsFlow(config_entry)
 
+    _probe_result: DuepiEvoProbeResult | None = None
+    _discovered: dict[str, DiscoveredBridge]
+
     async def _async_validate_connection(self, data: dict[str, Any], options: dict[str, Any]) -> bool:
-        """Validate host/port by polling once."""
-        client = DuepiEvoClient(
-            host=data[CONF_HOST],
-            port=data[CONF_PORT],
-            min_temp=float(options[CONF_MIN_TEMP]),
-            max_temp=float(options[CONF_MAX_TEMP]),
-            no_feedback=float(options[CONF_NOFEEDBACK]),
-            auto_reset=bool(options[CONF_AUTO_RESET]),
-            init_command=bool(options[CONF_INIT_COMMAND]),
-        )
+        """Validate host/port with a lightweight probe."""
+        self._probe_result = await async_probe_connection(self.hass, data, options)
+        return self._probe_result is not None
 
-        try:
-            await self.hass.async_add_executor_job(client.fetch_state)
-            return True
-        except DuepiEvoClientError:
-            return False
+    def _data_with_capabilities(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Attach the capability profile and latency captured by the last probe."""
+        if self._probe_result is None:
+            return data
+        return _with_probe_result(data, self._probe_result)
 
     async def async_step_user(self, user_input: dict[str, Any] | None = None) -> config_entries.FlowResult:
-        """Handle the initial step."""
+        """Let the user scan the network for bridges or enter one by hand."""
+        return self.async_show_menu(step_id="user", menu_options=["scan", "manual"])
+
+    async def _async_create_from_input(self, user_input: dict[str, Any]) -> config_entries.FlowResult | None:
+        """Create the entry for a host/port once it answers; ``None`` if it does not."""
+        host = user_input[CONF_HOST]
+        port = user_input[CONF_PORT]
+        unique_id = entry_unique_id(host, port)
+        await self.async_set_unique_id(unique_id)
+        self._abort_if_unique_id_configured()
+
+        data = {
+            CONF_HOST: host,
+            CONF_PORT: port,
+            CONF_NAME: user_input[CONF_NAME],
+            CONF_UNIQUE_ID: DEFAULT_UNIQUE_ID,
+        }
+        options = {
+            CONF_MIN_TEMP: DEFAULT_MIN_TEMP,
+            CONF_MAX_TEMP: DEFAULT_MAX_TEMP,
+            CONF_AUTO_RESET: DEFAULT_AUTO_RESET,
+            CONF_NOFEEDBACK: DEFAULT_NOFEEDBACK,
+            CONF_INIT_COMMAND: bool(user_input[CONF_INIT_COMMAND]),
+            CONF_SCAN_INTERVAL: DEFAULT_SCAN_INTERVAL,
+        }
+
+        if not await self._async_validate_connection(data, options):
+            return None
+        return self.async_create_entry(
+            title=data[CONF_NAME],
+            data=self._data_with_capabilities(data),
+            options=options,
+        )
+
+    async def async_step_manual(self, user_input: dict[str, Any] | None = None) -> config_entries.FlowResult:
+        """Handle a bridge entered by hand."""
         errors: dict[str, str] = {}
         defaults = {
             CONF_HOST: DEFAULT_HOST,
@@ -84,34 +184,9 @@ class DuepiEvoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         }
 
         if user_input is not None:
-            host = user_input[CONF_HOST]
-            port = user_input[CONF_PORT]
-            unique_id = entry_unique_id(host, port)
-            await self.async_set_unique_id(unique_id)
-            self._abort_if_unique_id_configured()
-
-            data = {
-                CONF_HOST: host,
-                CONF_PORT: port,
-                CONF_NAME: user_input[CONF_NAME],
-                CONF_UNIQUE_ID: DEFAULT_UNIQUE_ID,
-            }
-            options = {
-                CONF_MIN_TEMP: DEFAULT_MIN_TEMP,
-                CONF_MAX_TEMP: DEFAULT_MAX_TEMP,
-                CONF_AUTO_RESET: DEFAULT_AUTO_RESET,
-                CONF_NOFEEDBACK: DEFAULT_NOFEEDBACK,
-                CONF_INIT_COMMAND: bool(user_input[CONF_INIT_COMMAND]),
-                CONF_SCAN_INTERVAL: DEFAULT_SCAN_INTERVAL,
-            }
-
-            if await self._async_validate_connection(data, options):
-                return self.async_create_entry(
-                    title=data[CONF_NAME],
-                    data=data,
-                    options=options,
-                )
-
+            result = await self._async_create_from_input(user_input)
+            if result is not None:
+                return result
             errors["base"] = "cannot_connect"
             defaults.update(user_input)
 
@@ -125,7 +200,57 @@ class DuepiEvoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 vol.Required(CONF_INIT_COMMAND, default=defaults[CONF_INIT_COMMAND]): bool,
             }
         )
-        return self.async_show_form(step_id="user", data_schema=schema, errors=errors)
+        return self.async_show_form(step_id="manual", data_schema=schema, errors=errors)
+
+    async def async_step_scan(self, user_input: dict[str, Any] | None = None) -> config_entries.FlowResult:
+        """Scan a subnet on the known bridge ports."""
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            network = user_input[CONF_NETWORK]
+            try:
+                bridges = await async_discover(network)
+            except ValueError:
+                errors[CONF_NETWORK] = "invalid_network"
+            else:
+                configured = self._async_current_ids()
+                self._discovered = {
+                    f"{bridge.host}:{bridge.port}": bridge
+                    for bridge in bridges
+                    if entry_unique_id(bridge.host, bridge.port) not in configured
+                }
+                if self._discovered:
+                    return await self.async_step_pick()
+                errors["base"] = "no_bridges_found"
+        else:
+            network = await self.hass.async_add_executor_job(guess_local_network)
+
+        schema = vol.Schema({vol.Required(CONF_NETWORK, default=network): str})
+        return self.async_show_form(step_id="scan", data_schema=schema, errors=errors)
+
+    async def async_step_pick(self, user_input: dict[str, Any] | None = None) -> config_entries.FlowResult:
+        """Pick one of the bridges found by the scan."""
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            bridge = self._discovered[user_input[CONF_BRIDGE]]
+            result = await self._async_create_from_input(
+                {**user_input, CONF_HOST: bridge.host, CONF_PORT: bridge.port}
+            )
+            if result is not None:
+                return result
+            errors["base"] = "cannot_connect"
+
+        choices = {
+            key: f"{key} ({bridge.burner_status}, {bridge.latency_ms:.0f} ms)"
+            for key, bridge in self._discovered.items()
+        }
+        schema = vol.Schema(
+            {
+                vol.Required(CONF_BRIDGE, default=next(iter(choices))): vol.In(choices),
+                vol.Required(CONF_NAME, default=DEFAULT_NAME): str,
+                vol.Required(CONF_INIT_COMMAND, default=DEFAULT_INIT_COMMAND): bool,
+            }
+        )
+        return self.async_show_form(step_id="pick", data_schema=schema, errors=errors)
 
     async def async_step_import(self, import_config: dict[str, Any]) -> config_entries.FlowResult:
         """Handle YAML import."""
@@ -156,7 +281,11 @@ class DuepiEvoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         if not await self._async_validate_connection(data, options):
             return self.async_abort(reason="cannot_connect")
 
-        return self.async_create_entry(title=data[CONF_NAME], data=data, options=options)
+        return self.async_create_entry(
+            title=data[CONF_NAME],
+            data=self._data_with_capabilities(data),
+            options=options,
+        )
 
 
 class DuepiEvoOptionsFlow(config_entries.OptionsFlow):
@@ -165,10 +294,34 @@ class DuepiEvoOptionsFlow(config_entries.OptionsFlow):
     def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
         self._config_entry = config_entry
 
+    async def _async_validate_connection(self, options: dict[str, Any]) -> DuepiEvoProbeResult | None:
+        """Validate the edited options against the stove with a lightweight probe."""
+        return await async_probe_connection(self.hass, dict(self._config_entry.data), options)
+
     async def async_step_init(self, user_input: dict[str, Any] | None = None) -> config_entries.FlowResult:
         """Manage options."""
+        errors: dict[str, str] = {}
         if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
+            try:
+                parse_endpoints(user_input.get(CONF_ENDPOINTS, DEFAULT_ENDPOINTS), "")
+            except ValueError:
+                errors[CONF_ENDPOINTS] = "invalid_endpoints"
+            else:
+                # An offline stove keeps its stored capabilities; the options
+                # are saved anyway so they can be changed while it is down.
+                probe_result = await self._async_validate_connection(user_input)
+                if probe_result is not None:
+                    self.hass.config_entries.async_update_entry(
+                        self._config_entry,
+                        data=_with_probe_result(dict(self._config_entry.data), probe_result),
+                    )
+                else:
+                    _LOGGER.warning(
+                        "Could not probe %s:%s; saving options with the stored capabilities",
+                        self._config_entry.data[CONF_HOST],
+                        self._config_entry.data[CONF_PORT],
+                    )
+                return self.async_create_entry(title="", data=user_input)
 
         defaults = {
             CONF_MIN_TEMP: self._config_entry.options.get(CONF_MIN_TEMP, DEFAULT_MIN_TEMP),
@@ -177,7 +330,24 @@ class DuepiEvoOptionsFlow(config_entries.OptionsFlow):
             CONF_NOFEEDBACK: self._config_entry.options.get(CONF_NOFEEDBACK, DEFAULT_NOFEEDBACK),
             CONF_INIT_COMMAND: self._config_entry.options.get(CONF_INIT_COMMAND, DEFAULT_INIT_COMMAND),
             CONF_SCAN_INTERVAL: self._config_entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+            CONF_AGGREGATE_WINDOW: self._config_entry.options.get(
+                CONF_AGGREGATE_WINDOW, DEFAULT_AGGREGATE_WINDOW
+            ),
+            CONF_STATISTICS_IMPORT: self._config_entry.options.get(
+                CONF_STATISTICS_IMPORT, DEFAULT_STATISTICS_IMPORT
+            ),
+            CONF_LEGACY_ATTRIBUTES: self._config_entry.options.get(
+                CONF_LEGACY_ATTRIBUTES, DEFAULT_LEGACY_ATTRIBUTES
+            ),
+            CONF_SPAN_EXPORT: self._config_entry.options.get(CONF_SPAN_EXPORT, DEFAULT_SPAN_EXPORT),
+            CONF_PIPELINE: self._config_entry.options.get(CONF_PIPELINE, DEFAULT_PIPELINE),
+            CONF_ENDPOINTS: self._config_entry.options.get(CONF_ENDPOINTS, DEFAULT_ENDPOINTS),
+            CONF_PERSISTENT_CONNECTION: self._config_entry.options.get(
+                CONF_PERSISTENT_CONNECTION, DEFAULT_PERSISTENT_CONNECTION
+            ),
         }
+        if user_input is not None:
+            defaults.update(user_input)
 
         schema = vol.Schema(
             {
@@ -189,6 +359,17 @@ class DuepiEvoOptionsFlow(config_entries.OptionsFlow):
                 vol.Required(CONF_SCAN_INTERVAL, default=defaults[CONF_SCAN_INTERVAL]): vol.All(
                     vol.Coerce(int), vol.Range(min=5)
                 ),
+                vol.Required(CONF_AGGREGATE_WINDOW, default=defaults[CONF_AGGREGATE_WINDOW]): vol.All(
+                    vol.Coerce(int), vol.Range(min=0)
+                ),
+                vol.Required(CONF_STATISTICS_IMPORT, default=defaults[CONF_STATISTICS_IMPORT]): bool,
+                vol.Required(CONF_LEGACY_ATTRIBUTES, default=defaults[CONF_LEGACY_ATTRIBUTES]): bool,
+                vol.Required(CONF_SPAN_EXPORT, default=defaults[CONF_SPAN_EXPORT]): bool,
+                vol.Required(CONF_PIPELINE, default=defaults[CONF_PIPELINE]): bool,
+                vol.Optional(CONF_ENDPOINTS, default=defaults[CONF_ENDPOINTS]): str,
+                vol.Required(
+                    CONF_PERSISTENT_CONNECTION, default=defaults[CONF_PERSISTENT_CONNECTION]
+                ): bool,
             }
         )
-        return self.async_show_form(step_id="init", data_schema=schema)
+        return self.async_show_form(step_id="init", data_schema=schema, errors=errors)
@@ -5,6 +5,13 @@ from __future__ import annotations
 from homeassistant.components.climate import HVACMode
 from homeassistant.const import Platform
 
+from .duepi_core.const import (  # noqa: F401  re-exported for platforms
+    AUTO_RESET_ERRORS,
+    FAN_MODE_MAP,
+    FAN_MODE_MAP_REV,
+    FAN_MODES,
+)
+
 DOMAIN = "duepi_evo"
 PLATFORMS: list[Platform] = [Platform.CLIMATE, Platform.SENSOR, Platform.BINARY_SENSOR]
 
@@ -18,6 +25,25 @@ DEFAULT_NOFEEDBACK = 16.0
 DEFAULT_AUTO_RESET = False
 DEFAULT_UNIQUE_ID = "duepi_unique"
 DEFAULT_INIT_COMMAND = False
+DEFAULT_AGGREGATE_WINDOW = 0
+DEFAULT_STATISTICS_IMPORT = False
+DEFAULT_LEGACY_ATTRIBUTES = True
+DEFAULT_SPAN_EXPORT = False
+DEFAULT_PIPELINE = False
+DEFAULT_ENDPOINTS = ""
+DEFAULT_PERSISTENT_CONNECTION = False
+# How often an idle persistent connection is looked at; the client only
+# sends a heartbeat once it has been idle for its heartbeat interval.
+HEARTBEAT_CHECK_INTERVAL = 10
+# Poll interval while a live telemetry websocket subscription is open.
+LIVE_SCAN_INTERVAL = 2
+
+STATE_STORAGE_VERSION = 1
+STATE_STORAGE_SAVE_DELAY = 30
+CYCLE_STORAGE_VERSION = 1
+CYCLE_STORAGE_SAVE_DELAY = 300
+STATISTICS_STORAGE_VERSION = 1
+STATISTICS_STORAGE_SAVE_DELAY = 60
 
 CONF_MIN_TEMP = "min_temp"
 CONF_MAX_TEMP = "max_temp"
@@ -25,38 +51,19 @@ CONF_AUTO_RESET = "auto_reset"
 CONF_NOFEEDBACK = "temp_nofeedback"
 CONF_UNIQUE_ID = "unique_id"
 CONF_INIT_COMMAND = "init_command"
-
-STATE_ACK = 0x00000020
-STATE_OFF = 0x00000020
-STATE_START = 0x01000000
-STATE_ON = 0x02000000
-STATE_CLEAN = 0x04000000
-STATE_COOL = 0x08000000
-STATE_ECO = 0x10000000
-
-GET_SETPOINT = "C6000"
-GET_PRESSURE_SWITCH = "C0000"
-GET_FLUGASTEMP = "D0000"
-GET_TEMPERATURE = "D1000"
-GET_POWERLEVEL = "D3000"
-GET_PELLETSPEED = "D4000"
-REMOTE_RESET = "D6000"
-GET_STATUS = "D9000"
-GET_ERRORSTATE = "DA000"
-GET_PCBTEMP = "DF000"
-GET_TOTAL_BURN_TIME = "ED000"
-GET_BURN_TIME = "EE000"
-GET_EXHFANSPEED = "EF000"
-GET_INITCOMMAND = "DC000"
-
-SET_POWERLEVEL = "F00x0"
-SET_TEMPERATURE = "F2xx0"
+CONF_CAPABILITIES = "capabilities"
+CONF_PROBE_LATENCY = "probe_latency"
+CONF_AGGREGATE_WINDOW = "aggregate_window"
+CONF_STATISTICS_IMPORT = "statistics_import"
+CONF_LEGACY_ATTRIBUTES = "legacy_attributes"
+CONF_SPAN_EXPORT = "span_export"
+CONF_PIPELINE = "pipeline"
+CONF_ENDPOINTS = "endpoints"
+CONF_PERSISTENT_CONNECTION = "persistent_connection"
+CONF_NETWORK = "network"
+CONF_BRIDGE = "bridge"
 
 SUPPORT_MODES = [HVACMode.HEAT, HVACMode.OFF]
-FAN_MODES = ["Off", "Min", "Low", "Medium", "High", "Max"]
-FAN_MODE_MAP = {"Off": 0, "Min": 1, "Low": 2, "Medium": 3, "High": 4, "Max": 5}
-FAN_MODE_MAP_REV = {value: key for key, value in FAN_MODE_MAP.items()}
-AUTO_RESET_ERRORS = {"Out of pellets", "Ignition failure"}
 
 ATTR_BURNER_STATUS = "burner_status"
 ATTR_ERROR_CODE = "error_code"
@@ -68,9 +75,20 @@ ATTR_PCB_TEMP = "pcb_temp"
 ATTR_TOTAL_BURN_TIME = "total_burn_time"
 ATTR_BURN_TIME_SINCE_RESET = "burn_time_since_reset"
 ATTR_PRESSURE_SWITCH = "pressure_switch"
-
-PRESSURE_SWITCH_OK = 0x0100
-PRESSURE_SWITCH_PRESSURE = 0x0300
+ATTR_STALE = "stale"
+ATTR_WINDOW_MIN = "min"
+ATTR_WINDOW_MAX = "max"
+ATTR_WINDOW_LAST = "last"
+ATTR_WINDOW_SAMPLES = "samples"
+ATTR_MEAN = "mean"
+ATTR_VARIANCE = "variance"
+
+# State fields summarized by the windowed aggregate sensors.
+AGGREGATE_FIELDS = ("flu_gas_temp_c", "exh_fan_speed_rpm", "pellet_speed", "current_temp_c")
+
+# State fields kept in the in-memory telemetry ring buffer, and its length.
+TELEMETRY_FIELDS = ("current_temp_c", "flu_gas_temp_c", "exh_fan_speed_rpm", "pellet_speed")
+TELEMETRY_CAPACITY = 120
 
 
 def entry_unique_id(host: str, port: int) -> str:
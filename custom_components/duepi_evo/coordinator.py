@@ -2,18 +2,57 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
+from dataclasses import dataclass
 from datetime import timedelta
 import logging
+import time
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
 from .client import DuepiEvoClient, DuepiEvoClientError, DuepiEvoState
-from .const import AUTO_RESET_ERRORS, DOMAIN
+from .const import (
+    AGGREGATE_FIELDS,
+    AUTO_RESET_ERRORS,
+    CYCLE_STORAGE_SAVE_DELAY,
+    CYCLE_STORAGE_VERSION,
+    DOMAIN,
+    LIVE_SCAN_INTERVAL,
+    STATE_STORAGE_SAVE_DELAY,
+    STATE_STORAGE_VERSION,
+    TELEMETRY_CAPACITY,
+    TELEMETRY_FIELDS,
+)
+from .duepi_core.aggregation import AggregateSnapshot, WindowedAggregator
+from .duepi_core.cycles import BurnerCycleStats
+from .duepi_core.hooks import DuepiEvoHooks
+from .duepi_core.telemetry import TelemetryBuffer
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def state_storage_key(entry_id: str) -> str:
+    """Return the storage key holding the last good state of one entry."""
+    return f"{DOMAIN}.{entry_id}.last_state"
+
+
+def cycle_storage_key(entry_id: str) -> str:
+    """Return the storage key holding the burner cycle counters of one entry."""
+    return f"{DOMAIN}.{entry_id}.cycles"
+
+
+@dataclass(slots=True)
+class DuepiEvoWriteStats:
+    """Counters for entity state writes driven by this coordinator."""
+
+    performed: int = 0
+    skipped: int = 0
+    unchanged_polls: int = 0
+
+
 class DuepiEvoCoordinator(DataUpdateCoordinator[DuepiEvoState]):
     """Central coordinator that owns a DuepiEvoClient."""
 
@@ -23,23 +62,251 @@ class DuepiEvoCoordinator(DataUpdateCoordinator[DuepiEvoState]):
         client: DuepiEvoClient,
         name: str,
         update_interval: timedelta,
+        storage_key: str | None = None,
+        aggregate_window: timedelta | None = None,
+        cycle_storage_key: str | None = None,
     ) -> None:
         super().__init__(
             hass=hass,
             logger=_LOGGER,
             name=f"{DOMAIN}_{name}",
             update_interval=update_interval,
+            always_update=False,
         )
         self.client = client
         self.name = name
+        self._base_update_interval = update_interval
+        self._live_listeners: list[Callable[[DuepiEvoState], None]] = []
+        self._next_publish = 0.0
+        self._live_only_poll = False
+        self.stale = False
+        self.data_version = 0
+        self.write_stats = DuepiEvoWriteStats()
+        self._store: Store[dict] | None = None
+        if storage_key is not None:
+            self._store = Store(hass, STATE_STORAGE_VERSION, storage_key)
+        self.aggregates: dict[str, AggregateSnapshot | None] = {}
+        self._aggregator: WindowedAggregator | None = None
+        self._aggregate_listeners: list[Callable[[], None]] = []
+        self._sample_listeners: list[Callable[[DuepiEvoState], None]] = []
+        self._poll_listeners: list[Callable[[], None]] = []
+        self.telemetry = TelemetryBuffer(TELEMETRY_FIELDS, TELEMETRY_CAPACITY)
+        self.cycles = BurnerCycleStats()
+        self._cycle_store: Store[dict] | None = None
+        if cycle_storage_key is not None:
+            self._cycle_store = Store(hass, CYCLE_STORAGE_VERSION, cycle_storage_key)
+        if aggregate_window:
+            self._aggregator = WindowedAggregator(
+                fields=AGGREGATE_FIELDS,
+                window=aggregate_window.total_seconds(),
+            )
+
+    @property
+    def hooks(self) -> DuepiEvoHooks:
+        """Return the instrumentation hooks shared with the client."""
+        return self.client.hooks
+
+    @property
+    def aggregation_enabled(self) -> bool:
+        """Return whether windowed aggregates are computed."""
+        return self._aggregator is not None
+
+    @callback
+    def async_add_aggregate_listener(self, update_callback: Callable[[], None]) -> CALLBACK_TYPE:
+        """Listen for closed aggregation windows."""
+        self._aggregate_listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._aggregate_listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def async_add_sample_listener(
+        self, sample_callback: Callable[[DuepiEvoState], None]
+    ) -> CALLBACK_TYPE:
+        """Receive every successful poll, including unchanged snapshots."""
+        self._sample_listeners.append(sample_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._sample_listeners.remove(sample_callback)
+
+        return remove_listener
+
+    @callback
+    def async_add_poll_listener(self, poll_callback: Callable[[], None]) -> CALLBACK_TYPE:
+        """Run after every poll attempt, including failed ones.
+
+        Polls made only for live listeners are skipped, so poll listeners keep
+        the configured interval while live mode is on.
+        """
+        self._poll_listeners.append(poll_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._poll_listeners.remove(poll_callback)
+
+        return remove_listener
+
+    @callback
+    def async_add_live_listener(
+        self, live_callback: Callable[[DuepiEvoState], None]
+    ) -> CALLBACK_TYPE:
+        """Stream every raw poll to a live subscriber.
+
+        While at least one live listener is registered the stove is polled
+        every ``LIVE_SCAN_INTERVAL`` seconds. The extra polls only reach live
+        listeners; entities, statistics and analytics keep the configured
+        interval, so nothing extra is written to the state machine or recorder.
+        """
+        self._live_listeners.append(live_callback)
+        if len(self._live_listeners) == 1:
+            self._async_set_poll_interval(timedelta(seconds=LIVE_SCAN_INTERVAL))
+
+        @callback
+        def remove_listener() -> None:
+            self._live_listeners.remove(live_callback)
+            if not self._live_listeners:
+                self._async_set_poll_interval(self._base_update_interval)
+
+        return remove_listener
+
+    async def async_request_refresh(self) -> None:
+        """Request a refresh whose result is published even in live mode."""
+        self._next_publish = 0.0
+        await super().async_request_refresh()
+
+    @callback
+    def _async_set_poll_interval(self, interval: timedelta) -> None:
+        """Change the poll interval and reschedule the next poll."""
+        self.update_interval = interval
+        if self._listeners:
+            self._schedule_refresh()
+
+    @callback
+    def _async_aggregate(self, state: DuepiEvoState) -> None:
+        """Feed a sample into the window and publish it once the window closes."""
+        if self._aggregator is None:
+            return
+        closed = self._aggregator.add(state, time.monotonic())
+        if closed is None:
+            return
+        self.aggregates = closed
+        for update_callback in list(self._aggregate_listeners):
+            update_callback()
+
+    async def async_restore_last_state(self) -> bool:
+        """Seed coordinator data with the last persisted snapshot, marked stale."""
+        if self._store is None:
+            return False
+        restored = DuepiEvoState.from_dict(await self._store.async_load())
+        if restored is None:
+            return False
+        self.data = restored
+        self.stale = True
+        return True
+
+    async def async_restore_cycle_stats(self) -> None:
+        """Resume burner cycle counters from storage."""
+        if self._cycle_store is not None:
+            self.cycles = BurnerCycleStats.from_dict(await self._cycle_store.async_load())
+
+    @callback
+    def _async_track_cycle(self, state: DuepiEvoState) -> None:
+        """Advance the burner cycle counters with one polled status."""
+        now = dt_util.now()
+        self.cycles.update(
+            state.burner_status,
+            now.timestamp(),
+            now.date().isoformat(),
+            error_code=state.error_code,
+        )
+        if self._cycle_store is not None:
+            self._cycle_store.async_delay_save(self.cycles.as_dict, CYCLE_STORAGE_SAVE_DELAY)
+
+    def _async_persist_state(self, state: DuepiEvoState) -> None:
+        """Schedule a coalesced write of the latest good snapshot."""
+        if self._store is not None:
+            self._store.async_delay_save(state.as_dict, STATE_STORAGE_SAVE_DELAY)
+
+    async def async_heartbeat(self, _now=None) -> None:
+        """Check or replace an idle persistent connection between polls."""
+        if not await self.hass.async_add_executor_job(self.client.heartbeat):
+            _LOGGER.debug("Heartbeat could not reconnect to %s", self.name)
+
+    async def async_close(self) -> None:
+        """Close the client's persistent connection."""
+        await self.hass.async_add_executor_job(self.client.close)
 
     async def _async_update_data(self) -> DuepiEvoState:
         """Fetch latest data from the stove."""
+        self._live_only_poll = False
         try:
-            state = await self.hass.async_add_executor_job(self.client.fetch_state)
-            if self.client.auto_reset and state.error_code in AUTO_RESET_ERRORS:
-                await self.hass.async_add_executor_job(self.client.remote_reset, state.error_code)
-                state = await self.hass.async_add_executor_job(self.client.fetch_state)
-            return state
+            return await self._async_poll()
+        finally:
+            if not self._live_only_poll:
+                for poll_callback in list(self._poll_listeners):
+                    poll_callback()
+
+    def _is_live_only(self, now: float) -> bool:
+        """Return whether a poll at ``now`` only feeds live listeners."""
+        return (
+            bool(self._live_listeners)
+            and self.data is not None
+            and not self.stale
+            and now < self._next_publish
+        )
+
+    def _fetch_state(self) -> DuepiEvoState:
+        """Fetch one snapshot, resetting auto-reset errors first (executor thread).
+
+        Hooks may do blocking I/O (the span exporter writes a file), so the
+        ``retry`` event is emitted here rather than on the event loop.
+        """
+        state = self.client.fetch_state()
+        if self.client.auto_reset and state.error_code in AUTO_RESET_ERRORS:
+            if self.hooks.enabled:
+                self.hooks.emit("retry", reason="auto_reset", error_code=state.error_code)
+            self.client.remote_reset(state.error_code)
+            state = self.client.fetch_state()
+        return state
+
+    async def _async_poll(self) -> DuepiEvoState:
+        """Fetch one snapshot and feed it to analytics and listeners."""
+        try:
+            state = await self.hass.async_add_executor_job(self._fetch_state)
         except DuepiEvoClientError as err:
+            self._live_only_poll = self._is_live_only(time.monotonic())
             raise UpdateFailed(str(err)) from err
+
+        for live_callback in list(self._live_listeners):
+            live_callback(state)
+        now = time.monotonic()
+        if self._live_listeners:
+            # Live polls in between regular ones are not published: returning
+            # the current snapshot keeps listeners from being called.
+            if self._is_live_only(now):
+                self._live_only_poll = True
+                return self.data
+            self._next_publish = now + self._base_update_interval.total_seconds()
+
+        self.telemetry.add(state, now)
+        self._async_track_cycle(state)
+        self._async_aggregate(state)
+        for sample_callback in list(self._sample_listeners):
+            sample_callback(state)
+        was_stale = self.stale
+        self.stale = False
+        if state == self.data:
+            self.write_stats.unchanged_polls += 1
+            if was_stale:
+                # Listeners are skipped for equal snapshots, but entities still
+                # have to drop the stale marker of the restored values.
+                self.async_update_listeners()
+            return state
+
+        self.data_version += 1
+        self._async_persist_state(state)
+        return state
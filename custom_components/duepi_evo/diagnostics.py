@@ -0,0 +1,66 @@
+"""Diagnostics support for Duepi EVO."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_ENDPOINTS, DOMAIN
+from .coordinator import DuepiEvoCoordinator
+
+# Endpoint labels and the failover endpoint option carry bridge addresses.
+TO_REDACT = {CONF_HOST, CONF_ENDPOINTS, "endpoint"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry.
+
+    The wire trace holds the last raw frames sent to and received from the
+    bridge, so a misbehaving stove can be inspected without running a proxy.
+    """
+    coordinator: DuepiEvoCoordinator = hass.data[DOMAIN][entry.entry_id]
+    client = coordinator.client
+    cycles = coordinator.cycles
+    metrics = client.metrics
+    state = coordinator.data
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": async_redact_data(dict(entry.options), TO_REDACT),
+        },
+        "state": state.as_dict() if state is not None else None,
+        "stale": coordinator.stale,
+        "capabilities": client.capabilities.as_dict() if client.capabilities is not None else None,
+        "query_plan": client.query_plan(state.burner_status if state is not None else None),
+        "connection": {
+            "last_update_success": coordinator.last_update_success,
+            "last_exception": repr(coordinator.last_exception) if coordinator.last_exception else None,
+            "update_interval_s": coordinator.update_interval.total_seconds()
+            if coordinator.update_interval
+            else None,
+            "transport": type(client.transport).__name__,
+            "pipeline": client.pipeline,
+            "persistent": client.persistent,
+            "stale_connections": metrics.stale_connections,
+            "connects": metrics.connect.count,
+            "connection_errors": metrics.connection_errors,
+            "timeouts": metrics.timeouts,
+            "protocol_errors": metrics.protocol_errors,
+            "endpoints": async_redact_data(client.transport.health(), TO_REDACT),
+        },
+        "latency": metrics.as_dict(),
+        "write_stats": asdict(coordinator.write_stats),
+        "burner_cycles": {
+            **cycles.as_dict(),
+            "average_ignition_seconds": cycles.average_ignition_seconds,
+            "failed_ignition_rate": cycles.failed_ignition_rate,
+        },
+        "wire_trace": client.trace.as_list(),
+    }
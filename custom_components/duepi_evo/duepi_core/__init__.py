@@ -0,0 +1,41 @@
+"""Home-Assistant-free core of the Duepi EVO protocol.
+
+Everything in this package uses only the standard library so it can be
+imported by the ``evo-python`` tools, benchmarks and worker processes without
+pulling in Home Assistant. Keep it that way: only relative imports inside the
+package and no ``homeassistant`` imports. ``analysis`` is the one module that
+needs a third-party package (NumPy); only the offline analysis tool imports it.
+"""
+
+from __future__ import annotations
+
+from .client import (
+    DuepiEvoClient,
+    DuepiEvoClientError,
+    DuepiEvoProtocolError,
+    DuepiEvoTimeoutError,
+)
+from .hooks import DuepiEvoHooks, NdjsonSpanExporter
+from .probe import DuepiEvoCapabilities, DuepiEvoProbeResult
+from .protocol import decode_status, generate_command, hvac_from_status
+from .state import DuepiEvoState
+from .transport import DuepiEvoTransport, LoopbackTransport, SerialTransport, TcpTransport
+
+__all__ = [
+    "DuepiEvoCapabilities",
+    "DuepiEvoClient",
+    "DuepiEvoClientError",
+    "DuepiEvoHooks",
+    "DuepiEvoProbeResult",
+    "DuepiEvoProtocolError",
+    "DuepiEvoState",
+    "DuepiEvoTimeoutError",
+    "DuepiEvoTransport",
+    "LoopbackTransport",
+    "NdjsonSpanExporter",
+    "SerialTransport",
+    "TcpTransport",
+    "decode_status",
+    "generate_command",
+    "hvac_from_status",
+]
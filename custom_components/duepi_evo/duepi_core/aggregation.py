@@ -0,0 +1,93 @@
+"""Streaming window aggregation of numeric state fields."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import math
+from typing import Any
+
+
+@dataclass(frozen=True, slots=True)
+class AggregateSnapshot:
+    """Statistics of one field over one closed window."""
+
+    minimum: float
+    mean: float
+    maximum: float
+    last: float
+    count: int
+
+
+@dataclass(slots=True)
+class StreamingAggregate:
+    """O(1) running count/sum/min/max/last accumulator."""
+
+    count: int = 0
+    total: float = 0.0
+    minimum: float = math.inf
+    maximum: float = -math.inf
+    last: float | None = None
+
+    def add(self, value: float) -> None:
+        """Account for one sample."""
+        self.count += 1
+        self.total += value
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+        self.last = value
+
+    def snapshot(self) -> AggregateSnapshot | None:
+        """Return the statistics so far, or None when no sample was seen."""
+        if not self.count:
+            return None
+        return AggregateSnapshot(
+            minimum=self.minimum,
+            mean=self.total / self.count,
+            maximum=self.maximum,
+            last=self.last,
+            count=self.count,
+        )
+
+
+@dataclass(slots=True)
+class WindowedAggregator:
+    """Aggregate selected attributes of state snapshots over fixed windows.
+
+    Windows are aligned to the first sample and advance in whole multiples of
+    ``window`` seconds, so a late poll does not shift later windows.
+    """
+
+    fields: tuple[str, ...]
+    window: float
+    _window_start: float | None = field(default=None, init=False)
+    _accumulators: dict[str, StreamingAggregate] = field(default_factory=dict, init=False)
+
+    def __post_init__(self) -> None:
+        self._accumulators = {name: StreamingAggregate() for name in self.fields}
+
+    def add(self, state: Any, now: float) -> dict[str, AggregateSnapshot | None] | None:
+        """Feed one snapshot taken at monotonic ``now``.
+
+        Returns the statistics of the window that just closed, if any. The
+        snapshot itself is counted in the window that starts afterwards.
+        """
+        closed = None
+        if self._window_start is None:
+            self._window_start = now
+        elif now - self._window_start >= self.window:
+            closed = self._close()
+            elapsed_windows = int((now - self._window_start) // self.window)
+            self._window_start += elapsed_windows * self.window
+
+        for name, accumulator in self._accumulators.items():
+            value = getattr(state, name)
+            if value is not None:
+                accumulator.add(value)
+        return closed
+
+    def _close(self) -> dict[str, AggregateSnapshot | None]:
+        closed = {name: accumulator.snapshot() for name, accumulator in self._accumulators.items()}
+        self._accumulators = {name: StreamingAggregate() for name in self.fields}
+        return closed
@@ -0,0 +1,486 @@
+"""Offline analysis of stove telemetry over months of history.
+
+Telemetry comes from ``duepi record`` recordings (only the needed columns
+are read, chunk by chunk from the memory map) or from the states Home
+Assistant's recorder kept in its SQLite database (fetched in chunks, with
+SQLite doing the number and attribute extraction). Either way a stove ends
+up as a ``Telemetry`` of aligned NumPy arrays, and ``summarize`` computes
+its ignition, heat-up, flue gas, pellet feed and error statistics with
+array operations only; a year of 1 Hz samples takes a second or two.
+
+This module needs NumPy (``pip install numpy``). It is the only part of
+``duepi_core`` that does, and nothing else in the package imports it.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, replace
+import math
+from pathlib import Path
+import sqlite3
+from typing import Any
+
+try:
+    import numpy as np
+except ImportError as err:  # pragma: no cover - depends on the environment
+    raise ImportError("duepi_core.analysis needs NumPy: pip install numpy") from err
+
+from .const import (
+    ERROR_CODE_MAP,
+    STATE_CLEAN,
+    STATE_COOL,
+    STATE_ECO,
+    STATE_OFF,
+    STATE_ON,
+    STATE_START,
+)
+from .cycles import DEFAULT_MAX_GAP, STATUS_COOLING, STATUS_FLAME_ON, STATUS_IGNITION
+from .protocol import decode_status
+from .recording import RecordingReader
+
+# Flags in the priority order of ``decode_status``; a status code is the
+# index into ``STATUS_NAMES`` (0 when no flag is set, or the state is unknown).
+_STATUS_FLAGS = (STATE_START, STATE_ON, STATE_CLEAN, STATE_ECO, STATE_COOL, STATE_OFF)
+STATUS_NAMES = (decode_status(0), *(decode_status(flag) for flag in _STATUS_FLAGS))
+STATUS_UNKNOWN = 0
+STATUS_IGNITION_CODE = STATUS_NAMES.index(STATUS_IGNITION)
+STATUS_FLAME_ON_CODE = STATUS_NAMES.index(STATUS_FLAME_ON)
+STATUS_COOLING_CODE = STATUS_NAMES.index(STATUS_COOLING)
+
+# Error code of samples where the error sensor had no value.
+ERROR_UNKNOWN = -1
+
+DEFAULT_HISTORY_CHUNK_ROWS = 50_000
+
+# Home Assistant entities per telemetry field, for a climate entity
+# ``climate.<object id>``: (entity id template, attribute or None for the state).
+HISTORY_SOURCES = {
+    "status": ("sensor.{}_burner_status", None),
+    "error_code": ("sensor.{}_error_code", None),
+    "flu_gas_temp": ("sensor.{}_flu_gas_temperature", None),
+    "pellet_speed": ("sensor.{}_pellet_speed", None),
+    "room_temp": ("climate.{}", "current_temperature"),
+    "setpoint": ("climate.{}", "temperature"),
+}
+
+_RECORDING_FIELDS = (
+    "status",
+    "room_temp",
+    "setpoint",
+    "flu_gas_temp",
+    "pellet_speed",
+    "error_code",
+)
+
+
+@dataclass(slots=True)
+class Telemetry:
+    """Time-aligned samples of one stove.
+
+    ``status`` holds ``STATUS_NAMES`` indices and ``error_code`` controller
+    error codes (``ERROR_UNKNOWN`` where not known); the rest are floats with
+    NaN for missing values. Samples further apart than ``max_gap`` seconds
+    are treated as a hole in the data; ``None`` disables that for histories
+    that only store changes.
+    """
+
+    name: str
+    timestamp: np.ndarray
+    status: np.ndarray
+    room_temp: np.ndarray
+    setpoint: np.ndarray
+    flu_gas_temp: np.ndarray
+    pellet_speed: np.ndarray
+    error_code: np.ndarray
+    max_gap: float | None = DEFAULT_MAX_GAP
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def between(self, start: float | None = None, end: float | None = None) -> Telemetry:
+        """Return the samples from ``start`` up to, not including, ``end``."""
+        first = 0 if start is None else int(np.searchsorted(self.timestamp, start))
+        last = len(self) if end is None else int(np.searchsorted(self.timestamp, end))
+        return replace(
+            self,
+            **{name: getattr(self, name)[first:last] for name in ("timestamp", *_RECORDING_FIELDS)},
+        )
+
+
+def status_codes(flags: np.ndarray) -> np.ndarray:
+    """Return the ``STATUS_NAMES`` index of every raw state flag word."""
+    flags = np.asarray(flags, dtype=np.uint32)
+    conditions = [(flags & flag) != 0 for flag in _STATUS_FLAGS]
+    return np.select(conditions, np.arange(1, len(STATUS_NAMES)), STATUS_UNKNOWN).astype(np.int8)
+
+
+def _read_column(reader: RecordingReader, name: str) -> np.ndarray:
+    """Copy one column out of the memory map, a chunk at a time."""
+    dtype = np.dtype(reader.columns[name]).newbyteorder("<")
+    views = reader.column_views(name)
+    parts = [np.frombuffer(view, dtype=dtype) for view in views]
+    values = np.concatenate(parts) if parts else np.empty(0, dtype)
+    # The arrays borrow the views, which borrow the mapping.
+    del parts
+    for view in views:
+        view.release()
+    return values
+
+
+def load_recordings(paths: Sequence[str | Path], name: str | None = None) -> Telemetry:
+    """Load the recordings of one stove (e.g. one file per month) in time order."""
+    columns: dict[str, list[np.ndarray]] = {
+        field: [] for field in ("timestamp", *_RECORDING_FIELDS)
+    }
+    for path in paths:
+        with RecordingReader(path) as reader:
+            for field, values in columns.items():
+                values.append(_read_column(reader, field))
+    merged = {field: np.concatenate(values) for field, values in columns.items()}
+    order = np.argsort(merged["timestamp"], kind="stable")
+    merged = {field: values[order] for field, values in merged.items()}
+    return Telemetry(
+        name=name or Path(paths[0]).stem,
+        timestamp=merged["timestamp"],
+        status=status_codes(merged["status"]),
+        room_temp=merged["room_temp"].astype(np.float64),
+        setpoint=merged["setpoint"].astype(np.float64),
+        flu_gas_temp=merged["flu_gas_temp"].astype(np.float64),
+        pellet_speed=merged["pellet_speed"].astype(np.float64),
+        error_code=merged["error_code"].astype(np.int16),
+    )
+
+
+def history_entities(object_id: str) -> dict[str, tuple[str, str | None]]:
+    """Return the entity (and attribute) of every field for ``climate.<object_id>``."""
+    return {
+        field: (template.format(object_id), attribute)
+        for field, (template, attribute) in HISTORY_SOURCES.items()
+    }
+
+
+def _categorical(states: Sequence[str | None], codes: dict[str, int], default: int) -> np.ndarray:
+    """Map state strings to integer codes, one lookup per distinct string."""
+    names, inverse = np.unique(np.array(states, dtype=object).astype(str), return_inverse=True)
+    lookup = np.array([codes.get(name, default) for name in names], dtype=np.int16)
+    return lookup[inverse]
+
+
+def _history_series(
+    connection: sqlite3.Connection,
+    entity_id: str,
+    attribute: str | None,
+    start: float,
+    end: float,
+    chunk_rows: int,
+    codes: dict[str, int] | None = None,
+    default: int = 0,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return the timestamps and values of one entity, fetched in chunks."""
+    if attribute is not None:
+        value = "json_extract(a.shared_attrs, '$.' || ?)"
+        params: list[Any] = [attribute]
+    elif codes is None:
+        value = (
+            "CASE WHEN s.state IN ('unknown', 'unavailable', '') THEN NULL "
+            "ELSE CAST(s.state AS REAL) END"
+        )
+        params = []
+    else:
+        value = "s.state"
+        params = []
+    cursor = connection.execute(
+        f"SELECT s.last_updated_ts, {value} FROM states AS s "  # noqa: S608 - fixed fragments
+        "JOIN states_meta AS m ON s.metadata_id = m.metadata_id "
+        "LEFT JOIN state_attributes AS a ON s.attributes_id = a.attributes_id "
+        "WHERE m.entity_id = ? AND s.last_updated_ts >= ? AND s.last_updated_ts < ? "
+        "ORDER BY s.last_updated_ts",
+        [*params, entity_id, start, end],
+    )
+    times: list[np.ndarray] = []
+    values: list[np.ndarray] = []
+    while rows := cursor.fetchmany(chunk_rows):
+        stamps, states = zip(*rows)
+        times.append(np.array(stamps, dtype=np.float64))
+        if codes is None:
+            # None (unknown, unavailable, missing attribute) becomes NaN.
+            values.append(np.array(states, dtype=np.float64))
+        else:
+            values.append(_categorical(states, codes, default))
+    if not times:
+        return np.empty(0), np.empty(0, np.float64 if codes is None else np.int16)
+    return np.concatenate(times), np.concatenate(values)
+
+
+def _hold(times: np.ndarray, values: np.ndarray, timeline: np.ndarray, fill: float) -> np.ndarray:
+    """Return the value each series had at every ``timeline`` instant."""
+    index = np.searchsorted(times, timeline, side="right") - 1
+    if not len(values):
+        return np.full(len(timeline), fill, dtype=values.dtype)
+    held = values[np.maximum(index, 0)]
+    held[index < 0] = fill
+    return held
+
+
+def load_history(
+    database: str | Path,
+    object_id: str,
+    *,
+    start: float | None = None,
+    end: float | None = None,
+    entities: dict[str, tuple[str, str | None]] | None = None,
+    chunk_rows: int = DEFAULT_HISTORY_CHUNK_ROWS,
+) -> Telemetry:
+    """Load one stove from a Home Assistant recorder database.
+
+    The recorder stores a row per change, so every field is sampled on the
+    union of all change times, holding its last value in between.
+    """
+    entities = entities or history_entities(object_id)
+    start = -math.inf if start is None else start
+    end = math.inf if end is None else end
+    status_lookup = {name: code for code, name in enumerate(STATUS_NAMES)}
+    error_lookup: dict[str, int] = {}
+    for code, name in ERROR_CODE_MAP.items():
+        error_lookup.setdefault(name, code)
+    categorical = {
+        "status": (status_lookup, STATUS_UNKNOWN),
+        "error_code": (error_lookup, ERROR_UNKNOWN),
+    }
+    connection = sqlite3.connect(f"file:{Path(database).as_posix()}?mode=ro", uri=True)
+    try:
+        series = {
+            field: _history_series(
+                connection,
+                entity_id,
+                attribute,
+                start,
+                end,
+                chunk_rows,
+                *categorical.get(field, ()),
+            )
+            for field, (entity_id, attribute) in entities.items()
+        }
+    finally:
+        connection.close()
+    if not len(series["status"][0]):
+        raise ValueError(f"No history for {entities['status'][0]} in {database}")
+    timeline = np.unique(np.concatenate([times for times, _ in series.values()]))
+    fills = {"status": STATUS_UNKNOWN, "error_code": ERROR_UNKNOWN}
+    held = {field: _hold(*series[field], timeline, fills.get(field, math.nan)) for field in series}
+    return Telemetry(
+        name=object_id,
+        timestamp=timeline,
+        status=held["status"].astype(np.int8),
+        room_temp=held["room_temp"],
+        setpoint=held["setpoint"],
+        flu_gas_temp=held["flu_gas_temp"],
+        pellet_speed=held["pellet_speed"],
+        error_code=held["error_code"].astype(np.int16),
+        max_gap=None,
+    )
+
+
+def _runs_peak_median(
+    values: np.ndarray, starts: np.ndarray, ends: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return the peak and (lower) median of ``values`` over each run, ignoring NaN.
+
+    The third array tells which runs had any value. One sort answers both
+    for every run at once: run k is shifted by k times the value range, so
+    each run sorts within its own block (with NaN last).
+    """
+    lengths = ends - starts
+    offsets = np.cumsum(lengths) - lengths
+    run = np.repeat(np.arange(len(starts)), lengths)
+    index = np.arange(lengths.sum()) - np.repeat(offsets, lengths) + np.repeat(starts, lengths)
+    sample = values[index]
+    missing = np.isnan(sample)
+    valid = np.bincount(run, weights=~missing, minlength=len(starts)).astype(np.int64)
+    present = valid > 0
+    low, high = 0.0, 0.0
+    if present.any():
+        low, high = float(np.nanmin(sample)), float(np.nanmax(sample))
+    shift = run * (high - low + 1.0) - low
+    ordered = np.sort(np.where(missing, high + 0.5, sample) + shift) - shift
+    if not len(ordered):
+        return ordered, ordered, present
+    peaks = ordered[np.where(present, offsets + valid - 1, 0)]
+    medians = ordered[np.where(present, offsets + (valid - 1) // 2, 0)]
+    return peaks, medians, present
+
+
+def _percentile(values: np.ndarray, q: float, scale: float = 1.0) -> float | None:
+    if not len(values):
+        return None
+    return round(float(np.percentile(values, q)) / scale, 1)
+
+
+def _mean(values: np.ndarray) -> float | None:
+    return round(float(values.mean()), 1) if len(values) else None
+
+
+def summarize(telemetry: Telemetry) -> dict[str, Any]:
+    """Return the per-stove statistics of ``telemetry``.
+
+    * ignitions: an "Ignition starting" run followed directly by "Flame On"
+      succeeded (its duration counts), by anything else known it failed.
+    * heat-up: for flame runs that started with the room below the setpoint,
+      the time from ignition start (or flame on, if the ignition is not in
+      the data) to the first sample at or above the setpoint.
+    * flue gas overshoot: peak minus median flue temperature of a flame run.
+    * pellet duty: share of flame-on time with a non-zero pellet speed.
+    * errors: the number of times each error code appeared.
+    """
+    t = telemetry.timestamp
+    status = telemetry.status
+    if not len(t):
+        raise ValueError(f"No samples for {telemetry.name}")
+    summary: dict[str, Any] = {
+        "name": telemetry.name,
+        "samples": len(t),
+        "from": float(t[0]),
+        "to": float(t[-1]),
+        "days": round(float(t[-1] - t[0]) / 86400, 1),
+    }
+
+    # Runs of equal status, also split where the data has a hole.
+    dt = np.diff(t)
+    gap = dt > telemetry.max_gap if telemetry.max_gap is not None else np.zeros(len(dt), bool)
+    starts = np.flatnonzero((status[1:] != status[:-1]) | gap) + 1
+    starts = np.concatenate(([0], starts))
+    ends = np.append(starts[1:], len(t)).astype(np.int64)
+    codes = status[starts].astype(np.int16)
+    next_codes = np.append(codes[1:], STATUS_UNKNOWN)
+    # Whether run i is directly followed by run i + 1.
+    followed = np.zeros(len(starts), bool)
+    followed[:-1] = ~gap[ends[:-1] - 1]
+    run_start = t[starts]
+    next_start = np.append(run_start[1:], math.nan)
+    # Seconds each sample stands for: up to the next one, unless a hole follows.
+    weight = np.zeros(len(t))
+    weight[:-1] = dt
+    weight[:-1][gap] = 0.0
+    flame_weight = np.where(status == STATUS_FLAME_ON_CODE, weight, 0.0)
+
+    ignition = codes == STATUS_IGNITION_CODE
+    finished = ignition & followed & (next_codes != STATUS_UNKNOWN)
+    succeeded = finished & (next_codes == STATUS_FLAME_ON_CODE)
+    ignition_seconds = (next_start - run_start)[succeeded]
+    failed = int((finished & ~succeeded).sum())
+    summary.update(
+        ignitions=int(ignition.sum()),
+        failed_ignitions=failed,
+        failed_ignition_rate=round(100.0 * failed / finished.sum(), 1) if finished.any() else None,
+        ignition_median_s=_percentile(ignition_seconds, 50),
+        ignition_p90_s=_percentile(ignition_seconds, 90),
+        flame_on_hours=round(float(flame_weight.sum()) / 3600, 1),
+    )
+
+    flame = codes == STATUS_FLAME_ON_CODE
+    flame_starts, flame_ends = starts[flame], ends[flame]
+    summary.update(
+        cycles=int(flame.sum()),
+        completed_cycles=int((flame & followed & (next_codes == STATUS_COOLING_CODE)).sum()),
+    )
+
+    # Heat-up: first sample at or above the setpoint inside each flame run.
+    after_ignition = np.zeros(len(starts), bool)
+    after_ignition[1:] = ignition[:-1] & followed[:-1]
+    previous_start = np.concatenate(([math.nan], run_start[:-1]))
+    origin = np.where(after_ignition, previous_start, run_start)[flame]
+    room, setpoint = telemetry.room_temp, telemetry.setpoint
+    cold = room[flame_starts] < setpoint[flame_starts]
+    reached = np.flatnonzero(room >= setpoint)
+    first = np.append(reached, len(t))[np.searchsorted(reached, flame_starts)]
+    hit = cold & (first < flame_ends)
+    to_setpoint = t[first[hit]] - origin[hit]
+    summary.update(
+        cold_starts=int(cold.sum()),
+        setpoint_reached=int(hit.sum()),
+        to_setpoint_median_min=_percentile(to_setpoint, 50, 60),
+        to_setpoint_p90_min=_percentile(to_setpoint, 90, 60),
+    )
+
+    peaks, medians, present = _runs_peak_median(telemetry.flu_gas_temp, flame_starts, flame_ends)
+    overshoot = (peaks - medians)[present]
+    summary.update(
+        flue_peak_mean=_mean(peaks[present]),
+        flue_overshoot_mean=_mean(overshoot),
+        flue_overshoot_max=round(float(overshoot.max()), 1) if len(overshoot) else None,
+    )
+
+    pellet = telemetry.pellet_speed
+    known = ~np.isnan(pellet)
+    feed_time = flame_weight.sum(where=known)
+    summary.update(
+        pellet_duty=(
+            round(100.0 * float(flame_weight.sum(where=pellet > 0) / feed_time), 1)
+            if feed_time
+            else None
+        ),
+        pellet_speed_mean=(
+            round(float((flame_weight * pellet).sum(where=known) / feed_time), 1)
+            if feed_time
+            else None
+        ),
+    )
+
+    # Carry the last known error over unknown samples, then count onsets.
+    error = telemetry.error_code
+    unknown = error == ERROR_UNKNOWN
+    if unknown.any():
+        error = error[np.maximum.accumulate(np.where(unknown, 0, np.arange(len(error))))]
+    previous = np.concatenate(([0], error[:-1]))
+    onsets = error[(error > 0) & (error != previous)]
+    errors: dict[str, int] = {}
+    for code, count in zip(*np.unique(onsets, return_counts=True)):
+        name = ERROR_CODE_MAP.get(int(code), str(int(code)))
+        errors[name] = errors.get(name, 0) + int(count)
+    summary.update(
+        errors=errors,
+        errors_per_day=round(len(onsets) / summary["days"], 2) if summary["days"] else None,
+    )
+    return summary
+
+
+# (key, heading) of the text table; errors are listed after the table.
+SUMMARY_COLUMNS = (
+    ("name", "Stove"),
+    ("days", "Days"),
+    ("flame_on_hours", "Flame h"),
+    ("ignitions", "Ignitions"),
+    ("failed_ignition_rate", "Failed %"),
+    ("ignition_median_s", "Ign s"),
+    ("ignition_p90_s", "Ign p90"),
+    ("to_setpoint_median_min", "Heat min"),
+    ("to_setpoint_p90_min", "Heat p90"),
+    ("flue_peak_mean", "Flue pk"),
+    ("flue_overshoot_mean", "Overshoot"),
+    ("pellet_duty", "Feed %"),
+    ("errors_per_day", "Err/day"),
+)
+
+
+def format_summaries(summaries: Iterable[dict[str, Any]]) -> list[str]:
+    """Return a text table with one row per stove, then each stove's errors."""
+    summaries = list(summaries)
+    cells = [[heading for _, heading in SUMMARY_COLUMNS]]
+    cells.extend(
+        ["-" if summary[key] is None else str(summary[key]) for key, _ in SUMMARY_COLUMNS]
+        for summary in summaries
+    )
+    widths = [max(len(row[column]) for row in cells) for column in range(len(SUMMARY_COLUMNS))]
+    lines = [
+        "  ".join(
+            cell.ljust(width) if column == 0 else cell.rjust(width)
+            for column, (cell, width) in enumerate(zip(row, widths))
+        )
+        for row in cells
+    ]
+    for summary in summaries:
+        if summary["errors"]:
+            listed = ", ".join(f"{name} x{count}" for name, count in summary["errors"].items())
+            lines.append(f"{summary['name']} errors: {listed}")
+    return lines
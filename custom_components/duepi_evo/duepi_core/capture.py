@@ -0,0 +1,375 @@
+"""Append-only binary capture of proxied wire traffic.
+
+A capture file starts with an 8-byte header followed by records of a fixed
+13-byte head and the raw frame::
+
+    <d  timestamp (epoch seconds)
+    B   direction (DIRECTION_TX / DIRECTION_RX)
+    B   flags (CAPTURE_FLAG_CACHED: answered by the proxy's cache)
+    H   client id
+    B   frame length
+
+Each request is written together with its response, so a ``tx`` record is
+always directly followed by its ``rx`` record (with an empty frame when the
+stove stayed silent). A sidecar ``.idx`` file holds ``(timestamp, offset)``
+pairs of request records, one per ``index_interval`` seconds and at least
+one per ``INDEX_BYTES`` of capture, so a reader can jump to any moment of a
+multi-day capture with a binary search instead of scanning it. Both files
+are only appended to; a record cut short by a crash is dropped when the
+capture is reopened.
+"""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_right
+from collections.abc import Callable, Iterator
+import mmap
+from pathlib import Path
+import struct
+import time
+from typing import NamedTuple
+
+from .trace import DIRECTION_RX, DIRECTION_TX
+
+CAPTURE_MAGIC = b"DPCP"
+CAPTURE_VERSION = 1
+CAPTURE_FLAG_CACHED = 0x01
+CAPTURE_SUFFIX = ".dpcap"
+INDEX_SUFFIX = ".idx"
+
+DEFAULT_INDEX_INTERVAL = 60.0
+INDEX_BYTES = 1 << 20
+
+_HEADER = struct.Struct("<4sHH")
+_RECORD = struct.Struct("<dBBHB")
+_INDEX_ENTRY = struct.Struct("<dQ")
+
+
+class CaptureFormatError(Exception):
+    """The file is not a capture or was written by a newer version."""
+
+
+class CaptureRecord(NamedTuple):
+    """One frame of a capture."""
+
+    timestamp: float
+    direction: int
+    client_id: int
+    cached: bool
+    frame: bytes
+    offset: int
+
+
+def index_path(path: str | Path) -> Path:
+    """Return the sidecar index path of a capture file."""
+    path = Path(path)
+    return path.with_name(path.name + INDEX_SUFFIX)
+
+
+def _check_header(header: bytes) -> None:
+    if len(header) < _HEADER.size:
+        raise CaptureFormatError("File too short for a capture header")
+    magic, version, _reserved = _HEADER.unpack_from(header)
+    if magic != CAPTURE_MAGIC:
+        raise CaptureFormatError("Not a Duepi EVO capture")
+    if version > CAPTURE_VERSION:
+        raise CaptureFormatError(f"Capture version {version} is not supported")
+
+
+def _iter_records(data: bytes | mmap.mmap, offset: int) -> Iterator[CaptureRecord]:
+    end = len(data)
+    while offset + _RECORD.size <= end:
+        timestamp, direction, flags, client_id, length = _RECORD.unpack_from(data, offset)
+        start = offset + _RECORD.size
+        if start + length > end:
+            return
+        yield CaptureRecord(
+            timestamp,
+            direction,
+            client_id,
+            bool(flags & CAPTURE_FLAG_CACHED),
+            bytes(data[start : start + length]),
+            offset,
+        )
+        offset = start + length
+
+
+def _read_index(path: Path) -> tuple[array, array]:
+    times = array("d")
+    offsets = array("Q")
+    try:
+        data = path.read_bytes()
+    except FileNotFoundError:
+        return times, offsets
+    usable = len(data) - len(data) % _INDEX_ENTRY.size
+    for timestamp, offset in _INDEX_ENTRY.iter_unpack(data[:usable]):
+        times.append(timestamp)
+        offsets.append(offset)
+    return times, offsets
+
+
+class CaptureWriter:
+    """Append records to a capture and its index through buffered files."""
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        index_interval: float = DEFAULT_INDEX_INTERVAL,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = Path(path)
+        self.index_interval = index_interval
+        self.clock = clock
+        self.records = 0
+        self._next_index_time = float("-inf")
+        self._last_index_time = float("-inf")
+        self._last_index_offset = -INDEX_BYTES
+        self._offset = self._recover()
+        self._file = open(self.path, "ab")
+        self._index = open(index_path(self.path), "ab")
+        if self._offset == 0:
+            self._file.write(_HEADER.pack(CAPTURE_MAGIC, CAPTURE_VERSION, 0))
+            self._offset = _HEADER.size
+
+    def _recover(self) -> int:
+        """Return the end of the last complete record, trimming a torn tail."""
+        if not self.path.exists() or self.path.stat().st_size == 0:
+            index_path(self.path).unlink(missing_ok=True)
+            return 0
+        with open(self.path, "rb") as file:
+            _check_header(file.read(_HEADER.size))
+        times, offsets = _read_index(index_path(self.path))
+        with open(self.path, "r+b") as file:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                size = len(data)
+                # Index entries written after the last flushed record are dropped.
+                while offsets and offsets[-1] >= size:
+                    offsets.pop()
+                    times.pop()
+                end = offsets[-1] if offsets else _HEADER.size
+                for record in _iter_records(data, end):
+                    end = record.offset + _RECORD.size + len(record.frame)
+            finally:
+                data.close()
+            if end < size:
+                file.truncate(end)
+        with open(index_path(self.path), "wb") as index:
+            for timestamp, offset in zip(times, offsets):
+                index.write(_INDEX_ENTRY.pack(timestamp, offset))
+        if times:
+            self._last_index_time = times[-1]
+            self._last_index_offset = offsets[-1]
+            self._next_index_time = times[-1] + self.index_interval
+        return end
+
+    def write(
+        self,
+        direction: int,
+        client_id: int,
+        frame: bytes,
+        *,
+        cached: bool = False,
+        timestamp: float | None = None,
+    ) -> None:
+        """Append one frame; request records may also add an index entry."""
+        if timestamp is None:
+            timestamp = self.clock()
+        if direction == DIRECTION_TX and (
+            timestamp >= self._next_index_time
+            or self._offset - self._last_index_offset >= INDEX_BYTES
+        ):
+            # Keep the index sorted even if the wall clock steps back.
+            self._last_index_time = max(timestamp, self._last_index_time)
+            self._index.write(_INDEX_ENTRY.pack(self._last_index_time, self._offset))
+            self._last_index_offset = self._offset
+            self._next_index_time = timestamp + self.index_interval
+        frame = frame[:255]
+        self._file.write(
+            _RECORD.pack(
+                timestamp,
+                direction,
+                CAPTURE_FLAG_CACHED if cached else 0,
+                client_id & 0xFFFF,
+                len(frame),
+            )
+        )
+        self._file.write(frame)
+        self._offset += _RECORD.size + len(frame)
+        self.records += 1
+
+    def write_exchange(
+        self,
+        client_id: int,
+        request: bytes,
+        response: bytes,
+        *,
+        cached: bool = False,
+        sent_at: float | None = None,
+    ) -> None:
+        """Append a request and its response (``b""`` if there was none)."""
+        self.write(DIRECTION_TX, client_id, request, cached=cached, timestamp=sent_at)
+        self.write(DIRECTION_RX, client_id, response, cached=cached)
+
+    def flush(self) -> None:
+        """Write buffered records to disk; the index follows the records."""
+        self._file.flush()
+        self._index.flush()
+
+    def close(self) -> None:
+        """Flush and close both files."""
+        self.flush()
+        self._file.close()
+        self._index.close()
+
+    def __enter__(self) -> CaptureWriter:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+
+class CaptureReader:
+    """Memory-mapped, read-only view of a capture."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        try:
+            _check_header(self._file.read(_HEADER.size))
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+        self._times, self._offsets = _read_index(index_path(self.path))
+        size = len(self._map)
+        while self._offsets and self._offsets[-1] >= size:
+            self._offsets.pop()
+            self._times.pop()
+
+    def close(self) -> None:
+        """Unmap and close the capture."""
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> CaptureReader:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+    def __iter__(self) -> Iterator[CaptureRecord]:
+        return _iter_records(self._map, _HEADER.size)
+
+    @property
+    def size(self) -> int:
+        """Return the capture size in bytes."""
+        return len(self._map)
+
+    def time_range(self) -> tuple[float, float] | None:
+        """Return the first and last timestamp, or ``None`` for an empty capture."""
+        first = next(iter(self), None)
+        if first is None:
+            return None
+        start = self._offsets[-1] if self._offsets else _HEADER.size
+        last = first
+        for last in _iter_records(self._map, start):
+            pass
+        return first.timestamp, last.timestamp
+
+    def seek(self, timestamp: float) -> int:
+        """Return the offset of the last indexed request at or before ``timestamp``."""
+        position = bisect_right(self._times, timestamp) - 1
+        return self._offsets[position] if position >= 0 else _HEADER.size
+
+    def records(
+        self,
+        start: float | None = None,
+        end: float | None = None,
+        *,
+        client_id: int | None = None,
+    ) -> Iterator[CaptureRecord]:
+        """Yield requests sent in ``[start, end)`` with their responses.
+
+        A response is kept with its request even when it arrived after
+        ``end``, so a slice always replays cleanly.
+        """
+        offset = self.seek(start) if start is not None else _HEADER.size
+        keep = False
+        for record in _iter_records(self._map, offset):
+            if record.direction == DIRECTION_TX:
+                if end is not None and record.timestamp >= end:
+                    return
+                keep = (start is None or record.timestamp >= start) and (
+                    client_id is None or record.client_id == client_id
+                )
+            if keep:
+                yield record
+
+    def export(
+        self,
+        path: str | Path,
+        start: float | None = None,
+        end: float | None = None,
+        *,
+        client_id: int | None = None,
+    ) -> int:
+        """Write the records of ``records(start, end)`` to a new capture; return their count."""
+        with CaptureWriter(path) as writer:
+            for record in self.records(start, end, client_id=client_id):
+                writer.write(
+                    record.direction,
+                    record.client_id,
+                    record.frame,
+                    cached=record.cached,
+                    timestamp=record.timestamp,
+                )
+            return writer.records
+
+
+def is_capture(path: str | Path) -> bool:
+    """Return whether ``path`` starts with the capture header."""
+    with open(path, "rb") as file:
+        return file.read(len(CAPTURE_MAGIC)) == CAPTURE_MAGIC
+
+
+def trace_from_capture(
+    path: str | Path,
+    start: float | None = None,
+    end: float | None = None,
+    *,
+    client_id: int | None = None,
+) -> list[tuple[float, int, bytes]]:
+    """Return the exchanges with the stove as a replay trace.
+
+    Answers served from the proxy's cache never reached the stove and are
+    left out, as are empty responses.
+    """
+    with CaptureReader(path) as reader:
+        return [
+            (record.timestamp, record.direction, record.frame)
+            for record in reader.records(start, end, client_id=client_id)
+            if not record.cached and (record.frame or record.direction == DIRECTION_TX)
+        ]
+
+
+def rebuild_index(path: str | Path, index_interval: float = DEFAULT_INDEX_INTERVAL) -> int:
+    """Rewrite the sidecar index of a capture from its records; return its entries."""
+    entries = 0
+    next_time = float("-inf")
+    last_time = float("-inf")
+    last_offset = -INDEX_BYTES
+    with CaptureReader(path) as reader, open(index_path(path), "wb") as index:
+        for record in reader:
+            if record.direction != DIRECTION_TX:
+                continue
+            if record.timestamp >= next_time or record.offset - last_offset >= INDEX_BYTES:
+                last_time = max(record.timestamp, last_time)
+                index.write(_INDEX_ENTRY.pack(last_time, record.offset))
+                last_offset = record.offset
+                next_time = record.timestamp + index_interval
+                entries += 1
+    return entries
+
@@ -0,0 +1,363 @@
+"""Command line interface to one or many stoves: ``duepi``.
+
+Several commands can be given in one call; they run in order over a single
+persistent connection per stove::
+
+    duepi --host 192.168.1.20 status temperature set-setpoint 21 setpoint
+    duepi --inventory stoves.txt --json state
+    duepi --inventory stoves.txt watch
+    duepi --host 192.168.1.20 record stove.dprec
+
+An inventory lists one stove per line as ``[name] host[:port]`` (``#``
+starts a comment) and is worked through in parallel, so checking a fleet
+takes about as long as checking its slowest stove. ``watch`` (on its own)
+shows a live table instead, see ``watch.py``; ``record FILE`` samples every
+register each ``--interval`` into a columnar recording, see ``recording.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+import json
+import sys
+import time
+from typing import Any, TextIO
+
+from .client import DuepiEvoClient, DuepiEvoClientError
+from .const import (
+    ERROR_CODE_MAP,
+    FAN_MODE_MAP,
+    FAN_MODE_MAP_REV,
+    GET_BURN_TIME,
+    GET_ERRORSTATE,
+    GET_EXHFANSPEED,
+    GET_FLUGASTEMP,
+    GET_PCBTEMP,
+    GET_PELLETSPEED,
+    GET_POWERLEVEL,
+    GET_SETPOINT,
+    GET_STATUS,
+    GET_TEMPERATURE,
+    GET_TOTAL_BURN_TIME,
+)
+from .protocol import decode_status, read_hex_value, read_state_flags
+from .recording import Recorder, RecordingWriter
+from .watch import DEFAULT_WATCH_INTERVAL, StoveWatcher, run_watch
+
+DEFAULT_CLI_PORT = 23
+DEFAULT_PARALLEL = 16
+
+
+def _decode_error(code: int) -> str:
+    return ERROR_CODE_MAP.get(code, str(code))
+
+
+# Single-register reads: command name -> (register, decoder of the response).
+READ_COMMANDS: dict[str, tuple[str, Callable[[str], Any]]] = {
+    "status": (GET_STATUS, lambda response: decode_status(read_state_flags(response))),
+    "temperature": (GET_TEMPERATURE, lambda response: read_hex_value(response, 4) / 10.0),
+    "setpoint": (GET_SETPOINT, lambda response: read_hex_value(response, 4)),
+    "power": (
+        GET_POWERLEVEL,
+        lambda response: FAN_MODE_MAP_REV.get(read_hex_value(response, 4), "Off"),
+    ),
+    "error": (GET_ERRORSTATE, lambda response: _decode_error(read_hex_value(response, 4))),
+    "flugas": (GET_FLUGASTEMP, lambda response: read_hex_value(response, 4)),
+    "fan-speed": (GET_EXHFANSPEED, lambda response: read_hex_value(response, 4) * 10),
+    "pellet-speed": (GET_PELLETSPEED, lambda response: read_hex_value(response, 4)),
+    "pcb-temp": (GET_PCBTEMP, lambda response: read_hex_value(response, 4)),
+    "burn-time": (GET_BURN_TIME, lambda response: read_hex_value(response, 6)),
+    "total-burn-time": (GET_TOTAL_BURN_TIME, lambda response: read_hex_value(response, 6)),
+}
+
+# Commands taking one argument.
+ARGUMENT_COMMANDS = {"set-setpoint", "set-power", "send"}
+OTHER_COMMANDS = {"state", "probe", "on", "off", "reset"}
+COMMANDS = sorted({*READ_COMMANDS, *ARGUMENT_COMMANDS, *OTHER_COMMANDS})
+WATCH_COMMAND = "watch"
+RECORD_COMMAND = "record"
+
+ClientFactory = Callable[["Stove"], DuepiEvoClient]
+
+
+@dataclass(frozen=True, slots=True)
+class Stove:
+    """One stove of an inventory."""
+
+    name: str
+    host: str
+    port: int = DEFAULT_CLI_PORT
+
+
+def parse_address(address: str) -> tuple[str, int]:
+    """Split ``host[:port]``; a device path is a serial line without port."""
+    if address.startswith("/") or ":" not in address:
+        return address, DEFAULT_CLI_PORT
+    host, _, port = address.rpartition(":")
+    return host, int(port)
+
+
+def parse_inventory(text: str) -> list[Stove]:
+    """Return the stoves of an inventory file."""
+    stoves = []
+    for number, line in enumerate(text.splitlines(), 1):
+        fields = line.split("#", 1)[0].split()
+        if not fields:
+            continue
+        if len(fields) > 2:
+            raise ValueError(f"Line {number}: expected '[name] host[:port]', got {line.strip()!r}")
+        host, port = parse_address(fields[-1])
+        stoves.append(Stove(fields[0] if len(fields) == 2 else host, host, port))
+    if not stoves:
+        raise ValueError("The inventory lists no stoves")
+    return stoves
+
+
+def parse_batch(tokens: Sequence[str]) -> list[tuple[str, str | None]]:
+    """Group command line tokens into ``(command, argument)`` pairs."""
+    batch: list[tuple[str, str | None]] = []
+    tokens = list(tokens)
+    while tokens:
+        command = tokens.pop(0)
+        if command not in COMMANDS:
+            raise ValueError(f"Unknown command {command!r}; choose from {', '.join(COMMANDS)}")
+        argument = None
+        if command in ARGUMENT_COMMANDS:
+            if not tokens:
+                raise ValueError(f"{command} needs a value")
+            argument = tokens.pop(0)
+        batch.append((command, argument))
+    return batch
+
+
+def run_command(client: DuepiEvoClient, command: str, argument: str | None) -> Any:
+    """Run one command and return its JSON-serializable result."""
+    if command in READ_COMMANDS:
+        register, decode = READ_COMMANDS[command]
+        response = client.send_command(register)
+        try:
+            return decode(response)
+        except ValueError as err:
+            raise DuepiEvoClientError(f"Invalid {command} response {response!r}") from err
+    if command == "state":
+        return client.fetch_state().as_dict()
+    if command == "probe":
+        return asdict(client.probe())
+    if command == "set-setpoint":
+        client.set_temperature(float(argument))
+        return "OK"
+    if command == "set-power":
+        level = FAN_MODE_MAP_REV.get(int(argument)) if argument.isdigit() else argument.title()
+        if level not in FAN_MODE_MAP:
+            raise DuepiEvoClientError(f"Unknown power level {argument!r}")
+        client.set_fan_mode(level)
+        return "OK"
+    if command in ("on", "off"):
+        client.set_hvac_mode("heat" if command == "on" else "off")
+        return "OK"
+    if command == "reset":
+        client.remote_reset()
+        return "OK"
+    # send: raw command, answered with the raw frame.
+    return client.send_command(argument)
+
+
+def default_client_factory(
+    stove: Stove, *, timeout: float = 3.0, pipeline: bool = False
+) -> DuepiEvoClient:
+    """Return a client keeping one connection open for the whole batch."""
+    return DuepiEvoClient(
+        host=stove.host,
+        port=stove.port,
+        min_temp=0.0,
+        max_temp=100.0,
+        no_feedback=16.0,
+        auto_reset=False,
+        init_command=False,
+        timeout=timeout,
+        pipeline=pipeline,
+        persistent=True,
+    )
+
+
+def run_stove(
+    stove: Stove,
+    batch: list[tuple[str, str | None]],
+    client_factory: ClientFactory = default_client_factory,
+) -> dict[str, Any]:
+    """Run a batch against one stove; the first failing command ends it."""
+    started = time.perf_counter()
+    client = client_factory(stove)
+    results = []
+    error = None
+    try:
+        for command, argument in batch:
+            try:
+                value = run_command(client, command, argument)
+            except (DuepiEvoClientError, ValueError) as err:
+                error = f"{command}: {err}"
+                break
+            results.append({"command": command, "argument": argument, "value": value})
+    finally:
+        client.close()
+    return {
+        "name": stove.name,
+        "host": stove.host,
+        "port": stove.port,
+        "results": results,
+        "error": error,
+        "connects": client.metrics.connect.count,
+        "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+def run_inventory(
+    stoves: Sequence[Stove],
+    batch: list[tuple[str, str | None]],
+    *,
+    parallel: int = DEFAULT_PARALLEL,
+    client_factory: ClientFactory = default_client_factory,
+) -> list[dict[str, Any]]:
+    """Run a batch against every stove concurrently; results keep inventory order."""
+    if not stoves:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(parallel, len(stoves)))) as executor:
+        return list(executor.map(lambda stove: run_stove(stove, batch, client_factory), stoves))
+
+
+def watch_stoves(
+    stoves: Sequence[Stove],
+    client_factory: ClientFactory = default_client_factory,
+    *,
+    interval: float = DEFAULT_WATCH_INTERVAL,
+    stream: TextIO | None = None,
+    ticks: int | None = None,
+) -> int:
+    """Show the live table until interrupted; return the exit code."""
+    if not stoves:
+        raise ValueError("No stoves to watch")
+    stream = stream or sys.stdout
+    watchers = [
+        StoveWatcher(
+            stove.name,
+            client_factory(stove),
+            lambda client, command: run_command(client, command, None),
+        )
+        for stove in stoves
+    ]
+    try:
+        run_watch(watchers, stream, interval=interval, ticks=ticks, ansi=stream.isatty())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for watcher in watchers:
+            watcher.client.close()
+    return 0
+
+
+def record_stove(
+    client: DuepiEvoClient,
+    path: str,
+    *,
+    interval: float = DEFAULT_WATCH_INTERVAL,
+    samples: int | None = None,
+) -> int:
+    """Record until interrupted (or for ``samples`` rows); return the exit code."""
+    with RecordingWriter(path) as writer:
+        recorder = Recorder(client, writer, interval=interval)
+        try:
+            recorder.run(samples)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            client.close()
+    print(
+        f"{recorder.samples} samples written to {path}, {recorder.failures} failed"
+        + (f", not answered: {', '.join(sorted(recorder.skipped))}" if recorder.skipped else ""),
+        file=sys.stderr,
+    )
+    return 0 if recorder.samples else 1
+
+
+def format_result(result: dict[str, Any], *, prefix: bool) -> list[str]:
+    """Return the text lines of one stove's result."""
+    label = f"{result['name']}: " if prefix else ""
+    lines = []
+    for item in result["results"]:
+        value = item["value"]
+        if isinstance(value, dict):
+            value = " ".join(f"{key}={field}" for key, field in value.items())
+        lines.append(f"{label}{item['command']}: {value}")
+    if result["error"]:
+        lines.append(f"{label}error: {result['error']}")
+    return lines
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the CLI; return the process exit code."""
+    parser = argparse.ArgumentParser(
+        prog="duepi",
+        description="Query and control Duepi EVO stoves.",
+        epilog=(
+            f"commands: {', '.join(COMMANDS)}; or {WATCH_COMMAND} alone for a live view, "
+            f"or {RECORD_COMMAND} FILE to record every register"
+        ),
+    )
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--host", help="bridge host[:port] or serial device path")
+    target.add_argument("--inventory", help="file listing '[name] host[:port]' per line")
+    parser.add_argument("--port", type=int, help=f"bridge port (default {DEFAULT_CLI_PORT})")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--timeout", type=float, default=3.0, help="seconds per answer")
+    parser.add_argument("--pipeline", action="store_true", help="pipeline snapshot reads")
+    parser.add_argument(
+        "--parallel", type=int, default=DEFAULT_PARALLEL, help="stoves queried at once"
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=DEFAULT_WATCH_INTERVAL,
+        help="seconds between watch refreshes and recorded samples",
+    )
+    parser.add_argument("--samples", type=int, help="stop recording after this many samples")
+    parser.add_argument("commands", nargs="+", metavar="command", help="commands run in order")
+    args = parser.parse_args(argv)
+
+    watch = args.commands == [WATCH_COMMAND]
+    record = args.commands[0] == RECORD_COMMAND
+    if record and (len(args.commands) != 2 or args.inventory):
+        parser.error(f"{RECORD_COMMAND} takes one file and a single --host")
+    try:
+        batch = [] if watch or record else parse_batch(args.commands)
+        if args.inventory:
+            with open(args.inventory, encoding="utf-8") as file:
+                stoves = parse_inventory(file.read())
+        else:
+            host, port = parse_address(args.host)
+            stoves = [Stove(host, host, args.port or port)]
+    except (OSError, ValueError) as err:
+        parser.error(str(err))
+
+    def client_factory(stove: Stove) -> DuepiEvoClient:
+        return default_client_factory(stove, timeout=args.timeout, pipeline=args.pipeline)
+
+    if watch:
+        return watch_stoves(stoves, client_factory, interval=args.interval)
+    if record:
+        client = default_client_factory(stoves[0], timeout=args.timeout, pipeline=True)
+        return record_stove(client, args.commands[1], interval=args.interval, samples=args.samples)
+    results = run_inventory(stoves, batch, parallel=args.parallel, client_factory=client_factory)
+    if args.json:
+        print(json.dumps(results if args.inventory else results[0], indent=2))
+    else:
+        for result in results:
+            for line in format_result(result, prefix=bool(args.inventory)):
+                print(line)
+    return 1 if any(result["error"] for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
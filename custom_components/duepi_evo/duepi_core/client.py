@@ -0,0 +1,717 @@
+"""Low-level Duepi EVO protocol client."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+import logging
+import socket
+import threading
+import time
+from typing import Any
+
+from .const import (
+    ERROR_CODE_MAP,
+    FAN_MODE_MAP,
+    FAN_MODE_MAP_REV,
+    GET_BURN_TIME,
+    GET_ERRORSTATE,
+    GET_EXHFANSPEED,
+    GET_FLUGASTEMP,
+    GET_INITCOMMAND,
+    GET_PCBTEMP,
+    GET_PELLETSPEED,
+    GET_PRESSURE_SWITCH,
+    GET_POWERLEVEL,
+    GET_SETPOINT,
+    GET_STATUS,
+    GET_TEMPERATURE,
+    GET_TOTAL_BURN_TIME,
+    HVAC_MODE_HEAT,
+    HVAC_MODE_OFF,
+    REMOTE_RESET,
+    SET_POWERLEVEL,
+    SET_TEMPERATURE,
+)
+from .protocol import (
+    decode_pressure_switch_value,
+    decode_status,
+    generate_command,
+    hvac_from_status,
+    is_ack,
+    is_valid_frame,
+    read_hex_value,
+    read_state_flags,
+)
+from .hooks import DuepiEvoHooks
+from .metrics import DuepiEvoClientMetrics
+from .probe import (
+    OPTIONAL_REGISTERS,
+    UNSUPPORTED_AFTER_TIMEOUTS,
+    DuepiEvoCapabilities,
+    DuepiEvoProbeResult,
+)
+from .state import DuepiEvoState
+from .trace import DEFAULT_TRACE_CAPACITY, DIRECTION_RX, DIRECTION_TX, WireTrace
+from .transport import DuepiEvoTransport, create_transport, read_frame, wait_readable
+
+_LOGGER = logging.getLogger(__name__)
+
+# A persistent connection idle for this long is checked with a status read.
+HEARTBEAT_INTERVAL = 30.0
+
+# Registers read after the status (and power level) in every snapshot.
+SNAPSHOT_REGISTERS = (
+    GET_TEMPERATURE,
+    GET_PELLETSPEED,
+    GET_FLUGASTEMP,
+    GET_EXHFANSPEED,
+    GET_ERRORSTATE,
+    GET_SETPOINT,
+)
+
+
+class DuepiEvoClientError(Exception):
+    """Base client exception."""
+
+
+class DuepiEvoTimeoutError(DuepiEvoClientError):
+    """Timeout while communicating with the stove."""
+
+
+class DuepiEvoProtocolError(DuepiEvoClientError):
+    """Protocol parse/validation error."""
+
+
+class DuepiEvoClient:
+    """Client that talks to the Duepi EVO serial bridge."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        min_temp: float,
+        max_temp: float,
+        no_feedback: float,
+        auto_reset: bool,
+        init_command: bool,
+        timeout: float = 3.0,
+        capabilities: DuepiEvoCapabilities | None = None,
+        trace_capacity: int = DEFAULT_TRACE_CAPACITY,
+        connection_factory: Callable[[], Any] | None = None,
+        transport: DuepiEvoTransport | None = None,
+        pipeline: bool = False,
+        persistent: bool = False,
+        heartbeat_interval: float = HEARTBEAT_INTERVAL,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.min_temp = min_temp
+        self.max_temp = max_temp
+        self.no_feedback = no_feedback
+        self.auto_reset = auto_reset
+        self.init_command = init_command
+        self.timeout = timeout
+        self.capabilities = capabilities
+        self.metrics = DuepiEvoClientMetrics()
+        self.trace = WireTrace(trace_capacity)
+        self.hooks = DuepiEvoHooks()
+        # Where frames go: a TCP bridge or, for a device path as host, a local
+        # serial line. A connection_factory (any callable returning a
+        # socket-like object) takes precedence, as before transports existed.
+        self.transport = (
+            transport if transport is not None else create_transport(host, port, keepalive=persistent)
+        )
+        self.connection_factory = connection_factory
+        # Send the fixed snapshot registers back to back and read the answers
+        # afterwards, saving one round trip per register.
+        self.pipeline = pipeline
+        # Keep one connection open across operations instead of connecting
+        # for each; heartbeat() checks and replaces it while idle.
+        self.persistent = persistent
+        self.heartbeat_interval = heartbeat_interval
+        self._sock: Any = None
+        self._lock = threading.Lock()
+        self._last_io = 0.0
+        self._error_code_map = ERROR_CODE_MAP
+
+    generate_command = staticmethod(generate_command)
+    _read_hex_value = staticmethod(read_hex_value)
+    _decode_status = staticmethod(decode_status)
+    _hvac_from_status = staticmethod(hvac_from_status)
+
+    def _connect(self) -> socket.socket:
+        """Return a connection from the factory or the transport."""
+        if self.connection_factory is not None:
+            sock = self.connection_factory()
+            sock.settimeout(self.timeout)
+            return sock
+        return self.transport.connect(self.timeout)
+
+    def _open_socket(self) -> socket.socket:
+        """Open and connect a TCP socket."""
+        started = time.perf_counter()
+        try:
+            sock = self._connect()
+        except OSError as err:
+            if isinstance(err, (TimeoutError, socket.timeout)):
+                self.metrics.timeouts += 1
+            else:
+                self.metrics.connection_errors += 1
+            if self.hooks.enabled:
+                self._emit_connect(started, err)
+            raise
+        duration_ms = (time.perf_counter() - started) * 1000
+        self.metrics.connect.observe(duration_ms)
+        if self.hooks.enabled:
+            self._emit_connect(started, None)
+        return sock
+
+    @contextmanager
+    def _session(self) -> Iterator[socket.socket]:
+        """Yield a connection for one operation.
+
+        Without ``persistent`` every operation gets its own connection. A
+        persistent connection is shared under a lock and dropped on any error,
+        since a failed exchange may leave unread frames behind.
+        """
+        if not self.persistent:
+            with self._open_socket() as sock:
+                yield sock
+            return
+        with self._lock:
+            if self._sock is None:
+                self._sock = self._open_socket()
+            sock = self._sock
+            sock.settimeout(self.timeout)
+            try:
+                yield sock
+            except BaseException:
+                self._close_connection()
+                raise
+            self._last_io = time.monotonic()
+
+    def _close_connection(self) -> None:
+        sock, self._sock = self._sock, None
+        if sock is not None:
+            try:
+                sock.close()
+            except OSError:
+                pass
+
+    def close(self) -> None:
+        """Close the persistent connection, if any."""
+        with self._lock:
+            self._close_connection()
+
+    def heartbeat(self) -> bool:
+        """Keep the persistent connection usable while the stove is idle.
+
+        A connection unused for ``heartbeat_interval`` seconds is checked with
+        a ``GET_STATUS`` read; a half-open one (bridge rebooted or off Wi-Fi)
+        is closed and replaced right away, so the next poll or command does
+        not wait for a timeout and a reconnect. Skips the check while another
+        operation holds the connection. Returns whether a connection is open.
+        """
+        if not self.persistent or not self._lock.acquire(blocking=False):
+            return True
+        try:
+            sock = self._sock
+            if sock is not None:
+                if time.monotonic() - self._last_io < self.heartbeat_interval:
+                    return True
+                try:
+                    sock.settimeout(self.timeout)
+                    self._send_and_recv(sock, GET_STATUS)
+                except (OSError, DuepiEvoProtocolError) as err:
+                    _LOGGER.debug("Stale connection to %s:%s replaced: %s", self.host, self.port, err)
+                    self._close_connection()
+                    self.metrics.stale_connections += 1
+                    if self.hooks.enabled:
+                        self.hooks.emit("retry", reason="stale_connection", error=str(err))
+                else:
+                    self._last_io = time.monotonic()
+                    return True
+            try:
+                self._sock = self._open_socket()
+            except OSError as err:
+                _LOGGER.debug("Reconnect to %s:%s failed: %s", self.host, self.port, err)
+                return False
+            self._last_io = time.monotonic()
+            return True
+        finally:
+            self._lock.release()
+
+    def _emit_connect(self, started: float, error: Exception | None) -> None:
+        self.hooks.emit(
+            "connect",
+            host=self.host,
+            port=self.port,
+            duration_ms=(time.perf_counter() - started) * 1000,
+            ok=error is None,
+            error=None if error is None else str(error),
+        )
+
+    def _send_init_if_needed(self, sock: socket.socket) -> None:
+        """Send optional init command and consume optional immediate response frame."""
+        if not self.init_command:
+            return
+
+        frame = self.generate_command(GET_INITCOMMAND).encode()
+        self.trace.record(DIRECTION_TX, frame)
+        sock.send(frame)
+
+        try:
+            ready_to_read = self._wait_readable(sock, 0.2)
+        except OSError:
+            return
+
+        if not ready_to_read:
+            return
+
+        try:
+            raw = read_frame(sock)
+            self.trace.record(DIRECTION_RX, raw)
+            init_response = raw.decode(errors="ignore")
+            if init_response:
+                _LOGGER.debug("init_command response consumed: %s", init_response)
+        except (TimeoutError, socket.timeout, OSError):
+            return
+
+    _wait_readable = staticmethod(wait_readable)
+
+    def _send(self, sock: socket.socket, commands: list[str]) -> None:
+        """Send protocol commands in one write."""
+        frames = []
+        for command in commands:
+            frame = self.generate_command(command).encode()
+            self.trace.record(DIRECTION_TX, frame)
+            if self.hooks.enabled:
+                self.hooks.emit("frame_send", command=command, frame=frame)
+            frames.append(frame)
+        sock.send(frames[0] if len(frames) == 1 else b"".join(frames))
+
+    def _recv(self, sock: socket.socket) -> str:
+        """Receive one protocol response frame."""
+        raw = read_frame(sock)
+        self.trace.record(DIRECTION_RX, raw)
+        response = raw.decode(errors="ignore")
+        if not is_valid_frame(response):
+            raise DuepiEvoProtocolError(f"Malformed response from {self.host}:{self.port}: {response!r}")
+        return response
+
+    def _send_and_recv(self, sock: socket.socket, command: str) -> str:
+        """Send command and return response frame."""
+        return self._send_and_recv_many(sock, [command])[0]
+
+    def _send_and_recv_many(self, sock: socket.socket, commands: list[str]) -> list[str]:
+        """Send commands back to back and return their response frames in order.
+
+        Latencies are measured from the common send, so a pipelined command
+        also accounts for the answers queued before its own.
+        """
+        hooks = self.hooks
+        metrics = self.metrics
+        started = time.perf_counter()
+        responses: list[str] = []
+        command = commands[0]
+        try:
+            self._send(sock, commands)
+            for command in commands:
+                response = self._recv(sock)
+                metrics.command(command).observe((time.perf_counter() - started) * 1000)
+                if hooks.enabled:
+                    self._emit_frame_recv(command, started, response)
+                responses.append(response)
+        except (TimeoutError, socket.timeout):
+            metrics.timeouts += 1
+            if hooks.enabled:
+                self._emit_frame_recv(command, started, None)
+            raise
+        except DuepiEvoProtocolError:
+            metrics.protocol_errors += 1
+            if hooks.enabled:
+                self._emit_frame_recv(command, started, None)
+            raise
+        return responses
+
+    def _emit_frame_recv(self, command: str, started: float, response: str | None) -> None:
+        self.hooks.emit(
+            "frame_recv",
+            command=command,
+            frame=response,
+            duration_ms=(time.perf_counter() - started) * 1000,
+            ok=response is not None,
+        )
+
+    def _send_and_expect_ack(self, sock: socket.socket, command: str) -> None:
+        """Send command and validate ACK flag."""
+        response = self._send_and_recv(sock, command)
+        acknowledged = is_ack(response)
+        if self.hooks.enabled:
+            self.hooks.emit("command_ack", command=command, ok=acknowledged)
+        if not acknowledged:
+            raise DuepiEvoProtocolError(f"No ACK for command {command}, response={response!r}")
+
+    def _optional_read(
+        self,
+        sock: socket.socket,
+        command: str,
+        *,
+        description: str,
+        parser,
+    ):
+        """Read optional telemetry without failing the main snapshot."""
+        try:
+            response = self._send_and_recv(sock, command)
+            return parser(response)
+        except (DuepiEvoProtocolError, TimeoutError, socket.timeout, ValueError) as err:
+            _LOGGER.debug(
+                "Optional %s read failed for %s:%s: %s",
+                description,
+                self.host,
+                self.port,
+                err,
+            )
+            return None
+
+    def _probe_register(self, sock: socket.socket, capability: str, command: str) -> bool:
+        """Return whether an optional register answers.
+
+        A malformed answer marks it unsupported at once; a timeout only after
+        ``UNSUPPORTED_AFTER_TIMEOUTS`` in a row, so one dropped frame does not
+        hide the register for good.
+        """
+        for _ in range(UNSUPPORTED_AFTER_TIMEOUTS):
+            try:
+                self._read_hex_value(self._send_and_recv(sock, command), 4)
+            except (TimeoutError, socket.timeout):
+                continue
+            except (DuepiEvoProtocolError, ValueError) as err:
+                _LOGGER.debug(
+                    "Optional %s read failed for %s:%s: %s", capability, self.host, self.port, err
+                )
+                return False
+            return True
+        _LOGGER.debug(
+            "Optional %s read timed out %s times for %s:%s",
+            capability,
+            UNSUPPORTED_AFTER_TIMEOUTS,
+            self.host,
+            self.port,
+        )
+        return False
+
+    def _supports(self, capability: str) -> bool:
+        """Return whether an optional register should be queried."""
+        if self.capabilities is None:
+            return True
+        return bool(getattr(self.capabilities, capability))
+
+    def query_plan(self, burner_status: str | None = None) -> list[str]:
+        """Return the commands ``fetch_state`` sends, in order.
+
+        The power level is skipped while the burner is off; pass the last known
+        ``burner_status`` to get the plan of the next poll. A pipelined poll
+        always asks for it, since the status is not known when it is sent.
+        """
+        plan = [GET_INITCOMMAND] if self.init_command else []
+        plan.append(GET_STATUS)
+        if self.pipeline or burner_status != "Off":
+            plan.append(GET_POWERLEVEL)
+        plan += SNAPSHOT_REGISTERS
+        plan += [
+            command
+            for capability, command in OPTIONAL_REGISTERS.items()
+            if self._supports(capability)
+        ]
+        return plan
+
+    def _decode_pressure_switch(self, response: str) -> bool | None:
+        """Decode the pressure switch status returned by RC0000."""
+        pressure_switch_active = decode_pressure_switch_value(self._read_hex_value(response, 4))
+        if pressure_switch_active is None:
+            _LOGGER.debug(
+                "Unexpected pressure switch payload from %s:%s: %s",
+                self.host,
+                self.port,
+                response,
+            )
+        return pressure_switch_active
+
+    def fetch_state(self) -> DuepiEvoState:
+        """Fetch and parse a full stove state snapshot."""
+        hooks = self.hooks
+        if not hooks.enabled:
+            return self._fetch_state_with_failover()
+        hooks.emit("poll_start", host=self.host, port=self.port)
+        started = time.perf_counter()
+        error: DuepiEvoClientError | None = None
+        try:
+            return self._fetch_state_with_failover()
+        except DuepiEvoClientError as err:
+            error = err
+            raise
+        finally:
+            hooks.emit(
+                "poll_end",
+                host=self.host,
+                port=self.port,
+                duration_ms=(time.perf_counter() - started) * 1000,
+                ok=error is None,
+                error=None if error is None else str(error),
+            )
+
+    def _fetch_state_with_failover(self) -> DuepiEvoState:
+        """Poll, once more over another endpoint when the active one times out.
+
+        Refused and stalled connects are already failed over by the transport;
+        this covers a bridge port that accepts the connection but stays silent.
+        """
+        transport = self.transport
+        if self.connection_factory is not None:
+            return self._fetch_state()
+        started = time.perf_counter()
+        try:
+            state = self._fetch_state()
+        except DuepiEvoTimeoutError as err:
+            failed = transport.describe()
+            if not transport.report_failure(err):
+                raise
+            if self.hooks.enabled:
+                self.hooks.emit("retry", reason="failover", endpoint=failed)
+            started = time.perf_counter()
+            try:
+                state = self._fetch_state()
+            except DuepiEvoTimeoutError as retry_err:
+                transport.report_failure(retry_err)
+                raise
+        transport.report_success((time.perf_counter() - started) * 1000)
+        return state
+
+    def _fetch_state(self) -> DuepiEvoState:
+        """Poll every register of one snapshot over a single connection."""
+        started = time.perf_counter()
+        try:
+            with self._session() as sock:
+                self._send_init_if_needed(sock)
+
+                if self.pipeline:
+                    commands = [GET_STATUS, GET_POWERLEVEL, *SNAPSHOT_REGISTERS]
+                    responses = dict(zip(commands, self._send_and_recv_many(sock, commands)))
+                    burner_status = self._decode_status(read_state_flags(responses[GET_STATUS]))
+                else:
+                    responses = {GET_STATUS: self._send_and_recv(sock, GET_STATUS)}
+                    burner_status = self._decode_status(read_state_flags(responses[GET_STATUS]))
+                    if burner_status != "Off":
+                        responses[GET_POWERLEVEL] = self._send_and_recv(sock, GET_POWERLEVEL)
+                    for command in SNAPSHOT_REGISTERS:
+                        responses[command] = self._send_and_recv(sock, command)
+
+                if burner_status == "Off":
+                    power_level_code = FAN_MODE_MAP["Off"]
+                else:
+                    power_level_code = self._read_hex_value(responses[GET_POWERLEVEL], 4)
+                power_level = FAN_MODE_MAP_REV.get(power_level_code)
+                if power_level is None:
+                    power_level = "Off"
+                    _LOGGER.warning(
+                        "Unknown fan mode value received: %s. Falling back to %s",
+                        power_level_code,
+                        power_level,
+                    )
+
+                current_temperature = self._read_hex_value(responses[GET_TEMPERATURE], 4) / 10.0
+                pellet_speed = self._read_hex_value(responses[GET_PELLETSPEED], 4)
+                flu_gas_temp = self._read_hex_value(responses[GET_FLUGASTEMP], 4)
+                exh_fan_speed = self._read_hex_value(responses[GET_EXHFANSPEED], 4) * 10
+
+                error_code_decimal = self._read_hex_value(responses[GET_ERRORSTATE], 4)
+                error_code = self._error_code_map.get(error_code_decimal, str(error_code_decimal))
+
+                setpoint_raw = self._read_hex_value(responses[GET_SETPOINT], 4)
+                target_temperature = None
+                if setpoint_raw != 0 and self.min_temp < setpoint_raw < self.max_temp:
+                    target_temperature = float(setpoint_raw)
+
+                pcb_temp = None
+                if self._supports("pcb_temp"):
+                    pcb_temp = self._optional_read(
+                        sock,
+                        GET_PCBTEMP,
+                        description="PCB temperature",
+                        parser=lambda response: self._read_hex_value(response, 4),
+                    )
+                total_burn_time = None
+                if self._supports("total_burn_time"):
+                    total_burn_time = self._optional_read(
+                        sock,
+                        GET_TOTAL_BURN_TIME,
+                        description="total burn time",
+                        parser=lambda response: self._read_hex_value(response, 6),
+                    )
+                burn_time_since_reset = None
+                if self._supports("burn_time_since_reset"):
+                    burn_time_since_reset = self._optional_read(
+                        sock,
+                        GET_BURN_TIME,
+                        description="burn time since reset",
+                        parser=lambda response: self._read_hex_value(response, 6),
+                    )
+                pressure_switch_active = None
+                if self._supports("pressure_switch"):
+                    pressure_switch_active = self._optional_read(
+                        sock,
+                        GET_PRESSURE_SWITCH,
+                        description="pressure switch",
+                        parser=self._decode_pressure_switch,
+                    )
+
+                hvac_mode, heating = self._hvac_from_status(burner_status)
+
+                state = DuepiEvoState(
+                    burner_status=burner_status,
+                    error_code=error_code,
+                    exh_fan_speed_rpm=exh_fan_speed,
+                    flu_gas_temp_c=flu_gas_temp,
+                    pellet_speed=pellet_speed,
+                    power_level=power_level,
+                    pcb_temp_c=pcb_temp,
+                    total_burn_time_h=total_burn_time,
+                    burn_time_since_reset_h=burn_time_since_reset,
+                    pressure_switch_active=pressure_switch_active,
+                    current_temp_c=current_temperature,
+                    target_temp_c=target_temperature,
+                    hvac_mode=hvac_mode,
+                    heating=heating,
+                )
+        except (TimeoutError, socket.timeout) as err:
+            raise DuepiEvoTimeoutError(f"Time-out while polling host: {self.host}") from err
+        except OSError as err:
+            raise DuepiEvoClientError(f"Connection error to {self.host}:{self.port}: {err}") from err
+        except ValueError as err:
+            self.metrics.protocol_errors += 1
+            raise DuepiEvoProtocolError(f"Invalid numeric payload from {self.host}:{self.port}: {err}") from err
+
+        self.metrics.snapshot.observe((time.perf_counter() - started) * 1000)
+        return state
+
+    def probe(self, optional_timeout: float = 0.5) -> DuepiEvoProbeResult:
+        """Check that the bridge answers and record latency and capabilities.
+
+        Only ``GET_STATUS`` must succeed; the optional registers are queried
+        with a short timeout to build the capability profile.
+        """
+        try:
+            connect_started = time.monotonic()
+            with self._session() as sock:
+                connect_latency_ms = (time.monotonic() - connect_started) * 1000
+                self._send_init_if_needed(sock)
+
+                status_started = time.monotonic()
+                status_response = self._send_and_recv(sock, GET_STATUS)
+                status_latency_ms = (time.monotonic() - status_started) * 1000
+                burner_status = self._decode_status(read_state_flags(status_response))
+
+                sock.settimeout(optional_timeout)
+                supported = {
+                    capability: self._probe_register(sock, capability, command)
+                    for capability, command in OPTIONAL_REGISTERS.items()
+                }
+        except (TimeoutError, socket.timeout) as err:
+            raise DuepiEvoTimeoutError(f"Time-out while probing host: {self.host}") from err
+        except OSError as err:
+            raise DuepiEvoClientError(f"Connection error to {self.host}:{self.port}: {err}") from err
+        except ValueError as err:
+            raise DuepiEvoProtocolError(f"Invalid status payload from {self.host}:{self.port}: {err}") from err
+
+        return DuepiEvoProbeResult(
+            burner_status=burner_status,
+            connect_latency_ms=connect_latency_ms,
+            status_latency_ms=status_latency_ms,
+            capabilities=DuepiEvoCapabilities(**supported),
+        )
+
+    def set_fan_mode(self, fan_mode: str) -> None:
+        """Set stove fan mode by name."""
+        if fan_mode not in FAN_MODE_MAP:
+            raise DuepiEvoClientError(f"Unsupported fan mode: {fan_mode}")
+
+        power_level_hex = hex(FAN_MODE_MAP[fan_mode])[2:3]
+        command = SET_POWERLEVEL.replace("x", power_level_hex)
+
+        try:
+            with self._session() as sock:
+                self._send_init_if_needed(sock)
+                self._send_and_expect_ack(sock, command)
+        except (TimeoutError, socket.timeout) as err:
+            raise DuepiEvoTimeoutError(f"Time-out while setting fan mode on host: {self.host}") from err
+        except OSError as err:
+            raise DuepiEvoClientError(f"Connection error to {self.host}:{self.port}: {err}") from err
+
+    def set_temperature(self, target_temperature: float) -> None:
+        """Set target temperature."""
+        set_point_int = int(target_temperature)
+        set_point_hex = f"{set_point_int:02X}"
+        command = SET_TEMPERATURE.replace("xx", set_point_hex)
+
+        try:
+            with self._session() as sock:
+                self._send_init_if_needed(sock)
+                self._send_and_expect_ack(sock, command)
+        except (TimeoutError, socket.timeout) as err:
+            raise DuepiEvoTimeoutError(f"Time-out while setting temperature on host: {self.host}") from err
+        except OSError as err:
+            raise DuepiEvoClientError(f"Connection error to {self.host}:{self.port}: {err}") from err
+
+    def set_hvac_mode(self, hvac_mode: str) -> None:
+        """Set HVAC mode by mapping to Duepi power level.
+
+        Accepts the plain mode name or any str-valued enum such as ``HVACMode``.
+        """
+        mode = str(getattr(hvac_mode, "value", hvac_mode))
+        if mode == HVAC_MODE_OFF:
+            self.set_fan_mode("Off")
+            return
+        if mode == HVAC_MODE_HEAT:
+            self.set_fan_mode("Min")
+            return
+        raise DuepiEvoClientError(f"Unsupported HVAC mode: {mode}")
+
+    def send_command(self, command: str) -> str:
+        """Send one raw 5-character command and return the response frame."""
+        try:
+            with self._session() as sock:
+                self._send_init_if_needed(sock)
+                return self._send_and_recv(sock, command)
+        except (TimeoutError, socket.timeout) as err:
+            raise DuepiEvoTimeoutError(f"Time-out while sending {command} to host: {self.host}") from err
+        except OSError as err:
+            raise DuepiEvoClientError(f"Connection error to {self.host}:{self.port}: {err}") from err
+
+    def read_registers(self, commands: list[str]) -> list[str]:
+        """Return the raw responses to ``commands``, read over one connection.
+
+        With ``pipeline`` the commands are written back to back.
+        """
+        try:
+            with self._session() as sock:
+                self._send_init_if_needed(sock)
+                if self.pipeline:
+                    return self._send_and_recv_many(sock, commands)
+                return [self._send_and_recv(sock, command) for command in commands]
+        except (TimeoutError, socket.timeout) as err:
+            raise DuepiEvoTimeoutError(f"Time-out while reading registers from host: {self.host}") from err
+        except OSError as err:
+            raise DuepiEvoClientError(f"Connection error to {self.host}:{self.port}: {err}") from err
+
+    def remote_reset(self, _reason: str | None = None) -> None:
+        """Send remote reset command."""
+        try:
+            with self._session() as sock:
+                self._send_init_if_needed(sock)
+                self._send_and_expect_ack(sock, REMOTE_RESET)
+        except (TimeoutError, socket.timeout) as err:
+            raise DuepiEvoTimeoutError(f"Time-out while resetting host: {self.host}") from err
+        except OSError as err:
+            raise DuepiEvoClientError(f"Connection error to {self.host}:{self.port}: {err}") from err
@@ -0,0 +1,65 @@
+"""Protocol constants for the Duepi EVO serial bridge.
+
+This module must stay free of Home Assistant imports so the protocol core can
+be used from scripts, benchmarks and worker processes.
+"""
+
+from __future__ import annotations
+
+STATE_ACK = 0x00000020
+STATE_OFF = 0x00000020
+STATE_START = 0x01000000
+STATE_ON = 0x02000000
+STATE_CLEAN = 0x04000000
+STATE_COOL = 0x08000000
+STATE_ECO = 0x10000000
+
+GET_SETPOINT = "C6000"
+GET_PRESSURE_SWITCH = "C0000"
+GET_FLUGASTEMP = "D0000"
+GET_TEMPERATURE = "D1000"
+GET_POWERLEVEL = "D3000"
+GET_PELLETSPEED = "D4000"
+REMOTE_RESET = "D6000"
+GET_STATUS = "D9000"
+GET_ERRORSTATE = "DA000"
+GET_PCBTEMP = "DF000"
+GET_TOTAL_BURN_TIME = "ED000"
+GET_BURN_TIME = "EE000"
+GET_EXHFANSPEED = "EF000"
+GET_INITCOMMAND = "DC000"
+
+SET_POWERLEVEL = "F00x0"
+SET_TEMPERATURE = "F2xx0"
+
+FRAME_LENGTH = 10
+MIN_FRAME_LENGTH = 9
+
+HVAC_MODE_OFF = "off"
+HVAC_MODE_HEAT = "heat"
+
+FAN_MODES = ["Off", "Min", "Low", "Medium", "High", "Max"]
+FAN_MODE_MAP = {"Off": 0, "Min": 1, "Low": 2, "Medium": 3, "High": 4, "Max": 5}
+FAN_MODE_MAP_REV = {value: key for key, value in FAN_MODE_MAP.items()}
+AUTO_RESET_ERRORS = {"Out of pellets", "Ignition failure"}
+
+ERROR_CODE_MAP = {
+    0: "All OK",
+    1: "Ignition failure",
+    2: "Defective suction",
+    3: "Insufficient air intake",
+    4: "Water temperature",
+    5: "Out of pellets",
+    6: "Defective pressure switch",
+    7: "Unknown",
+    8: "No current",
+    9: "Exhaust motor failure",
+    10: "Card surge",
+    11: "Date expired",
+    12: "Unknown",
+    13: "Suction regulating sensor error",
+    14: "Overheating",
+}
+
+PRESSURE_SWITCH_OK = 0x0100
+PRESSURE_SWITCH_PRESSURE = 0x0300
@@ -0,0 +1,118 @@
+"""Incremental burner cycle analytics over decoded status transitions."""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, fields
+from typing import Any
+
+from .const import ERROR_CODE_MAP
+
+STATUS_IGNITION = "Ignition starting"
+STATUS_FLAME_ON = "Flame On"
+STATUS_COOLING = "Cooling down"
+ERROR_NONE = ERROR_CODE_MAP[0]
+
+# Polls further apart than this (e.g. while Home Assistant was down) are not
+# attributed to the last known status.
+DEFAULT_MAX_GAP = 600.0
+
+
+@dataclass(slots=True)
+class BurnerCycleStats:
+    """Running counters of ignitions, cycles and flame time.
+
+    ``update`` is O(1) per poll: it attributes the time since the previous
+    poll to the previous status and counts the transition between the two.
+    Times are wall-clock UNIX timestamps so the counters can be persisted and
+    resumed across restarts.
+
+    An ignition that reaches flame on succeeded; one that ends in an error or
+    in cooling without a flame failed. Any other end (switched off by the
+    user, an unknown state) is counted as cancelled and left out of the
+    failure rate.
+    """
+
+    ignitions: int = 0
+    successful_ignitions: int = 0
+    failed_ignitions: int = 0
+    cancelled_ignitions: int = 0
+    completed_cycles: int = 0
+    ignition_seconds: float = 0.0
+    flame_on_seconds: float = 0.0
+    day: str | None = None
+    flame_on_today_seconds: float = 0.0
+    flame_on_previous_day_seconds: float = 0.0
+    last_status: str | None = None
+    last_seen: float | None = None
+    ignition_started: float | None = None
+
+    def update(
+        self,
+        status: str,
+        now: float,
+        day: str,
+        max_gap: float = DEFAULT_MAX_GAP,
+        error_code: str = ERROR_NONE,
+    ) -> None:
+        """Account for one poll that reported ``status`` and ``error_code`` at ``now`` on ``day``."""
+        if self.day != day:
+            if self.day is not None:
+                self.flame_on_previous_day_seconds = self.flame_on_today_seconds
+            self.flame_on_today_seconds = 0.0
+            self.day = day
+
+        previous = self.last_status
+        if previous == STATUS_FLAME_ON and self.last_seen is not None:
+            elapsed = now - self.last_seen
+            if 0.0 < elapsed <= max_gap:
+                self.flame_on_seconds += elapsed
+                self.flame_on_today_seconds += elapsed
+
+        if status != previous:
+            self._transition(previous, status, now, error_code != ERROR_NONE)
+        self.last_status = status
+        self.last_seen = now
+
+    def _transition(self, previous: str | None, status: str, now: float, error: bool) -> None:
+        if status == STATUS_IGNITION:
+            self.ignitions += 1
+            self.ignition_started = now
+        elif previous == STATUS_IGNITION:
+            if status == STATUS_FLAME_ON:
+                self.successful_ignitions += 1
+                if self.ignition_started is not None:
+                    self.ignition_seconds += now - self.ignition_started
+            elif error or status == STATUS_COOLING:
+                self.failed_ignitions += 1
+            else:
+                self.cancelled_ignitions += 1
+            self.ignition_started = None
+        if previous == STATUS_FLAME_ON and status == STATUS_COOLING:
+            self.completed_cycles += 1
+
+    @property
+    def average_ignition_seconds(self) -> float | None:
+        """Return the mean time from ignition start to flame on."""
+        if not self.successful_ignitions:
+            return None
+        return self.ignition_seconds / self.successful_ignitions
+
+    @property
+    def failed_ignition_rate(self) -> float | None:
+        """Return the share of succeeded or failed ignitions that failed, in percent."""
+        finished = self.successful_ignitions + self.failed_ignitions
+        if not finished:
+            return None
+        return 100.0 * self.failed_ignitions / finished
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable snapshot for persistence."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any] | None) -> BurnerCycleStats:
+        """Rebuild counters from ``as_dict`` output, ignoring unknown keys."""
+        if not data:
+            return cls()
+        names = {field.name for field in fields(cls)}
+        return cls(**{key: value for key, value in data.items() if key in names})
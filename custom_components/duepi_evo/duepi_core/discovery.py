@@ -0,0 +1,143 @@
+"""Find Duepi EVO bridges on the local network.
+
+Every address of a subnet is tried on the known bridge ports with an asyncio
+connect; an open port only counts once it answers ``GET_STATUS`` with a
+status frame. Connects run concurrently under a semaphore with short
+timeouts, so unreachable addresses of a /24 cost a few rounds of
+``connect_timeout`` in total.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+from dataclasses import dataclass
+import ipaddress
+import socket
+import time
+
+from .const import FRAME_LENGTH, GET_STATUS
+from .protocol import decode_status, generate_command, is_valid_frame, read_state_flags
+from .transport import FRAME_STARTS, FRAME_TERMINATORS
+
+# esp-link listens on 23 (and 2000 on aceindy's build), the myDPRemote app
+# expects 2000, and several serial-to-TCP bridges default to 1234.
+DISCOVERY_PORTS = (23, 2000, 1234)
+
+DISCOVERY_CONCURRENCY = 256
+DISCOVERY_CONNECT_TIMEOUT = 0.3
+DISCOVERY_PROBE_TIMEOUT = 0.8
+
+# Largest subnet scanned in one go (a /22).
+MAX_DISCOVERY_ADDRESSES = 1024
+
+FALLBACK_NETWORK = "192.168.1.0/24"
+
+
+@dataclass(frozen=True, slots=True)
+class DiscoveredBridge:
+    """A bridge port that answered the status query."""
+
+    host: str
+    port: int
+    burner_status: str
+    latency_ms: float
+
+
+def discovery_hosts(network: str) -> list[str]:
+    """Return the addresses of ``network`` (CIDR or single address) to scan.
+
+    Raises ``ValueError`` for invalid or oversized networks.
+    """
+    subnet = ipaddress.ip_network(network.strip(), strict=False)
+    if subnet.num_addresses > MAX_DISCOVERY_ADDRESSES:
+        raise ValueError(f"{subnet} has more than {MAX_DISCOVERY_ADDRESSES} addresses")
+    return [str(address) for address in subnet.hosts()] or [str(subnet.network_address)]
+
+
+def guess_local_network() -> str:
+    """Return the /24 of the address used for outgoing traffic.
+
+    Connecting a UDP socket sends nothing; it only selects the route.
+    """
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            sock.connect(("10.255.255.255", 1))
+            address = sock.getsockname()[0]
+    except OSError:
+        return FALLBACK_NETWORK
+    return str(ipaddress.ip_network(f"{address}/24", strict=False))
+
+
+async def async_read_frame(reader: asyncio.StreamReader) -> bytes:
+    """Read one response frame, stopping at its terminator or full length."""
+    frame = b""
+    while len(frame) < FRAME_LENGTH and (not frame or frame[-1] not in FRAME_TERMINATORS):
+        chunk = await reader.read(FRAME_LENGTH - len(frame))
+        if not chunk:
+            break
+        frame += chunk
+    return frame
+
+
+async def async_probe_bridge(
+    host: str,
+    port: int,
+    *,
+    connect_timeout: float = DISCOVERY_CONNECT_TIMEOUT,
+    probe_timeout: float = DISCOVERY_PROBE_TIMEOUT,
+) -> DiscoveredBridge | None:
+    """Return the bridge at ``host:port`` if it answers like a Duepi controller."""
+    started = time.perf_counter()
+    try:
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(host, port), connect_timeout
+        )
+    except (OSError, asyncio.TimeoutError):
+        return None
+    try:
+        writer.write(generate_command(GET_STATUS).encode())
+        frame = await asyncio.wait_for(async_read_frame(reader), probe_timeout)
+    except (OSError, asyncio.TimeoutError):
+        return None
+    finally:
+        writer.close()
+    if not frame or frame[0] not in FRAME_STARTS:
+        return None
+    response = frame.decode(errors="ignore")
+    if not is_valid_frame(response):
+        return None
+    try:
+        burner_status = decode_status(read_state_flags(response))
+    except ValueError:
+        return None
+    return DiscoveredBridge(
+        host=host,
+        port=port,
+        burner_status=burner_status,
+        latency_ms=(time.perf_counter() - started) * 1000,
+    )
+
+
+async def async_discover(
+    network: str,
+    ports: Iterable[int] = DISCOVERY_PORTS,
+    *,
+    concurrency: int = DISCOVERY_CONCURRENCY,
+    connect_timeout: float = DISCOVERY_CONNECT_TIMEOUT,
+    probe_timeout: float = DISCOVERY_PROBE_TIMEOUT,
+) -> list[DiscoveredBridge]:
+    """Scan every address of ``network`` on ``ports``; return bridges by address."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def probe(host: str, port: int) -> DiscoveredBridge | None:
+        async with semaphore:
+            return await async_probe_bridge(
+                host, port, connect_timeout=connect_timeout, probe_timeout=probe_timeout
+            )
+
+    ports = tuple(ports)
+    results = await asyncio.gather(
+        *(probe(host, port) for host in discovery_hosts(network) for port in ports)
+    )
+    return [bridge for bridge in results if bridge is not None]
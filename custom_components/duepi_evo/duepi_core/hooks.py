@@ -0,0 +1,160 @@
+"""Instrumentation hooks around polls, frames and commands.
+
+Tooling such as profilers, span exporters or custom metrics registers a
+callback for one event name; emitters check ``DuepiEvoHooks.enabled`` first,
+so an empty registry costs one attribute test per event site.
+
+Events and their fields:
+
+``poll_start``
+    ``host``, ``port``
+``poll_end``
+    ``host``, ``port``, ``duration_ms``, ``ok``, ``error``
+``connect``
+    ``host``, ``port``, ``duration_ms``, ``ok``, ``error``
+``frame_send``
+    ``command``, ``frame`` (raw bytes)
+``frame_recv``
+    ``command``, ``frame`` (decoded response, ``None`` on failure),
+    ``duration_ms`` (since the send), ``ok``
+``command_ack``
+    ``command``, ``ok``
+``retry``
+    ``reason`` and emitter-specific details
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import json
+import logging
+import os
+import threading
+import time
+from typing import IO, Any
+
+_LOGGER = logging.getLogger(__name__)
+
+# Size after which the span file is rolled over to a single ``.1`` backup.
+DEFAULT_SPAN_FILE_MAX_BYTES = 10 * 1024 * 1024
+
+HOOK_EVENTS = frozenset(
+    {
+        "poll_start",
+        "poll_end",
+        "connect",
+        "frame_send",
+        "frame_recv",
+        "command_ack",
+        "retry",
+    }
+)
+
+HookCallback = Callable[[str, dict[str, Any]], None]
+
+
+class DuepiEvoHooks:
+    """Registry of instrumentation callbacks, keyed by event name."""
+
+    __slots__ = ("enabled", "_callbacks")
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self._callbacks: dict[str, list[HookCallback]] = {}
+
+    def add(self, event: str, callback: HookCallback) -> Callable[[], None]:
+        """Register ``callback(event, fields)`` and return a remover."""
+        if event not in HOOK_EVENTS:
+            raise ValueError(f"Unknown hook event: {event}")
+        self._callbacks.setdefault(event, []).append(callback)
+        self.enabled = True
+
+        def remove() -> None:
+            callbacks = self._callbacks.get(event, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+            if not callbacks:
+                self._callbacks.pop(event, None)
+            self.enabled = bool(self._callbacks)
+
+        return remove
+
+    def emit(self, event: str, **fields: Any) -> None:
+        """Run the callbacks of one event; a failing hook never breaks polling."""
+        for callback in self._callbacks.get(event, ()):
+            try:
+                callback(event, fields)
+            except Exception:  # noqa: BLE001
+                _LOGGER.exception("Duepi EVO %s hook failed", event)
+
+
+class NdjsonSpanExporter:
+    """Write polls, connects and command round trips as JSON lines.
+
+    Every line is one span with ``name``, ``start`` (UNIX time),
+    ``duration_ms``, ``poll`` (sequence number of the enclosing poll) and the
+    event fields. Lines are buffered and flushed at the end of each poll.
+    Once the file reaches ``max_bytes`` it is renamed to ``<path>.1``
+    (replacing the previous backup) at the end of a poll and a new file is
+    started, so at most about twice ``max_bytes`` is kept on disk.
+    """
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_SPAN_FILE_MAX_BYTES) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self._file: IO[str] | None = None
+        self._lock = threading.Lock()
+        self._poll = 0
+
+    def attach(self, hooks: DuepiEvoHooks) -> Callable[[], None]:
+        """Register on ``hooks`` and return a callback that detaches again."""
+        removers = [
+            hooks.add("poll_start", self._on_poll_start),
+            hooks.add("poll_end", self._on_span),
+            hooks.add("connect", self._on_span),
+            hooks.add("frame_recv", self._on_span),
+            hooks.add("command_ack", self._on_span),
+            hooks.add("retry", self._on_span),
+        ]
+
+        def detach() -> None:
+            for remove in removers:
+                remove()
+
+        return detach
+
+    def _on_poll_start(self, _event: str, _fields: dict[str, Any]) -> None:
+        self._poll += 1
+
+    def _on_span(self, event: str, fields: dict[str, Any]) -> None:
+        duration_ms = fields.get("duration_ms") or 0.0
+        span = {
+            "name": "poll" if event == "poll_end" else event,
+            "start": round(time.time() - duration_ms / 1000, 6),
+            "duration_ms": round(duration_ms, 3),
+            "poll": self._poll,
+        }
+        for key, value in fields.items():
+            if key == "duration_ms":
+                continue
+            span[key] = value.decode("latin-1") if isinstance(value, bytes) else value
+        self._write(json.dumps(span, default=str), flush=event == "poll_end")
+
+    def _write(self, line: str, flush: bool) -> None:
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8")  # noqa: SIM115
+            self._file.write(line + "\n")
+            if flush:
+                self._file.flush()
+                if self._file.tell() >= self.max_bytes:
+                    self._file.close()
+                    self._file = None
+                    os.replace(self.path, f"{self.path}.1")
+
+    def close(self) -> None:
+        """Flush and close the output file."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
@@ -0,0 +1,118 @@
+"""Low-overhead latency histograms and error counters of the client."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Any
+
+# Upper bucket bounds in milliseconds; one overflow bucket follows the last.
+LATENCY_BUCKETS_MS: tuple[float, ...] = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram of latencies in milliseconds.
+
+    ``observe`` is one bisect and two additions; percentiles are estimated by
+    linear interpolation inside the bucket that holds the requested rank.
+    """
+
+    __slots__ = ("bounds", "counts", "count", "total", "maximum")
+
+    def __init__(self, bounds: tuple[float, ...] = LATENCY_BUCKETS_MS) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def observe(self, latency_ms: float) -> None:
+        """Record one latency."""
+        self.counts[bisect_left(self.bounds, latency_ms)] += 1
+        self.count += 1
+        self.total += latency_ms
+        if latency_ms > self.maximum:
+            self.maximum = latency_ms
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean latency."""
+        if not self.count:
+            return None
+        return self.total / self.count
+
+    def percentile(self, percent: float) -> float | None:
+        """Return the estimated latency below which ``percent`` of samples fall."""
+        if not self.count:
+            return None
+        rank = percent / 100 * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            if not bucket_count or cumulative + bucket_count < rank:
+                cumulative += bucket_count
+                continue
+            lower = self.bounds[index - 1] if index else 0.0
+            upper = self.bounds[index] if index < len(self.bounds) else self.maximum
+            upper = min(upper, self.maximum)
+            return lower + (upper - lower) * (rank - cumulative) / bucket_count
+        return self.maximum
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return bucket counts and summary values."""
+        return {
+            "bounds_ms": list(self.bounds),
+            "counts": list(self.counts),
+            "count": self.count,
+            "mean_ms": self.mean,
+            "max_ms": self.maximum,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+        }
+
+
+class DuepiEvoClientMetrics:
+    """Latency histograms and error counters collected by one client.
+
+    Per-command histograms are keyed by the two-character register prefix of
+    the command (``D9`` for status, ``F2`` for the setpoint, ...), so set
+    commands with different values share one histogram.
+    """
+
+    __slots__ = (
+        "connect",
+        "snapshot",
+        "commands",
+        "timeouts",
+        "protocol_errors",
+        "connection_errors",
+        "stale_connections",
+    )
+
+    def __init__(self) -> None:
+        self.connect = LatencyHistogram()
+        self.snapshot = LatencyHistogram()
+        self.commands: dict[str, LatencyHistogram] = {}
+        self.timeouts = 0
+        self.protocol_errors = 0
+        self.connection_errors = 0
+        self.stale_connections = 0
+
+    def command(self, command: str) -> LatencyHistogram:
+        """Return the histogram of one command register."""
+        key = command[:2]
+        histogram = self.commands.get(key)
+        if histogram is None:
+            histogram = self.commands[key] = LatencyHistogram()
+        return histogram
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return all histograms and counters."""
+        return {
+            "connect": self.connect.as_dict(),
+            "snapshot": self.snapshot.as_dict(),
+            "commands": {key: histogram.as_dict() for key, histogram in sorted(self.commands.items())},
+            "timeouts": self.timeouts,
+            "protocol_errors": self.protocol_errors,
+            "connection_errors": self.connection_errors,
+            "stale_connections": self.stale_connections,
+        }
@@ -0,0 +1,59 @@
+"""Connection probe results and stove capability profiles."""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, fields
+from typing import Any
+
+from .const import GET_BURN_TIME, GET_PCBTEMP, GET_PRESSURE_SWITCH, GET_TOTAL_BURN_TIME
+
+# Optional registers that not every controller answers, keyed by capability name.
+OPTIONAL_REGISTERS: dict[str, str] = {
+    "pcb_temp": GET_PCBTEMP,
+    "total_burn_time": GET_TOTAL_BURN_TIME,
+    "burn_time_since_reset": GET_BURN_TIME,
+    "pressure_switch": GET_PRESSURE_SWITCH,
+}
+
+# Consecutive timeouts after which an optional register counts as unsupported;
+# fewer are taken for a dropped frame and the register is asked again.
+UNSUPPORTED_AFTER_TIMEOUTS = 3
+
+
+@dataclass(frozen=True, slots=True)
+class DuepiEvoCapabilities:
+    """Optional registers a stove controller is known to answer."""
+
+    pcb_temp: bool = True
+    total_burn_time: bool = True
+    burn_time_since_reset: bool = True
+    pressure_switch: bool = True
+
+    def as_dict(self) -> dict[str, bool]:
+        """Return a JSON-serializable representation for config entries."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any] | None) -> DuepiEvoCapabilities | None:
+        """Rebuild a profile stored in a config entry, ignoring unknown keys."""
+        if not data:
+            return None
+        known = {field.name for field in fields(cls)}
+        return cls(**{key: bool(value) for key, value in data.items() if key in known})
+
+
+@dataclass(frozen=True, slots=True)
+class DuepiEvoProbeResult:
+    """Outcome of a lightweight connection probe."""
+
+    burner_status: str
+    connect_latency_ms: float
+    status_latency_ms: float
+    capabilities: DuepiEvoCapabilities
+
+    def latency_as_dict(self) -> dict[str, float]:
+        """Return the probe latencies (ms) for storage next to the capabilities."""
+        return {
+            "connect_ms": round(self.connect_latency_ms, 1),
+            "status_ms": round(self.status_latency_ms, 1),
+        }
@@ -0,0 +1,80 @@
+"""Framing and codec helpers for the Duepi EVO wire protocol."""
+
+from __future__ import annotations
+
+from .const import (
+    HVAC_MODE_HEAT,
+    HVAC_MODE_OFF,
+    MIN_FRAME_LENGTH,
+    PRESSURE_SWITCH_OK,
+    PRESSURE_SWITCH_PRESSURE,
+    STATE_ACK,
+    STATE_CLEAN,
+    STATE_COOL,
+    STATE_ECO,
+    STATE_OFF,
+    STATE_ON,
+    STATE_START,
+)
+
+
+def generate_command(command: str) -> str:
+    """Format command with protocol prefix and checksum."""
+    formatted_cmd = "R" + command
+    checksum = sum(ord(char) for char in formatted_cmd) & 0xFF
+    return "\x1b" + formatted_cmd + f"{checksum:02X}" + "&"
+
+
+def is_valid_frame(response: str) -> bool:
+    """Return whether a response frame is long enough to carry a payload."""
+    return len(response) >= MIN_FRAME_LENGTH
+
+
+def read_hex_value(response: str, digits: int) -> int:
+    """Parse a hex field from the start of a response payload."""
+    return int(response[1 : 1 + digits], 16)
+
+
+def read_state_flags(response: str) -> int:
+    """Parse the 8-digit status/ACK flag word of a response frame."""
+    return int(response[1:9], 16)
+
+
+def is_ack(response: str) -> bool:
+    """Return whether a response frame carries the ACK flag."""
+    return bool(STATE_ACK & read_state_flags(response))
+
+
+def decode_status(current_state: int) -> str:
+    """Decode burner status flags."""
+    if STATE_START & current_state:
+        return "Ignition starting"
+    if STATE_ON & current_state:
+        return "Flame On"
+    if STATE_CLEAN & current_state:
+        return "Cleaning"
+    if STATE_ECO & current_state:
+        return "Eco idle"
+    if STATE_COOL & current_state:
+        return "Cooling down"
+    if STATE_OFF & current_state:
+        return "Off"
+    return "Unknown state"
+
+
+def hvac_from_status(status: str) -> tuple[str, bool]:
+    """Return HVAC mode name and heating flag from burner status."""
+    if status == "Off":
+        return HVAC_MODE_OFF, False
+    if status == "Cooling down":
+        return HVAC_MODE_HEAT, False
+    return HVAC_MODE_HEAT, True
+
+
+def decode_pressure_switch_value(pressure_state: int) -> bool | None:
+    """Decode the raw pressure switch word returned by RC0000."""
+    if pressure_state == PRESSURE_SWITCH_OK:
+        return False
+    if pressure_state == PRESSURE_SWITCH_PRESSURE:
+        return True
+    return None
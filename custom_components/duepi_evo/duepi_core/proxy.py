@@ -0,0 +1,257 @@
+"""Share one bridge connection between several clients.
+
+The ESP01 behind most bridges handles a single connection badly and each
+extra poller adds a full round of register reads. ``DuepiEvoProxy`` listens
+for any number of clients (Home Assistant, the myDPRemote app, scripts),
+queues their request frames onto one upstream connection and answers the
+read-only ``GET_*`` registers from a short-lived cache. Writes always go to
+the stove and drop the cached registers they affect. With a
+``CaptureWriter`` every exchange is also recorded to a binary capture::
+
+    proxy = DuepiEvoProxy("192.168.1.20", 23)
+    server = await proxy.async_start("0.0.0.0", 24)
+    await server.serve_forever()
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+import itertools
+import logging
+import time
+from typing import Any
+
+from .const import (
+    GET_BURN_TIME,
+    GET_ERRORSTATE,
+    GET_EXHFANSPEED,
+    GET_FLUGASTEMP,
+    GET_PCBTEMP,
+    GET_PELLETSPEED,
+    GET_POWERLEVEL,
+    GET_PRESSURE_SWITCH,
+    GET_SETPOINT,
+    GET_STATUS,
+    GET_TEMPERATURE,
+    GET_TOTAL_BURN_TIME,
+    REMOTE_RESET,
+)
+from .capture import CaptureWriter
+from .discovery import async_read_frame
+from .transport import FRAME_STARTS
+
+_LOGGER = logging.getLogger(__name__)
+
+PROXY_CACHE_TTL = 2.0
+PROXY_UPSTREAM_TIMEOUT = 2.0
+
+# Registers that only read the stove. ``GET_INITCOMMAND`` is left out: some
+# boards treat it as a wake-up and it is cheap to pass through.
+CACHEABLE_COMMANDS = frozenset(
+    {
+        GET_SETPOINT,
+        GET_PRESSURE_SWITCH,
+        GET_FLUGASTEMP,
+        GET_TEMPERATURE,
+        GET_POWERLEVEL,
+        GET_PELLETSPEED,
+        GET_STATUS,
+        GET_ERRORSTATE,
+        GET_PCBTEMP,
+        GET_TOTAL_BURN_TIME,
+        GET_BURN_TIME,
+        GET_EXHFANSPEED,
+    }
+)
+
+# Cached registers a write changes, by command prefix. Writes not listed
+# here clear the whole cache.
+CACHE_INVALIDATIONS: dict[str, frozenset[str]] = {
+    "F0": frozenset(
+        {GET_STATUS, GET_POWERLEVEL, GET_PELLETSPEED, GET_EXHFANSPEED, GET_FLUGASTEMP}
+    ),
+    "F2": frozenset({GET_SETPOINT}),
+    REMOTE_RESET: frozenset({GET_STATUS, GET_ERRORSTATE}),
+}
+
+# (request frame, response frame, answered from cache)
+ExchangeCallback = Callable[[bytes, bytes, bool], None]
+
+
+def frame_command(frame: bytes) -> str:
+    """Return the 5-character command of an ``ESC R <cmd> <checksum> &`` frame."""
+    return frame[2:7].decode("latin-1")
+
+
+@dataclass(slots=True)
+class ProxyStats:
+    """Counters of a running proxy."""
+
+    clients: int = 0
+    connected_clients: int = 0
+    requests: int = 0
+    cache_hits: int = 0
+    upstream_requests: int = 0
+    upstream_connects: int = 0
+    upstream_errors: int = 0
+    invalidations: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters as plain data."""
+        return asdict(self)
+
+
+class DuepiEvoProxy:
+    """Caching, serializing proxy in front of one bridge."""
+
+    def __init__(
+        self,
+        upstream_host: str,
+        upstream_port: int,
+        *,
+        cache_ttl: float = PROXY_CACHE_TTL,
+        timeout: float = PROXY_UPSTREAM_TIMEOUT,
+        on_exchange: ExchangeCallback | None = None,
+        capture: CaptureWriter | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.upstream_host = upstream_host
+        self.upstream_port = upstream_port
+        self.cache_ttl = cache_ttl
+        self.timeout = timeout
+        self.on_exchange = on_exchange
+        self.capture = capture
+        self.stats = ProxyStats()
+        self._clock = clock
+        self._cache: dict[str, tuple[float, bytes]] = {}
+        self._lock = asyncio.Lock()
+        self._upstream: tuple[asyncio.StreamReader, asyncio.StreamWriter] | None = None
+        self._client_ids = itertools.count(1)
+
+    async def async_start(self, host: str, port: int) -> asyncio.AbstractServer:
+        """Listen for clients on ``host:port``."""
+        return await asyncio.start_server(self.async_handle_client, host, port)
+
+    async def async_close(self) -> None:
+        """Close the upstream connection."""
+        async with self._lock:
+            self._close_upstream()
+            if self.capture is not None:
+                self.capture.flush()
+
+    async def async_handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Answer the request frames of one client until it disconnects."""
+        client_id = next(self._client_ids)
+        self.stats.clients += 1
+        self.stats.connected_clients += 1
+        _LOGGER.debug("Client %s connected from %s", client_id, writer.get_extra_info("peername"))
+        try:
+            while True:
+                try:
+                    frame = await reader.readuntil(b"&")
+                except asyncio.IncompleteReadError:
+                    break
+                response = await self.async_request(frame, client_id)
+                if response:
+                    writer.write(response)
+                    await writer.drain()
+        except (ConnectionError, asyncio.LimitOverrunError) as err:
+            _LOGGER.debug("Client %s dropped: %s", client_id, err)
+        finally:
+            self.stats.connected_clients -= 1
+            writer.close()
+
+    async def async_request(self, frame: bytes, client_id: int = 0) -> bytes:
+        """Return the stove's response to ``frame``; ``b""`` if it stayed silent."""
+        self.stats.requests += 1
+        sent_at = self.capture.clock() if self.capture is not None else 0.0
+        # Drop anything a client sent before the frame start (line noise).
+        frame = frame[max(frame.find(b"\x1b"), 0) :]
+        response, cached = await self._async_answer(frame)
+        if self.capture is not None:
+            self.capture.write_exchange(client_id, frame, response, cached=cached, sent_at=sent_at)
+        if response and self.on_exchange is not None:
+            self.on_exchange(frame, response, cached)
+        return response
+
+    async def _async_answer(self, frame: bytes) -> tuple[bytes, bool]:
+        """Return the response and whether it came from the cache.
+
+        Concurrent reads of a register wait for the first one and share its
+        answer instead of each going upstream.
+        """
+        command = frame_command(frame)
+        cacheable = command in CACHEABLE_COMMANDS
+        if cacheable and (response := self._cached(command)) is not None:
+            return response, True
+        async with self._lock:
+            if cacheable and (response := self._cached(command)) is not None:
+                return response, True
+            if not cacheable:
+                self._invalidate(command)
+            response = await self._async_forward(frame)
+            if cacheable and response and response[0] in FRAME_STARTS:
+                self._cache[command] = (self._clock(), response)
+        return response, False
+
+    def _cached(self, command: str) -> bytes | None:
+        entry = self._cache.get(command)
+        if entry is None:
+            return None
+        stored, response = entry
+        if self._clock() - stored > self.cache_ttl:
+            del self._cache[command]
+            return None
+        self.stats.cache_hits += 1
+        return response
+
+    def _invalidate(self, command: str) -> None:
+        for prefix, registers in CACHE_INVALIDATIONS.items():
+            if command.startswith(prefix):
+                stale = [register for register in registers if register in self._cache]
+                break
+        else:
+            stale = list(self._cache)
+        for register in stale:
+            del self._cache[register]
+        self.stats.invalidations += len(stale)
+
+    async def _async_forward(self, frame: bytes) -> bytes:
+        """Send ``frame`` upstream and read the answer; caller holds the lock."""
+        self.stats.upstream_requests += 1
+        try:
+            if self._upstream is None:
+                self._upstream = await asyncio.wait_for(
+                    asyncio.open_connection(self.upstream_host, self.upstream_port),
+                    self.timeout,
+                )
+                self.stats.upstream_connects += 1
+            reader, writer = self._upstream
+            writer.write(frame)
+            await writer.drain()
+            response = await asyncio.wait_for(async_read_frame(reader), self.timeout)
+            if not response:
+                raise ConnectionResetError("upstream closed the connection")
+            return response
+        except (OSError, asyncio.TimeoutError) as err:
+            # A late answer would be read as the reply to the next request,
+            # so a connection that missed one is not reused.
+            _LOGGER.debug(
+                "Upstream %s:%s failed on %r: %s",
+                self.upstream_host,
+                self.upstream_port,
+                frame,
+                err or type(err).__name__,
+            )
+            self.stats.upstream_errors += 1
+            self._close_upstream()
+            return b""
+
+    def _close_upstream(self) -> None:
+        if self._upstream is not None:
+            self._upstream[1].close()
+            self._upstream = None
@@ -0,0 +1,374 @@
+"""Chunked columnar recordings of stove registers.
+
+A recording holds one row per poll in fixed-width typed columns. The file
+starts with a header (``<4sHH``: magic, version, column count) and one
+16-byte descriptor per column (15-byte name, 1-byte ``array`` typecode),
+followed by chunks::
+
+    <4sI   b"CHNK", row count
+    column 0: rows x itemsize bytes
+    column 1: ...
+
+Values are little-endian. ``RecordingWriter`` buffers rows in ``array``
+columns and writes a whole chunk with one write per column. Because every
+column of a chunk is contiguous, ``RecordingReader`` can hand out a
+memory-mapped view of one column without touching the others; only the
+chunk headers are read to locate them. A chunk cut short by a crash is
+ignored, and trimmed when the recording is reopened for appending.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+import logging
+import math
+import mmap
+from pathlib import Path
+import struct
+import sys
+import time
+
+from .client import DuepiEvoClient, DuepiEvoClientError, DuepiEvoTimeoutError
+from .const import (
+    GET_ERRORSTATE,
+    GET_EXHFANSPEED,
+    GET_FLUGASTEMP,
+    GET_PCBTEMP,
+    GET_PELLETSPEED,
+    GET_POWERLEVEL,
+    GET_SETPOINT,
+    GET_STATUS,
+    GET_TEMPERATURE,
+)
+from .probe import UNSUPPORTED_AFTER_TIMEOUTS
+from .protocol import read_hex_value, read_state_flags
+
+_LOGGER = logging.getLogger(__name__)
+
+RECORDING_MAGIC = b"DPRC"
+RECORDING_VERSION = 1
+RECORDING_SUFFIX = ".dprec"
+CHUNK_MAGIC = b"CHNK"
+
+# One chunk per ten minutes at 1 Hz.
+DEFAULT_CHUNK_ROWS = 600
+# Samples between two checks whether a skipped optional register answers again.
+RECHECK_SKIPPED_SAMPLES = 600
+
+_HEADER = struct.Struct("<4sHH")
+_COLUMN = struct.Struct("<15sc")
+_CHUNK = struct.Struct("<4sI")
+_SWAP = sys.byteorder == "big"
+
+
+class RecordingFormatError(Exception):
+    """The file is not a recording or its columns do not match."""
+
+
+@dataclass(frozen=True, slots=True)
+class RecordedRegister:
+    """A register column: where its value comes from and how it is stored."""
+
+    name: str
+    typecode: str
+    command: str
+    parse: Callable[[str], float]
+    optional: bool = False
+
+
+# Columns filled by the recorder besides the registers.
+TIMESTAMP_COLUMN = ("timestamp", "d")  # epoch seconds
+POLL_MS_COLUMN = ("poll_ms", "f")  # duration of the pipelined read
+
+RECORDED_REGISTERS = (
+    RecordedRegister("status", "I", GET_STATUS, read_state_flags),  # raw state flags
+    RecordedRegister("power_level", "b", GET_POWERLEVEL, lambda r: read_hex_value(r, 4)),
+    RecordedRegister("room_temp", "f", GET_TEMPERATURE, lambda r: read_hex_value(r, 4) / 10.0),
+    RecordedRegister("setpoint", "f", GET_SETPOINT, lambda r: read_hex_value(r, 4)),
+    RecordedRegister("flu_gas_temp", "f", GET_FLUGASTEMP, lambda r: read_hex_value(r, 4)),
+    RecordedRegister("exh_fan_speed", "f", GET_EXHFANSPEED, lambda r: read_hex_value(r, 4) * 10),
+    RecordedRegister("pellet_speed", "f", GET_PELLETSPEED, lambda r: read_hex_value(r, 4)),
+    RecordedRegister("error_code", "h", GET_ERRORSTATE, lambda r: read_hex_value(r, 4)),
+    # NaN when the controller does not answer it (optional columns are floats).
+    RecordedRegister("pcb_temp", "f", GET_PCBTEMP, lambda r: read_hex_value(r, 4), optional=True),
+)
+
+RECORDING_COLUMNS: tuple[tuple[str, str], ...] = (
+    TIMESTAMP_COLUMN,
+    *((register.name, register.typecode) for register in RECORDED_REGISTERS),
+    POLL_MS_COLUMN,
+)
+
+
+def _read_columns(data: bytes | mmap.mmap) -> tuple[list[tuple[str, str]], int]:
+    """Return the column layout and the offset of the first chunk."""
+    if len(data) < _HEADER.size:
+        raise RecordingFormatError("File too short for a recording header")
+    magic, version, count = _HEADER.unpack_from(data)
+    if magic != RECORDING_MAGIC:
+        raise RecordingFormatError("Not a Duepi EVO recording")
+    if version > RECORDING_VERSION:
+        raise RecordingFormatError(f"Recording version {version} is not supported")
+    columns = []
+    for index in range(count):
+        name, typecode = _COLUMN.unpack_from(data, _HEADER.size + index * _COLUMN.size)
+        columns.append((name.rstrip(b"\0").decode(), typecode.decode()))
+    return columns, _HEADER.size + count * _COLUMN.size
+
+
+def _row_size(columns: Sequence[tuple[str, str]]) -> int:
+    return sum(array(typecode).itemsize for _, typecode in columns)
+
+
+def _scan_chunks(
+    data: bytes | mmap.mmap, offset: int, row_size: int
+) -> tuple[list[tuple[int, int]], int]:
+    """Return ``(data offset, rows)`` of every complete chunk and where they end."""
+    chunks = []
+    end = len(data)
+    while offset + _CHUNK.size <= end:
+        magic, rows = _CHUNK.unpack_from(data, offset)
+        start = offset + _CHUNK.size
+        if magic != CHUNK_MAGIC or start + rows * row_size > end:
+            break
+        chunks.append((start, rows))
+        offset = start + rows * row_size
+    return chunks, offset
+
+
+class RecordingWriter:
+    """Buffer rows and append them to a recording one chunk at a time."""
+
+    def __init__(
+        self,
+        path: str | Path,
+        columns: Sequence[tuple[str, str]] = RECORDING_COLUMNS,
+        *,
+        chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    ) -> None:
+        self.path = Path(path)
+        self.columns = list(columns)
+        self.chunk_rows = chunk_rows
+        self.rows_written = 0
+        self._buffers = [array(typecode) for _, typecode in self.columns]
+        self._prepare()
+        self._file = open(self.path, "ab")
+
+    def _prepare(self) -> None:
+        """Write the header of a new file, or check and trim an existing one."""
+        if not self.path.exists() or self.path.stat().st_size == 0:
+            with open(self.path, "wb") as file:
+                file.write(_HEADER.pack(RECORDING_MAGIC, RECORDING_VERSION, len(self.columns)))
+                for name, typecode in self.columns:
+                    file.write(_COLUMN.pack(name.encode(), typecode.encode()))
+            return
+        with open(self.path, "r+b") as file:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                columns, offset = _read_columns(data)
+                if columns != self.columns:
+                    raise RecordingFormatError(f"{self.path} has columns {columns}")
+                _chunks, end = _scan_chunks(data, offset, _row_size(columns))
+                size = len(data)
+            finally:
+                data.close()
+            if end < size:
+                file.truncate(end)
+
+    def append(self, row: Sequence[float]) -> None:
+        """Buffer one row (values in column order); a full chunk is written."""
+        for buffer, value in zip(self._buffers, row, strict=True):
+            buffer.append(value)
+        if len(self._buffers[0]) >= self.chunk_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered rows as one chunk."""
+        rows = len(self._buffers[0])
+        if not rows:
+            return
+        self._file.write(_CHUNK.pack(CHUNK_MAGIC, rows))
+        for buffer in self._buffers:
+            if _SWAP:
+                buffer.byteswap()
+            buffer.tofile(self._file)
+            del buffer[:]
+        self._file.flush()
+        self.rows_written += rows
+
+    def close(self) -> None:
+        """Write the last partial chunk and close the file."""
+        self.flush()
+        self._file.close()
+
+    def __enter__(self) -> RecordingWriter:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+
+class RecordingReader:
+    """Memory-mapped recording with per-column access.
+
+    Views returned by ``column_views`` point into the mapping; release them
+    before ``close``.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            columns, offset = _read_columns(self._map)
+        except (ValueError, RecordingFormatError):
+            self._file.close()
+            raise
+        self.columns = dict(columns)
+        self._itemsizes = {name: array(typecode).itemsize for name, typecode in columns}
+        row_size = _row_size(columns)
+        self.chunks, _end = _scan_chunks(self._map, offset, row_size)
+        # Byte offset of each column inside a chunk, per row.
+        self._column_offsets: dict[str, int] = {}
+        position = 0
+        for name, _typecode in columns:
+            self._column_offsets[name] = position
+            position += self._itemsizes[name]
+
+    def __len__(self) -> int:
+        return sum(rows for _, rows in self.chunks)
+
+    def close(self) -> None:
+        """Unmap and close the recording."""
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> RecordingReader:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+    def column_spans(self, name: str) -> list[tuple[int, int]]:
+        """Return ``(byte offset, rows)`` of ``name`` in every chunk."""
+        if name not in self.columns:
+            raise KeyError(name)
+        shift = self._column_offsets[name]
+        return [(start + shift * rows, rows) for start, rows in self.chunks]
+
+    def column_views(self, name: str) -> list[memoryview]:
+        """Return zero-copy typed views of ``name``, one per chunk (little-endian hosts)."""
+        itemsize = self._itemsizes[name]
+        view = memoryview(self._map)
+        return [
+            view[offset : offset + rows * itemsize].cast(self.columns[name])
+            for offset, rows in self.column_spans(name)
+        ]
+
+    def column(self, name: str) -> array:
+        """Return ``name`` over the whole recording as one array."""
+        values = array(self.columns[name])
+        itemsize = self._itemsizes[name]
+        for offset, rows in self.column_spans(name):
+            values.frombytes(self._map[offset : offset + rows * itemsize])
+        if _SWAP:
+            values.byteswap()
+        return values
+
+
+class Recorder:
+    """Poll the recorded registers at a fixed rate and append them as rows."""
+
+    def __init__(
+        self,
+        client: DuepiEvoClient,
+        writer: RecordingWriter,
+        *,
+        interval: float = 1.0,
+        registers: Sequence[RecordedRegister] = RECORDED_REGISTERS,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+        recheck_skipped: int = RECHECK_SKIPPED_SAMPLES,
+    ) -> None:
+        self.client = client
+        self.writer = writer
+        self.interval = interval
+        self.registers = list(registers)
+        self.clock = clock
+        self.sleep = sleep
+        self.recheck_skipped = recheck_skipped
+        self.samples = 0
+        self.failures = 0
+        # Optional registers the controller did not answer, read as NaN.
+        self.skipped: set[str] = set()
+
+    def _answers(self, register: RecordedRegister, attempts: int) -> bool:
+        """Return whether ``register`` answers within ``attempts`` timeouts in a row."""
+        for _ in range(attempts):
+            try:
+                register.parse(self.client.send_command(register.command))
+            except DuepiEvoTimeoutError:
+                continue
+            except (DuepiEvoClientError, ValueError):
+                return False
+            return True
+        return False
+
+    def detect_optional(self) -> None:
+        """Drop optional registers that the controller does not answer.
+
+        A missing register would make every pipelined batch time out. Only
+        ``UNSUPPORTED_AFTER_TIMEOUTS`` timeouts in a row drop one, so a single
+        lost frame does not leave a column empty for the whole recording.
+        """
+        for register in self.registers:
+            if register.optional and not self._answers(register, UNSUPPORTED_AFTER_TIMEOUTS):
+                self.skipped.add(register.name)
+
+    def recheck_optional(self) -> None:
+        """Give skipped registers one more try and record them again if they answer."""
+        for register in self.registers:
+            if register.name in self.skipped and self._answers(register, 1):
+                _LOGGER.debug("Optional %s answers again, recording it", register.name)
+                self.skipped.discard(register.name)
+
+    def sample(self) -> bool:
+        """Read every register once and append a row; return whether it worked."""
+        active = [register for register in self.registers if register.name not in self.skipped]
+        timestamp = self.clock()
+        started = time.perf_counter()
+        try:
+            responses = self.client.read_registers([register.command for register in active])
+            values = {
+                register.name: register.parse(response)
+                for register, response in zip(active, responses)
+            }
+        except (DuepiEvoClientError, ValueError) as err:
+            _LOGGER.debug("Sample from %s failed: %s", self.client.host, err)
+            self.failures += 1
+            return False
+        poll_ms = (time.perf_counter() - started) * 1000
+        row = [timestamp]
+        row.extend(values.get(register.name, math.nan) for register in self.registers)
+        row.append(poll_ms)
+        self.writer.append(row)
+        self.samples += 1
+        return True
+
+    def run(self, samples: int | None = None) -> None:
+        """Sample every ``interval`` seconds on a fixed schedule."""
+        self.detect_optional()
+        started = time.monotonic()
+        count = 0
+        while samples is None or count < samples:
+            if count and self.skipped and self.recheck_skipped and not count % self.recheck_skipped:
+                self.recheck_optional()
+            self.sample()
+            count += 1
+            if samples is not None and count >= samples:
+                break
+            delay = started + count * self.interval - time.monotonic()
+            if delay > 0:
+                self.sleep(delay)
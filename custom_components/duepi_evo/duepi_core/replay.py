@@ -0,0 +1,261 @@
+"""Replay recorded wire traces through ``DuepiEvoClient``.
+
+A trace is a list of ``(time, direction, frame)`` tuples as produced by
+``WireTrace.entries()``. It can be loaded from a Home Assistant diagnostics
+download (``wire_trace``), from the ``tx: b'...',rx: b'...'`` lines printed
+by ``evo-python/Proxy.py`` or from a binary proxy capture. ``ReplayTransport`` is then passed as the
+client's ``transport``::
+
+    transport = ReplayTransport(load_trace("diagnostics.json"), realtime=True)
+    client = DuepiEvoClient(..., transport=transport)
+    for duration_ms, result in replay_polls(client, transport):
+        ...
+"""
+
+from __future__ import annotations
+
+import ast
+from collections.abc import Iterator
+import json
+from pathlib import Path
+import time
+from typing import Any
+
+from .capture import is_capture, trace_from_capture
+from .client import DuepiEvoClient, DuepiEvoClientError
+from .const import REMOTE_RESET
+from .state import DuepiEvoState
+from .trace import DIRECTION_RX, DIRECTION_TX
+from .transport import DuepiEvoTransport
+
+TraceEntry = tuple[float, int, bytes]
+
+_DIRECTIONS = {"tx": DIRECTION_TX, "rx": DIRECTION_RX}
+
+
+class ReplayMismatchError(Exception):
+    """A strict replay saw a frame that the trace does not contain next."""
+
+
+def is_poll_frame(frame: bytes) -> bool:
+    """Return whether a sent frame can come from ``fetch_state``.
+
+    Writes (``F...`` commands) and remote resets are only sent on request.
+    """
+    command = frame[2:7]
+    return not command.startswith(b"F") and command != REMOTE_RESET.encode()
+
+
+def trace_from_diagnostics(data: dict[str, Any] | list[dict[str, Any]]) -> list[TraceEntry]:
+    """Return the wire trace of a diagnostics download (or of its ``data`` part)."""
+    if isinstance(data, dict):
+        data = data.get("data", data).get("wire_trace", [])
+    return [
+        (float(entry["t"]), _DIRECTIONS[entry["dir"]], entry["frame"].encode("latin-1"))
+        for entry in data
+    ]
+
+
+def trace_from_proxy_log(text: str) -> list[TraceEntry]:
+    """Return the frames of ``Proxy.py`` output; the log carries no timing."""
+    entries: list[TraceEntry] = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line.startswith("tx: ") or ",rx: " not in line:
+            continue
+        sent, received = line[4:].split(",rx: ", 1)
+        entries.append((0.0, DIRECTION_TX, ast.literal_eval(sent)))
+        entries.append((0.0, DIRECTION_RX, ast.literal_eval(received)))
+    return entries
+
+
+def load_trace(path: str | Path) -> list[TraceEntry]:
+    """Load a diagnostics JSON file, a proxy log or a proxy capture."""
+    if is_capture(path):
+        return trace_from_capture(path)
+    text = Path(path).read_text(encoding="utf-8")
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return trace_from_proxy_log(text)
+    return trace_from_diagnostics(data)
+
+
+class ReplayTransport(DuepiEvoTransport):
+    """Serve recorded responses to the frames a client sends.
+
+    Each sent frame is looked up from the current position in the trace; the
+    received frames that follow it are returned by ``recv``. Connections share
+    the position, so consecutive polls walk through the trace. With
+    ``realtime`` the recorded delay between request and response is
+    reproduced (divided by ``speed``) and delays beyond the socket timeout
+    raise a timeout; otherwise responses are returned immediately. A frame
+    that is not in the remaining trace behaves like a stove that does not
+    answer and leaves the position unchanged, unless ``strict`` is set.
+    """
+
+    def __init__(
+        self,
+        entries: list[TraceEntry],
+        *,
+        realtime: bool = False,
+        speed: float = 1.0,
+        strict: bool = False,
+    ) -> None:
+        self.entries = entries
+        self.realtime = realtime
+        self.speed = speed
+        self.strict = strict
+        self.position = 0
+        self.connections = 0
+        self._last_polled = max(
+            (
+                index
+                for index, (_, direction, frame) in enumerate(entries)
+                if direction == DIRECTION_TX and is_poll_frame(frame)
+            ),
+            default=-1,
+        )
+
+    def connect(self, timeout: float | None) -> ReplayConnection:
+        self.connections += 1
+        conn = ReplayConnection(self)
+        conn.settimeout(timeout)
+        return conn
+
+    def describe(self) -> str:
+        return "replay"
+
+    @property
+    def exhausted(self) -> bool:
+        """Return whether no frame a poll sends is left in the trace."""
+        return self.position > self._last_polled
+
+    def rewind(self) -> None:
+        """Start again from the beginning of the trace."""
+        self.position = 0
+
+    def match(self, frame: bytes) -> tuple[float, list[tuple[float, bytes]]] | None:
+        """Consume ``frame`` and return its time and the responses recorded after it."""
+        entries = self.entries
+        for index in range(self.position, len(entries)):
+            sent_at, direction, recorded = entries[index]
+            if direction != DIRECTION_TX or recorded != frame:
+                if self.strict and direction == DIRECTION_TX:
+                    raise ReplayMismatchError(
+                        f"Expected {recorded!r} at trace position {index}, got {frame!r}"
+                    )
+                continue
+            responses = []
+            index += 1
+            while index < len(entries) and entries[index][1] == DIRECTION_RX:
+                responses.append((entries[index][0], entries[index][2]))
+                index += 1
+            self.position = index
+            return sent_at, responses
+        if self.strict:
+            raise ReplayMismatchError(f"{frame!r} not found after trace position {self.position}")
+        return None
+
+
+class ReplayConnection:
+    """Socket-like connection answering from a ``ReplayTransport``."""
+
+    def __init__(self, transport: ReplayTransport) -> None:
+        self._transport = transport
+        self._timeout: float | None = None
+        self._sent_at = 0.0
+        self._sent_monotonic = 0.0
+        self._responses: list[tuple[float, bytes]] = []
+        self._pending = b""
+
+    def settimeout(self, timeout: float | None) -> None:
+        self._timeout = timeout
+
+    def send(self, data: bytes) -> int:
+        """Match each ``&``-terminated frame of a (possibly pipelined) write in order.
+
+        The responses of every matched frame are queued behind each other and
+        timed from the first frame of the write. Matching stops at the first
+        frame that is not in the trace, like a stove that stops answering.
+        """
+        self._pending += bytes(data)
+        self._sent_monotonic = time.monotonic()
+        self._responses = []
+        first = True
+        while b"&" in self._pending:
+            frame, _, self._pending = self._pending.partition(b"&")
+            matched = self._transport.match(frame + b"&")
+            if matched is None:
+                self._pending = b""
+                break
+            sent_at, responses = matched
+            if first:
+                self._sent_at, first = sent_at, False
+            self._responses.extend(responses)
+        return len(data)
+
+    def _delay(self, recorded_at: float) -> float:
+        """Return the seconds still to wait before a recorded response is due."""
+        if not self._transport.realtime:
+            return 0.0
+        due = (recorded_at - self._sent_at) / self._transport.speed
+        return max(due - (time.monotonic() - self._sent_monotonic), 0.0)
+
+    def wait_readable(self, timeout: float) -> bool:
+        """Return whether a response arrives within ``timeout`` seconds."""
+        if not self._responses:
+            return False
+        delay = self._delay(self._responses[0][0])
+        if delay > timeout:
+            time.sleep(timeout)
+            return False
+        time.sleep(delay)
+        return True
+
+    def recv(self, _size: int) -> bytes:
+        if not self._responses:
+            self._wait_timeout()
+        delay = self._delay(self._responses[0][0])
+        if self._timeout is not None and delay > self._timeout:
+            self._responses = []
+            self._wait_timeout()
+        if delay:
+            time.sleep(delay)
+        return self._responses.pop(0)[1]
+
+    def _wait_timeout(self) -> None:
+        if self._transport.realtime and self._timeout:
+            time.sleep(self._timeout / self._transport.speed)
+        raise TimeoutError("No recorded response")
+
+    def close(self) -> None:
+        self._responses = []
+        self._pending = b""
+
+    def __enter__(self) -> ReplayConnection:
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        self.close()
+
+
+def replay_polls(
+    client: DuepiEvoClient, transport: ReplayTransport
+) -> Iterator[tuple[float, DuepiEvoState | DuepiEvoClientError]]:
+    """Poll through the trace; yield each poll's duration (ms) and state or error.
+
+    Stops when the trace is exhausted, or when a poll consumed nothing: the
+    rest of the trace then holds nothing this client sends (other
+    capabilities, or ``init_command`` set differently when recorded).
+    """
+    while not transport.exhausted:
+        position = transport.position
+        started = time.perf_counter()
+        try:
+            result: DuepiEvoState | DuepiEvoClientError = client.fetch_state()
+        except DuepiEvoClientError as err:
+            result = err
+        yield (time.perf_counter() - started) * 1000, result
+        if transport.position == position:
+            return
@@ -0,0 +1,44 @@
+"""Normalized stove state snapshot."""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, fields
+from typing import Any
+
+
+@dataclass(slots=True)
+class DuepiEvoState:
+    """Normalized stove state returned by the client.
+
+    ``hvac_mode`` holds the plain mode name (``"off"``/``"heat"``); the Home
+    Assistant adapter maps it onto ``HVACMode``.
+    """
+
+    burner_status: str
+    error_code: str
+    exh_fan_speed_rpm: int | None
+    flu_gas_temp_c: int | None
+    pellet_speed: int | None
+    power_level: str
+    pcb_temp_c: int | None
+    total_burn_time_h: int | None
+    burn_time_since_reset_h: int | None
+    pressure_switch_active: bool | None
+    current_temp_c: float | None
+    target_temp_c: float | None
+    hvac_mode: str
+    heating: bool
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable copy of the snapshot."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any] | None) -> DuepiEvoState | None:
+        """Rebuild a persisted snapshot, or return None if it no longer matches."""
+        if not data:
+            return None
+        try:
+            return cls(**{field.name: data[field.name] for field in fields(cls)})
+        except KeyError:
+            return None
@@ -0,0 +1,171 @@
+"""Fixed-size in-memory telemetry history with O(1) rolling statistics."""
+
+from __future__ import annotations
+
+from array import array
+from typing import Any
+
+
+class RollingSeries:
+    """Ring buffer of ``(time, value)`` samples of one numeric field.
+
+    Samples live in two preallocated ``array('d')`` columns. Running sums are
+    updated on every add and evict, so mean, variance and the least-squares
+    slope are O(1). Times are kept relative to an origin that is moved to the
+    oldest sample each time the buffer wraps; the sums are then rebuilt once,
+    which keeps the float sums from drifting on long-running instances.
+    """
+
+    __slots__ = (
+        "capacity",
+        "_times",
+        "_values",
+        "_head",
+        "_count",
+        "_origin",
+        "_sum_t",
+        "_sum_v",
+        "_sum_tt",
+        "_sum_vv",
+        "_sum_tv",
+    )
+
+    def __init__(self, capacity: int) -> None:
+        if capacity < 2:
+            raise ValueError("capacity must be at least 2")
+        self.capacity = capacity
+        self._times = array("d", bytes(8 * capacity))
+        self._values = array("d", bytes(8 * capacity))
+        self._head = 0
+        self._count = 0
+        self._origin: float | None = None
+        self._sum_t = self._sum_v = self._sum_tt = self._sum_vv = self._sum_tv = 0.0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, now: float, value: float) -> None:
+        """Append one sample taken at monotonic ``now``, evicting the oldest."""
+        if self._origin is None:
+            self._origin = now
+        t = now - self._origin
+        index = self._head
+        if self._count == self.capacity:
+            self._account(self._times[index], self._values[index], -1.0)
+        else:
+            self._count += 1
+        self._times[index] = t
+        self._values[index] = value
+        self._account(t, value, 1.0)
+        self._head = (index + 1) % self.capacity
+        if self._head == 0:
+            self._rebase()
+
+    def _account(self, t: float, value: float, sign: float) -> None:
+        self._sum_t += sign * t
+        self._sum_v += sign * value
+        self._sum_tt += sign * t * t
+        self._sum_vv += sign * value * value
+        self._sum_tv += sign * t * value
+
+    def _rebase(self) -> None:
+        """Move the time origin to the oldest sample and rebuild the sums."""
+        shift = self._times[self._head]
+        self._origin += shift
+        self._sum_t = self._sum_v = self._sum_tt = self._sum_vv = self._sum_tv = 0.0
+        for index in range(self._count):
+            t = self._times[index] - shift
+            self._times[index] = t
+            self._account(t, self._values[index], 1.0)
+
+    def _oldest(self) -> int:
+        return self._head if self._count == self.capacity else 0
+
+    @property
+    def last(self) -> float | None:
+        """Return the newest value."""
+        if not self._count:
+            return None
+        return self._values[(self._head - 1) % self.capacity]
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean of the buffered values."""
+        if not self._count:
+            return None
+        return self._sum_v / self._count
+
+    @property
+    def variance(self) -> float | None:
+        """Return the population variance of the buffered values."""
+        if not self._count:
+            return None
+        mean = self._sum_v / self._count
+        return max(self._sum_vv / self._count - mean * mean, 0.0)
+
+    @property
+    def slope(self) -> float | None:
+        """Return the least-squares slope in value units per second."""
+        n = self._count
+        if n < 2:
+            return None
+        denominator = n * self._sum_tt - self._sum_t * self._sum_t
+        if denominator <= 0.0:
+            return None
+        return (n * self._sum_tv - self._sum_t * self._sum_v) / denominator
+
+    @property
+    def span(self) -> float:
+        """Return the seconds between the oldest and the newest sample."""
+        if self._count < 2:
+            return 0.0
+        newest = self._times[(self._head - 1) % self.capacity]
+        return newest - self._times[self._oldest()]
+
+    def samples(self) -> list[tuple[float, float]]:
+        """Return ``(monotonic time, value)`` pairs from oldest to newest."""
+        origin = self._origin or 0.0
+        start = self._oldest()
+        result = []
+        for offset in range(self._count):
+            index = (start + offset) % self.capacity
+            result.append((origin + self._times[index], self._values[index]))
+        return result
+
+
+class TelemetryBuffer:
+    """Rolling history of selected numeric fields of state snapshots."""
+
+    __slots__ = ("fields", "capacity", "_series")
+
+    def __init__(self, fields: tuple[str, ...], capacity: int) -> None:
+        self.fields = fields
+        self.capacity = capacity
+        self._series = {name: RollingSeries(capacity) for name in fields}
+
+    def add(self, state: Any, now: float) -> None:
+        """Record the fields of one snapshot taken at monotonic ``now``."""
+        for name, series in self._series.items():
+            value = getattr(state, name)
+            if value is not None:
+                series.add(now, float(value))
+
+    def series(self, name: str) -> RollingSeries:
+        """Return the history of one field."""
+        return self._series[name]
+
+    def as_dict(self, clock_offset: float = 0.0) -> dict[str, dict[str, Any]]:
+        """Return samples and rolling statistics of every field.
+
+        ``clock_offset`` is added to the monotonic sample times, e.g.
+        ``time.time() - time.monotonic()`` to report wall-clock timestamps.
+        """
+        return {
+            name: {
+                "samples": [[t + clock_offset, value] for t, value in series.samples()],
+                "mean": series.mean,
+                "variance": series.variance,
+                "slope": series.slope,
+            }
+            for name, series in self._series.items()
+        }
@@ -0,0 +1,64 @@
+"""Preallocated ring buffer of raw frames exchanged with the bridge."""
+
+from __future__ import annotations
+
+from array import array
+import time
+from typing import Any
+
+DEFAULT_TRACE_CAPACITY = 256
+
+DIRECTION_TX = 0
+DIRECTION_RX = 1
+_DIRECTION_NAMES = ("tx", "rx")
+
+
+class WireTrace:
+    """Last ``capacity`` raw frames with monotonic timestamps.
+
+    All storage is allocated up front; ``record`` only overwrites one slot in
+    each column, so tracing can stay on for every poll.
+    """
+
+    __slots__ = ("capacity", "_times", "_directions", "_frames", "_head", "_count")
+
+    def __init__(self, capacity: int = DEFAULT_TRACE_CAPACITY) -> None:
+        self.capacity = capacity
+        self._times = array("d", bytes(8 * capacity))
+        self._directions = bytearray(capacity)
+        self._frames: list[bytes] = [b""] * capacity
+        self._head = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def record(self, direction: int, frame: bytes) -> None:
+        """Store one frame sent (``DIRECTION_TX``) or received (``DIRECTION_RX``)."""
+        index = self._head
+        self._times[index] = time.monotonic()
+        self._directions[index] = direction
+        self._frames[index] = frame
+        self._head = (index + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def entries(self) -> list[tuple[float, int, bytes]]:
+        """Return ``(monotonic time, direction, frame)`` from oldest to newest."""
+        start = (self._head - self._count) % self.capacity
+        result = []
+        for offset in range(self._count):
+            index = (start + offset) % self.capacity
+            result.append((self._times[index], self._directions[index], self._frames[index]))
+        return result
+
+    def as_list(self) -> list[dict[str, Any]]:
+        """Return the trace in a JSON-serializable form.
+
+        Frames are decoded as latin-1 so every byte maps to one character and
+        the original bytes can be restored with ``frame.encode("latin-1")``.
+        """
+        return [
+            {"t": t, "dir": _DIRECTION_NAMES[direction], "frame": frame.decode("latin-1")}
+            for t, direction, frame in self.entries()
+        ]
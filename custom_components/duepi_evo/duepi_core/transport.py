@@ -0,0 +1,486 @@
+"""Transports carrying Duepi EVO frames: TCP bridge, local serial, loopback.
+
+A transport opens connections with ``connect(timeout)``. Connections are
+socket-like: ``send``, ``recv``, ``settimeout``, ``close``, the context
+manager protocol and an optional ``wait_readable(timeout)``; a plain TCP
+socket qualifies as is. ``read_frame`` reassembles one response frame on top
+of any connection, so transports that deliver a frame in pieces (a serial
+line, a pty) work with the same client code. ``ReplayTransport`` from
+``replay`` follows the same interface.
+
+``create_transport`` picks the transport of a configured host: a device path
+such as ``/dev/ttyUSB0`` selects the local serial line (115200 baud, 8N1),
+anything else a TCP bridge. Several bridge endpoints (esp-link listens on
+both port 23 and 2000) are wrapped in a ``FailoverTransport``.
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+import math
+import os
+import select
+import socket
+import time
+from typing import Any
+
+from .const import FRAME_LENGTH, MIN_FRAME_LENGTH
+
+SERIAL_BAUDRATE = 115200
+
+# Bytes that start and end a response frame: the stove answers "\x1b...&",
+# EVO-sim " ...\r".
+FRAME_STARTS = b"\x1b "
+FRAME_TERMINATORS = b"&\r"
+
+# Time granted to the rest of a frame once it is long enough to be valid.
+FRAME_GRACE = 0.01
+
+# Seconds an endpoint is passed over after a refused, stalled or silent
+# connection, so the other endpoint takes the traffic meanwhile.
+FAILOVER_COOLDOWN = 60.0
+
+# Connect budget per endpoint while another endpoint can take over; a bridge
+# port held by another app tends to stall rather than refuse.
+FAILOVER_CONNECT_TIMEOUT = 1.0
+
+# Weight of the newest sample in an endpoint's smoothed poll latency.
+LATENCY_SMOOTHING = 0.2
+
+# TCP keepalive of persistent connections: probe after 10 s of silence, every
+# 5 s, and give up after 3 unanswered probes, so a bridge that vanished is
+# noticed within about 25 s instead of the OS default of two hours.
+KEEPALIVE_IDLE = 10
+KEEPALIVE_INTERVAL = 5
+KEEPALIVE_COUNT = 3
+
+
+def read_frame(conn: Any, size: int = FRAME_LENGTH) -> bytes:
+    """Read one response frame of up to ``size`` bytes.
+
+    A chunk that starts like a frame is completed until ``size`` bytes or a
+    terminator arrived. A frame that is already long enough to be valid gets
+    ``FRAME_GRACE`` seconds for its tail; a partial frame whose tail times
+    out, and anything not starting like a frame, is returned as is and left
+    to the caller's validation.
+    """
+    frame = conn.recv(size)
+    if not frame or frame[0] not in FRAME_STARTS:
+        return frame
+    while len(frame) < size and frame[-1:] not in FRAME_TERMINATORS:
+        if len(frame) >= MIN_FRAME_LENGTH and not wait_readable(conn, FRAME_GRACE):
+            break
+        try:
+            chunk = conn.recv(size - len(frame))
+        except (TimeoutError, socket.timeout):
+            break
+        if not chunk:
+            break
+        frame += chunk
+    return frame
+
+
+def wait_readable(conn: Any, timeout: float) -> bool:
+    """Return whether ``conn`` has data to read within ``timeout`` seconds."""
+    method = getattr(conn, "wait_readable", None)
+    if method is not None:
+        return method(timeout)
+    ready_to_read, _, _ = select.select([conn], [], [], timeout)
+    return bool(ready_to_read)
+
+
+class DuepiEvoTransport(ABC):
+    """Opens connections to one stove."""
+
+    @abstractmethod
+    def connect(self, timeout: float) -> Any:
+        """Return a connected socket-like object using ``timeout`` for I/O."""
+
+    def __call__(self) -> Any:
+        """Open a connection with the default timeout (``connection_factory`` style)."""
+        return self.connect(None)
+
+    def describe(self) -> str:
+        """Return a short human-readable address."""
+        return type(self).__name__
+
+    def report_success(self, latency_ms: float) -> None:
+        """Record a poll over the last connection that succeeded."""
+
+    def report_failure(self, error: Exception) -> bool:
+        """Record a poll that stalled; return whether another endpoint can retry it."""
+        return False
+
+    def health(self) -> list[dict[str, Any]]:
+        """Return the health of each endpoint; empty for single-endpoint transports."""
+        return []
+
+
+def configure_keepalive(
+    sock: socket.socket,
+    idle: int = KEEPALIVE_IDLE,
+    interval: int = KEEPALIVE_INTERVAL,
+    count: int = KEEPALIVE_COUNT,
+) -> None:
+    """Enable TCP keepalive with the given timing where the OS allows tuning it.
+
+    On Linux ``TCP_USER_TIMEOUT`` also bounds how long sent data may stay
+    unacknowledged, which catches a half-open connection during a write.
+    """
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    # macOS calls the idle time TCP_KEEPALIVE.
+    idle_option = getattr(socket, "TCP_KEEPIDLE", getattr(socket, "TCP_KEEPALIVE", None))
+    for option, value in (
+        (idle_option, idle),
+        (getattr(socket, "TCP_KEEPINTVL", None), interval),
+        (getattr(socket, "TCP_KEEPCNT", None), count),
+        (getattr(socket, "TCP_USER_TIMEOUT", None), (idle + interval * count) * 1000),
+    ):
+        if option is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, option, value)
+
+
+class TcpTransport(DuepiEvoTransport):
+    """Serial-over-TCP bridge such as an Elfin EW11 or a USR-TCP232."""
+
+    def __init__(self, host: str, port: int, *, keepalive: bool = False) -> None:
+        self.host = host
+        self.port = port
+        self.keepalive = keepalive
+
+    def connect(self, timeout: float | None) -> socket.socket:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        try:
+            if self.keepalive:
+                configure_keepalive(sock)
+            sock.connect((self.host, self.port))
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+    def describe(self) -> str:
+        return f"{self.host}:{self.port}"
+
+
+class SerialTransport(DuepiEvoTransport):
+    """Stove board wired to a local serial device or pty (8N1, raw mode).
+
+    Uses ``termios`` directly so no serial library is needed; POSIX only.
+    """
+
+    def __init__(self, device: str, baudrate: int = SERIAL_BAUDRATE) -> None:
+        self.device = device
+        self.baudrate = baudrate
+
+    def connect(self, timeout: float | None) -> SerialConnection:
+        fd = os.open(self.device, os.O_RDWR | os.O_NOCTTY | os.O_NONBLOCK)
+        try:
+            configure_serial(fd, self.baudrate)
+        except Exception:
+            os.close(fd)
+            raise
+        conn = SerialConnection(fd)
+        conn.settimeout(timeout)
+        return conn
+
+    def describe(self) -> str:
+        return f"{self.device}@{self.baudrate}"
+
+
+def configure_serial(fd: int, baudrate: int = SERIAL_BAUDRATE) -> None:
+    """Put a tty into raw 8N1 mode at ``baudrate`` and drop pending input."""
+    import termios  # noqa: PLC0415 - POSIX only, imported when a tty is used
+
+    speed = getattr(termios, f"B{baudrate}", None)
+    if speed is None:
+        raise ValueError(f"Unsupported baud rate: {baudrate}")
+    iflag, oflag, cflag, lflag, _ispeed, _ospeed, cc = termios.tcgetattr(fd)
+    iflag &= ~(
+        termios.IGNBRK | termios.BRKINT | termios.PARMRK | termios.ISTRIP
+        | termios.INLCR | termios.IGNCR | termios.ICRNL | termios.IXON
+        | termios.IXOFF | termios.INPCK
+    )
+    oflag &= ~termios.OPOST
+    lflag &= ~(termios.ECHO | termios.ECHONL | termios.ICANON | termios.ISIG | termios.IEXTEN)
+    cflag &= ~(termios.CSIZE | termios.PARENB | termios.CSTOPB)
+    cflag |= termios.CS8 | termios.CREAD | termios.CLOCAL
+    cc[termios.VMIN] = 0
+    cc[termios.VTIME] = 0
+    termios.tcsetattr(fd, termios.TCSANOW, [iflag, oflag, cflag, lflag, speed, speed, cc])
+    termios.tcflush(fd, termios.TCIFLUSH)
+
+
+class SerialConnection:
+    """Socket-like wrapper around a non-blocking tty file descriptor."""
+
+    def __init__(self, fd: int) -> None:
+        self.fd = fd
+        self._timeout: float | None = None
+
+    def settimeout(self, timeout: float | None) -> None:
+        self._timeout = timeout
+
+    def fileno(self) -> int:
+        return self.fd
+
+    def send(self, data: bytes) -> int:
+        view = memoryview(data)
+        while view:
+            if not select.select([], [self.fd], [], self._timeout)[1]:
+                raise TimeoutError(f"Write timed out on fd {self.fd}")
+            view = view[os.write(self.fd, view) :]
+        return len(data)
+
+    sendall = send
+
+    def wait_readable(self, timeout: float | None) -> bool:
+        return bool(select.select([self.fd], [], [], timeout)[0])
+
+    def recv(self, size: int) -> bytes:
+        if not self.wait_readable(self._timeout):
+            raise TimeoutError(f"Read timed out on fd {self.fd}")
+        return os.read(self.fd, size)
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+    def __enter__(self) -> SerialConnection:
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        self.close()
+
+
+class LoopbackTransport(DuepiEvoTransport):
+    """In-process stand-in answering frames with ``responder(frame)``.
+
+    ``responder`` receives one complete request frame and returns the
+    response bytes, or ``None`` for a stove that stays silent. Pipelined
+    frames are split on ``&`` and answered in order.
+    """
+
+    def __init__(self, responder: Callable[[bytes], bytes | None]) -> None:
+        self.responder = responder
+        self.connections = 0
+
+    def connect(self, timeout: float | None) -> LoopbackConnection:
+        self.connections += 1
+        return LoopbackConnection(self.responder)
+
+    def describe(self) -> str:
+        return "loopback"
+
+
+class LoopbackConnection:
+    """Socket-like connection of a ``LoopbackTransport``."""
+
+    def __init__(self, responder: Callable[[bytes], bytes | None]) -> None:
+        self._responder = responder
+        self._pending = b""
+        self._received = bytearray()
+
+    def settimeout(self, _timeout: float | None) -> None:
+        return None
+
+    def send(self, data: bytes) -> int:
+        self._pending += data
+        while b"&" in self._pending:
+            frame, _, self._pending = self._pending.partition(b"&")
+            response = self._responder(frame + b"&")
+            if response:
+                self._received += response
+        return len(data)
+
+    sendall = send
+
+    def wait_readable(self, _timeout: float | None) -> bool:
+        return bool(self._received)
+
+    def recv(self, size: int) -> bytes:
+        if not self._received:
+            raise TimeoutError("No loopback response")
+        data = bytes(self._received[:size])
+        del self._received[:size]
+        return data
+
+    def close(self) -> None:
+        self._received.clear()
+
+    def __enter__(self) -> LoopbackConnection:
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        self.close()
+
+
+@dataclass(slots=True)
+class EndpointHealth:
+    """Connection outcomes and smoothed poll latency of one endpoint."""
+
+    connects: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    latency_ms: float | None = None
+    last_error: str | None = None
+    cooldown_until: float = 0.0
+
+    def observe(self, latency_ms: float) -> None:
+        """Fold one poll latency into the moving average."""
+        self.consecutive_failures = 0
+        if self.latency_ms is None:
+            self.latency_ms = latency_ms
+        else:
+            self.latency_ms += LATENCY_SMOOTHING * (latency_ms - self.latency_ms)
+
+    def fail(self, error: Exception, until: float) -> None:
+        """Record a failure and pass the endpoint over until ``until``."""
+        self.failures += 1
+        self.consecutive_failures += 1
+        self.last_error = str(error) or type(error).__name__
+        self.cooldown_until = until
+
+    def as_dict(self, now: float) -> dict[str, Any]:
+        """Return counters, latency and the remaining cooldown in seconds."""
+        return {
+            "connects": self.connects,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "latency_ms": self.latency_ms,
+            "last_error": self.last_error,
+            "cooldown_s": max(self.cooldown_until - now, 0.0),
+        }
+
+
+class FailoverTransport(DuepiEvoTransport):
+    """Several endpoints of one stove, e.g. both ports of an esp-link bridge.
+
+    Endpoints outside their cooldown are tried fastest first by smoothed poll
+    latency; unmeasured endpoints keep their configured order behind measured
+    ones. A refused or stalled connect puts the endpoint in cooldown and moves
+    on to the next one within the same ``connect`` call. A poll that stalls
+    after connecting is reported by the client through ``report_failure``,
+    which cools the active endpoint down so the retry uses another one.
+    """
+
+    def __init__(
+        self,
+        transports: Sequence[DuepiEvoTransport],
+        *,
+        cooldown: float = FAILOVER_COOLDOWN,
+        connect_timeout: float = FAILOVER_CONNECT_TIMEOUT,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.transports = list(transports)
+        self.cooldown = cooldown
+        self.connect_timeout = connect_timeout
+        self.active = 0
+        self.failovers = 0
+        self._clock = clock
+        self._health = [EndpointHealth() for _ in self.transports]
+
+    def candidates(self) -> list[int]:
+        """Return endpoint indexes in the order ``connect`` tries them."""
+        now = self._clock()
+        health = self._health
+        ready = [index for index, item in enumerate(health) if item.cooldown_until <= now]
+        ready.sort(key=lambda index: math.inf if health[index].latency_ms is None else health[index].latency_ms)
+        cooling = sorted(
+            (index for index, item in enumerate(health) if item.cooldown_until > now),
+            key=lambda index: health[index].cooldown_until,
+        )
+        return ready + cooling
+
+    def connect(self, timeout: float | None) -> Any:
+        short = self.connect_timeout if timeout is None else min(timeout, self.connect_timeout)
+        candidates = self.candidates()
+        last_error: OSError | None = None
+        for position, index in enumerate(candidates):
+            # The last candidate has nobody to fail over to and gets the full timeout.
+            budget = short if position < len(candidates) - 1 else timeout
+            try:
+                conn = self.transports[index].connect(budget)
+            except OSError as err:
+                self._health[index].fail(err, self._clock() + self.cooldown)
+                last_error = err
+                continue
+            conn.settimeout(timeout)
+            if index != self.active:
+                self.failovers += 1
+                self.active = index
+            self._health[index].connects += 1
+            return conn
+        assert last_error is not None
+        raise last_error
+
+    def report_success(self, latency_ms: float) -> None:
+        self._health[self.active].observe(latency_ms)
+
+    def report_failure(self, error: Exception) -> bool:
+        now = self._clock()
+        self._health[self.active].fail(error, now + self.cooldown)
+        return any(item.cooldown_until <= now for item in self._health)
+
+    def describe(self) -> str:
+        return self.transports[self.active].describe()
+
+    def health(self) -> list[dict[str, Any]]:
+        now = self._clock()
+        return [
+            {
+                "endpoint": transport.describe(),
+                "active": index == self.active,
+                **self._health[index].as_dict(now),
+            }
+            for index, transport in enumerate(self.transports)
+        ]
+
+
+def is_serial_device(host: str) -> bool:
+    """Return whether a configured host names a local serial device."""
+    return host.startswith("/")
+
+
+def parse_endpoints(text: str, default_host: str) -> list[tuple[str, int]]:
+    """Parse extra bridge endpoints such as ``"2000"`` or ``"192.168.1.5:2000, 23"``.
+
+    A bare port refers to ``default_host``. Raises ``ValueError`` on anything
+    that is not a valid port.
+    """
+    endpoints = []
+    for item in text.replace(",", " ").split():
+        host, _, port = item.rpartition(":")
+        number = int(port)
+        if not 0 < number < 65536:
+            raise ValueError(f"Invalid port: {port}")
+        endpoints.append((host or default_host, number))
+    return endpoints
+
+
+def create_transport(
+    host: str,
+    port: int,
+    endpoints: Sequence[tuple[str, int]] = (),
+    *,
+    keepalive: bool = False,
+) -> DuepiEvoTransport:
+    """Return the transport of a configured host, port and extra endpoints.
+
+    ``keepalive`` enables TCP keepalive, meant for persistent connections.
+    """
+    if is_serial_device(host):
+        return SerialTransport(host)
+    primary = TcpTransport(host, port, keepalive=keepalive)
+    extra = [
+        TcpTransport(*endpoint, keepalive=keepalive)
+        for endpoint in endpoints
+        if endpoint != (host, port)
+    ]
+    if not extra:
+        return primary
+    return FailoverTransport([primary, *extra])
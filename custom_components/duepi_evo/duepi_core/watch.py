@@ -0,0 +1,218 @@
+"""Live terminal view of one or more stoves: ``duepi watch``.
+
+Registers are read in tiers so the bridge sees little more traffic than a
+normal poll: status and room temperature every tick, the combustion values
+every ``MEDIUM_TIER`` ticks and slow counters every ``SLOW_TIER`` ticks. A
+status change refreshes every field on the next tick. Each stove keeps one
+persistent connection and all stoves are polled concurrently each tick.
+
+On a terminal only the cells whose text changed are rewritten (cursor
+addressing), otherwise every change is printed as a log line.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+import time
+from typing import Any, TextIO
+
+from .client import DuepiEvoClient, DuepiEvoClientError, DuepiEvoTimeoutError
+from .probe import UNSUPPORTED_AFTER_TIMEOUTS
+
+DEFAULT_WATCH_INTERVAL = 1.0
+MEDIUM_TIER = 5
+SLOW_TIER = 30
+
+
+@dataclass(frozen=True, slots=True)
+class WatchField:
+    """A column of the view and the CLI read command that fills it."""
+
+    command: str
+    label: str
+    width: int
+    period: int = 1
+    # Not every controller answers these; repeated timeouts hide the column.
+    optional: bool = False
+
+
+WATCH_FIELDS = (
+    WatchField("status", "Status", 18),
+    WatchField("temperature", "Room", 5),
+    WatchField("power", "Power", 6, MEDIUM_TIER),
+    WatchField("flugas", "Flue", 4, MEDIUM_TIER),
+    WatchField("fan-speed", "Fan", 5, MEDIUM_TIER),
+    WatchField("pellet-speed", "Pellet", 6, MEDIUM_TIER),
+    WatchField("error", "Error", 20, MEDIUM_TIER),
+    WatchField("setpoint", "Set", 3, SLOW_TIER),
+    WatchField("pcb-temp", "PCB", 3, SLOW_TIER, optional=True),
+    WatchField("burn-time", "Burn h", 6, SLOW_TIER, optional=True),
+)
+
+
+@dataclass(slots=True)
+class StoveWatcher:
+    """Tiered polling state of one stove."""
+
+    name: str
+    client: DuepiEvoClient
+    read: Callable[[DuepiEvoClient, str], Any]
+    fields: Sequence[WatchField] = WATCH_FIELDS
+    values: dict[str, str] = field(default_factory=dict)
+    unsupported: set[str] = field(default_factory=set)
+    timeouts: dict[str, int] = field(default_factory=dict)
+    error: str | None = None
+    reads: int = 0
+    refresh_all: bool = True
+
+    def due(self, tick: int) -> list[WatchField]:
+        """Return the fields to read on ``tick``."""
+        return [
+            item
+            for item in self.fields
+            if item.command not in self.unsupported
+            and (self.refresh_all or tick % item.period == 0)
+        ]
+
+    def poll(self, tick: int) -> dict[str, str]:
+        """Read the due fields and return those whose text changed."""
+        changed: dict[str, str] = {}
+        due = self.due(tick)
+        self.refresh_all = False
+        for item in due:
+            try:
+                value = format_value(self.read(self.client, item.command))
+            except DuepiEvoTimeoutError:
+                if not item.optional:
+                    return self._fail(changed, f"{item.command} timed out")
+                self.timeouts[item.command] = self.timeouts.get(item.command, 0) + 1
+                if self.timeouts[item.command] >= UNSUPPORTED_AFTER_TIMEOUTS:
+                    self.unsupported.add(item.command)
+                value = self.values.get(item.command, "-")
+            except DuepiEvoClientError as err:
+                return self._fail(changed, str(err))
+            else:
+                self.timeouts.pop(item.command, None)
+            self.reads += 1
+            if item.command == "status" and self.values.get("status") not in (None, value):
+                self.refresh_all = True
+            if self.values.get(item.command) != value:
+                self.values[item.command] = value
+                changed[item.command] = value
+        if self.error is not None:
+            self.error = None
+            changed["state"] = "ok"
+        return changed
+
+    def _fail(self, changed: dict[str, str], error: str) -> dict[str, str]:
+        # Read everything again once the stove is back.
+        self.refresh_all = True
+        if self.error != error:
+            self.error = error
+            changed["state"] = error
+        return changed
+
+
+def format_value(value: Any) -> str:
+    """Return the display text of a read value."""
+    if isinstance(value, float):
+        return f"{value:.1f}"
+    return str(value)
+
+
+class WatchScreen:
+    """Table on an ANSI terminal, rewriting only cells whose text changed."""
+
+    def __init__(self, stream: TextIO, names: Sequence[str], fields: Sequence[WatchField]) -> None:
+        self.stream = stream
+        name_width = max([len("Stove"), *(len(name) for name in names)])
+        # (command, width, column) for the name, every field and the state.
+        self._columns: list[tuple[str, int, int]] = []
+        column = 1
+        for command, width in (
+            ("name", name_width),
+            *((item.command, max(item.width, len(item.label))) for item in fields),
+            ("state", 24),
+        ):
+            self._columns.append((command, width, column))
+            column += width + 1
+        self._labels = {"name": "Stove", "state": "State"}
+        self._labels.update({item.command: item.label for item in fields})
+        self._cells: dict[tuple[int, str], str] = {}
+        self._rows = len(names)
+        self.cells_written = 0
+
+    def draw(self, rows: Sequence[dict[str, str]], footer: str) -> None:
+        """Write the cells that differ from what is on screen."""
+        out = []
+        if not self._cells:
+            out.append("\x1b[2J")
+            out.extend(
+                f"\x1b[1;{column}H{self._labels[command][:width].ljust(width)}"
+                for command, width, column in self._columns
+            )
+        for index, row in enumerate(rows):
+            for command, width, column in self._columns:
+                text = row.get(command, "")[:width].ljust(width)
+                if self._cells.get((index, command)) == text:
+                    continue
+                self._cells[(index, command)] = text
+                out.append(f"\x1b[{index + 2};{column}H{text}")
+                self.cells_written += 1
+        out.append(f"\x1b[{self._rows + 3};1H{footer}\x1b[K")
+        self.stream.write("".join(out))
+        self.stream.flush()
+
+
+class WatchLog:
+    """Line per changed field, for pipes and log files."""
+
+    def __init__(self, stream: TextIO) -> None:
+        self.stream = stream
+
+    def changes(self, stamp: str, name: str, changed: dict[str, str]) -> None:
+        """Print the changed fields of one stove."""
+        if changed:
+            fields = " ".join(f"{command}={value}" for command, value in changed.items())
+            print(f"{stamp} {name} {fields}", file=self.stream, flush=True)
+
+
+def run_watch(
+    watchers: Sequence[StoveWatcher],
+    stream: TextIO,
+    *,
+    interval: float = DEFAULT_WATCH_INTERVAL,
+    ticks: int | None = None,
+    ansi: bool = True,
+    sleep: Callable[[float], None] = time.sleep,
+) -> None:
+    """Poll every stove each ``interval`` seconds and show the changes.
+
+    Runs until interrupted, or for ``ticks`` ticks.
+    """
+    if not watchers:
+        raise ValueError("No stoves to watch")
+    names = [watcher.name for watcher in watchers]
+    screen = WatchScreen(stream, names, watchers[0].fields) if ansi else None
+    log = None if ansi else WatchLog(stream)
+    tick = 0
+    with ThreadPoolExecutor(max_workers=max(1, len(watchers))) as executor:
+        while ticks is None or tick < ticks:
+            started = time.monotonic()
+            changes = list(executor.map(lambda watcher: watcher.poll(tick), watchers))
+            stamp = time.strftime("%H:%M:%S")
+            if screen is not None:
+                rows = [
+                    {"name": watcher.name, **watcher.values, "state": watcher.error or "ok"}
+                    for watcher in watchers
+                ]
+                reads = sum(watcher.reads for watcher in watchers)
+                screen.draw(rows, f"{stamp}  tick {tick}  reads {reads}  (Ctrl-C to quit)")
+            else:
+                for watcher, changed in zip(watchers, changes):
+                    log.changes(stamp, watcher.name, changed)
+            tick += 1
+            if ticks is None or tick < ticks:
+                sleep(max(0.0, interval - (time.monotonic() - started)))
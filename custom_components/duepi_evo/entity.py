@@ -0,0 +1,60 @@
+"""Shared base entity for Duepi EVO platforms."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import ATTR_STALE
+from .coordinator import DuepiEvoCoordinator
+from .device import build_device_info
+
+
+class DuepiEvoEntity(CoordinatorEntity[DuepiEvoCoordinator]):
+    """Coordinator-backed entity attached to one stove device."""
+
+    _device_name: str
+    _unique_base: str
+    _last_written: tuple[Any, ...] | None = None
+
+    @property
+    def device_info(self):
+        """Return the parent stove device information."""
+        return build_device_info(self._unique_base, self._device_name)
+
+    @property
+    def _stale_attributes(self) -> dict[str, Any] | None:
+        """Flag values restored from storage until the first live poll succeeds."""
+        if self.coordinator.stale:
+            return {ATTR_STALE: True}
+        return None
+
+    def _written_value(self) -> Any:
+        """Return the derived value whose change requires a state write.
+
+        Platforms narrow this to what their state shows; by default any new
+        coordinator data is written.
+        """
+        return self.coordinator.data
+
+    def _write_fingerprint(self) -> tuple[Any, ...]:
+        """Return everything that ends up in the written state."""
+        return (self.available, self.coordinator.stale, self._written_value())
+
+    async def async_added_to_hass(self) -> None:
+        """Remember the state written when the entity was added."""
+        await super().async_added_to_hass()
+        self._last_written = self._write_fingerprint()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only when the derived value actually changed."""
+        fingerprint = self._write_fingerprint()
+        if fingerprint == self._last_written:
+            self.coordinator.write_stats.skipped += 1
+            return
+        self._last_written = fingerprint
+        self.coordinator.write_stats.performed += 1
+        self.async_write_ha_state()
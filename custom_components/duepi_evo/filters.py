@@ -0,0 +1,52 @@
+"""Publish filters that keep noisy telemetry out of the recorder."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from numbers import Real
+from typing import Any
+
+
+@dataclass(slots=True)
+class DeadbandFilter:
+    """Hold a published value until a new sample leaves its deadband.
+
+    The band around the last published value is the larger of ``absolute``
+    and ``percent`` of that value. ``max_age`` (seconds) acts as a heartbeat:
+    once it expires, the next sample is published even if it stayed inside
+    the band. Non-numeric values and ``None`` transitions always publish.
+    """
+
+    absolute: float | None = None
+    percent: float | None = None
+    max_age: float | None = None
+    _value: Any = field(default=None, init=False)
+    _published_at: float | None = field(default=None, init=False)
+
+    @property
+    def value(self) -> Any:
+        """Return the last published value."""
+        return self._value
+
+    @property
+    def has_value(self) -> bool:
+        """Return whether anything has been published yet."""
+        return self._published_at is not None
+
+    def _leaves_band(self, value: Any) -> bool:
+        previous = self._value
+        if not isinstance(value, Real) or not isinstance(previous, Real):
+            return value != previous
+        band = max(self.absolute or 0.0, abs(previous) * (self.percent or 0.0) / 100.0)
+        return abs(value - previous) > band
+
+    def update(self, value: Any, now: float) -> Any:
+        """Feed a new sample taken at monotonic time ``now``; return the published value."""
+        if (
+            self._published_at is None
+            or self._leaves_band(value)
+            or (self.max_age is not None and now - self._published_at >= self.max_age)
+        ):
+            self._value = value
+            self._published_at = now
+        return self._value
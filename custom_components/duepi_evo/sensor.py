@@ -4,14 +4,28 @@ from __future__ import annotations
 
 from collections.abc import Callable
 from dataclasses import dataclass
+from datetime import timedelta
+import time
 from typing import Any
 
-from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, SensorEntityDescription
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_HOST, CONF_NAME, CONF_PORT, EntityCategory, UnitOfTemperature
-from homeassistant.core import HomeAssistant
+from homeassistant.const import (
+    CONF_HOST,
+    CONF_NAME,
+    CONF_PORT,
+    PERCENTAGE,
+    EntityCategory,
+    UnitOfTemperature,
+    UnitOfTime,
+)
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .client import DuepiEvoState
 from .const import (
@@ -20,23 +34,49 @@ from .const import (
     ATTR_ERROR_CODE,
     ATTR_EXH_FAN_SPEED,
     ATTR_FLU_GAS_TEMP,
+    ATTR_MEAN,
     ATTR_PCB_TEMP,
     ATTR_PELLET_SPEED,
     ATTR_POWER_LEVEL,
     ATTR_TOTAL_BURN_TIME,
+    ATTR_VARIANCE,
+    ATTR_WINDOW_LAST,
+    ATTR_WINDOW_MAX,
+    ATTR_WINDOW_MIN,
+    ATTR_WINDOW_SAMPLES,
     DEFAULT_NAME,
     DOMAIN,
     entry_unique_id,
 )
 from .coordinator import DuepiEvoCoordinator
-from .device import build_device_info
+from .duepi_core.aggregation import AggregateSnapshot
+from .duepi_core.cycles import BurnerCycleStats
+from .duepi_core.metrics import DuepiEvoClientMetrics
+from .duepi_core.telemetry import RollingSeries
+from .entity import DuepiEvoEntity
+from .filters import DeadbandFilter
+
+DEFAULT_DEADBAND_MAX_AGE = timedelta(minutes=15)
 
 
 @dataclass(frozen=True, kw_only=True)
 class DuepiEvoSensorDescription(SensorEntityDescription):
-    """Description of one Duepi EVO sensor."""
+    """Description of one Duepi EVO sensor.
+
+    ``deadband`` (absolute, native unit) and ``deadband_pct`` (percent of the
+    last published value) suppress publishing small wobbles; the value is
+    still refreshed after ``deadband_max_age``.
+    """
 
     value_fn: Callable[[DuepiEvoState], Any]
+    deadband: float | None = None
+    deadband_pct: float | None = None
+    deadband_max_age: timedelta = DEFAULT_DEADBAND_MAX_AGE
+
+    @property
+    def has_deadband(self) -> bool:
+        """Return whether this sensor filters small changes."""
+        return self.deadband is not None or self.deadband_pct is not None
 
 
 SENSOR_DESCRIPTIONS: tuple[DuepiEvoSensorDescription, ...] = (
@@ -58,6 +98,7 @@ SENSOR_DESCRIPTIONS: tuple[DuepiEvoSensorDescription, ...] = (
         entity_category=EntityCategory.DIAGNOSTIC,
         native_unit_of_measurement="rpm",
         value_fn=lambda state: state.exh_fan_speed_rpm,
+        deadband=50,
     ),
     DuepiEvoSensorDescription(
         key=ATTR_FLU_GAS_TEMP,
@@ -66,12 +107,14 @@ SENSOR_DESCRIPTIONS: tuple[DuepiEvoSensorDescription, ...] = (
         entity_category=EntityCategory.DIAGNOSTIC,
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         value_fn=lambda state: state.flu_gas_temp_c,
+        deadband=2,
     ),
     DuepiEvoSensorDescription(
         key=ATTR_PELLET_SPEED,
         name="Pellet Speed",
         entity_category=EntityCategory.DIAGNOSTIC,
         value_fn=lambda state: state.pellet_speed,
+        deadband=2,
     ),
     DuepiEvoSensorDescription(
         key=ATTR_POWER_LEVEL,
@@ -86,6 +129,7 @@ SENSOR_DESCRIPTIONS: tuple[DuepiEvoSensorDescription, ...] = (
         entity_category=EntityCategory.DIAGNOSTIC,
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         value_fn=lambda state: state.pcb_temp_c,
+        deadband=1,
     ),
     DuepiEvoSensorDescription(
         key=ATTR_TOTAL_BURN_TIME,
@@ -104,6 +148,220 @@ SENSOR_DESCRIPTIONS: tuple[DuepiEvoSensorDescription, ...] = (
 )
 
 
+@dataclass(frozen=True, kw_only=True)
+class DuepiEvoAggregateSensorDescription(SensorEntityDescription):
+    """Description of one windowed aggregate sensor."""
+
+    field: str
+
+
+AGGREGATE_SENSOR_DESCRIPTIONS: tuple[DuepiEvoAggregateSensorDescription, ...] = (
+    DuepiEvoAggregateSensorDescription(
+        key=f"{ATTR_FLU_GAS_TEMP}_window",
+        name="Flu Gas Temperature Window",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        field="flu_gas_temp_c",
+    ),
+    DuepiEvoAggregateSensorDescription(
+        key=f"{ATTR_EXH_FAN_SPEED}_window",
+        name="Exhaust Fan Speed Window",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        native_unit_of_measurement="rpm",
+        field="exh_fan_speed_rpm",
+    ),
+    DuepiEvoAggregateSensorDescription(
+        key=f"{ATTR_PELLET_SPEED}_window",
+        name="Pellet Speed Window",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        field="pellet_speed",
+    ),
+    DuepiEvoAggregateSensorDescription(
+        key="current_temp_window",
+        name="Room Temperature Window",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        field="current_temp_c",
+    ),
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class DuepiEvoTrendSensorDescription(SensorEntityDescription):
+    """Description of one rate-of-change sensor over the telemetry buffer.
+
+    ``per_seconds`` scales the slope from units per second to the unit of
+    the sensor, e.g. 3600 for a per-hour rate.
+    """
+
+    field: str
+    per_seconds: float
+
+
+TREND_SENSOR_DESCRIPTIONS: tuple[DuepiEvoTrendSensorDescription, ...] = (
+    DuepiEvoTrendSensorDescription(
+        key="current_temp_trend",
+        name="Room Temperature Trend",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=f"{UnitOfTemperature.CELSIUS}/h",
+        field="current_temp_c",
+        per_seconds=3600,
+    ),
+    DuepiEvoTrendSensorDescription(
+        key=f"{ATTR_FLU_GAS_TEMP}_ramp",
+        name="Flu Gas Ramp Rate",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        native_unit_of_measurement=f"{UnitOfTemperature.CELSIUS}/min",
+        field="flu_gas_temp_c",
+        per_seconds=60,
+    ),
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class DuepiEvoCycleSensorDescription(SensorEntityDescription):
+    """Description of one burner cycle analytics sensor."""
+
+    value_fn: Callable[[BurnerCycleStats], Any]
+
+
+def _hours(seconds: float) -> float:
+    return round(seconds / 3600, 2)
+
+
+CYCLE_SENSOR_DESCRIPTIONS: tuple[DuepiEvoCycleSensorDescription, ...] = (
+    DuepiEvoCycleSensorDescription(
+        key="ignitions",
+        name="Ignitions",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda cycles: cycles.ignitions,
+    ),
+    DuepiEvoCycleSensorDescription(
+        key="failed_ignitions",
+        name="Failed Ignitions",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda cycles: cycles.failed_ignitions,
+    ),
+    DuepiEvoCycleSensorDescription(
+        key="failed_ignition_rate",
+        name="Failed Ignition Rate",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        native_unit_of_measurement=PERCENTAGE,
+        value_fn=lambda cycles: (
+            None if cycles.failed_ignition_rate is None else round(cycles.failed_ignition_rate, 1)
+        ),
+    ),
+    DuepiEvoCycleSensorDescription(
+        key="average_ignition_duration",
+        name="Average Ignition Duration",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        value_fn=lambda cycles: (
+            None
+            if cycles.average_ignition_seconds is None
+            else round(cycles.average_ignition_seconds)
+        ),
+    ),
+    DuepiEvoCycleSensorDescription(
+        key="completed_cycles",
+        name="Completed Burn Cycles",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda cycles: cycles.completed_cycles,
+    ),
+    DuepiEvoCycleSensorDescription(
+        key="flame_on_today",
+        name="Flame On Today",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        value_fn=lambda cycles: _hours(cycles.flame_on_today_seconds),
+    ),
+    DuepiEvoCycleSensorDescription(
+        key="flame_on_previous_day",
+        name="Flame On Yesterday",
+        device_class=SensorDeviceClass.DURATION,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        value_fn=lambda cycles: _hours(cycles.flame_on_previous_day_seconds),
+    ),
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class DuepiEvoMetricSensorDescription(SensorEntityDescription):
+    """Description of one client latency or error counter sensor."""
+
+    value_fn: Callable[[DuepiEvoClientMetrics], Any]
+
+
+def _ms(value: float | None) -> float | None:
+    return None if value is None else round(value, 1)
+
+
+_LATENCY_SENSOR = {
+    "device_class": SensorDeviceClass.DURATION,
+    "state_class": SensorStateClass.MEASUREMENT,
+    "entity_category": EntityCategory.DIAGNOSTIC,
+    "entity_registry_enabled_default": False,
+    "native_unit_of_measurement": UnitOfTime.MILLISECONDS,
+}
+
+METRIC_SENSOR_DESCRIPTIONS: tuple[DuepiEvoMetricSensorDescription, ...] = (
+    DuepiEvoMetricSensorDescription(
+        key="snapshot_latency_p50",
+        name="Snapshot Latency p50",
+        value_fn=lambda metrics: _ms(metrics.snapshot.percentile(50)),
+        **_LATENCY_SENSOR,
+    ),
+    DuepiEvoMetricSensorDescription(
+        key="snapshot_latency_p95",
+        name="Snapshot Latency p95",
+        value_fn=lambda metrics: _ms(metrics.snapshot.percentile(95)),
+        **_LATENCY_SENSOR,
+    ),
+    DuepiEvoMetricSensorDescription(
+        key="snapshot_latency_p99",
+        name="Snapshot Latency p99",
+        value_fn=lambda metrics: _ms(metrics.snapshot.percentile(99)),
+        **_LATENCY_SENSOR,
+    ),
+    DuepiEvoMetricSensorDescription(
+        key="connect_time",
+        name="Connect Time",
+        value_fn=lambda metrics: _ms(metrics.connect.percentile(50)),
+        **_LATENCY_SENSOR,
+    ),
+    DuepiEvoMetricSensorDescription(
+        key="timeouts",
+        name="Timeouts",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda metrics: metrics.timeouts,
+    ),
+    DuepiEvoMetricSensorDescription(
+        key="protocol_errors",
+        name="Protocol Errors",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda metrics: metrics.protocol_errors,
+    ),
+)
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -117,20 +375,56 @@ async def async_setup_entry(
         entry.data[CONF_PORT],
     )
 
-    async_add_entities(
-        [
-            DuepiEvoSensorEntity(
+    entities: list[SensorEntity] = [
+        DuepiEvoSensorEntity(
+            coordinator=coordinator,
+            description=description,
+            name=name,
+            unique_base=unique_base,
+        )
+        for description in SENSOR_DESCRIPTIONS
+    ]
+    entities.extend(
+        DuepiEvoTrendSensorEntity(
+            coordinator=coordinator,
+            description=description,
+            name=name,
+            unique_base=unique_base,
+        )
+        for description in TREND_SENSOR_DESCRIPTIONS
+    )
+    entities.extend(
+        DuepiEvoCycleSensorEntity(
+            coordinator=coordinator,
+            description=description,
+            name=name,
+            unique_base=unique_base,
+        )
+        for description in CYCLE_SENSOR_DESCRIPTIONS
+    )
+    entities.extend(
+        DuepiEvoMetricSensorEntity(
+            coordinator=coordinator,
+            description=description,
+            name=name,
+            unique_base=unique_base,
+        )
+        for description in METRIC_SENSOR_DESCRIPTIONS
+    )
+    if coordinator.aggregation_enabled:
+        entities.extend(
+            DuepiEvoAggregateSensorEntity(
                 coordinator=coordinator,
                 description=description,
                 name=name,
                 unique_base=unique_base,
             )
-            for description in SENSOR_DESCRIPTIONS
-        ]
-    )
+            for description in AGGREGATE_SENSOR_DESCRIPTIONS
+        )
+    async_add_entities(entities)
 
 
-class DuepiEvoSensorEntity(CoordinatorEntity[DuepiEvoCoordinator], SensorEntity):
+class DuepiEvoSensorEntity(DuepiEvoEntity, SensorEntity):
     """Coordinator-backed Duepi EVO sensor."""
 
     entity_description: DuepiEvoSensorDescription
@@ -148,16 +442,259 @@ class DuepiEvoSensorEntity(CoordinatorEntity[DuepiEvoCoordinator], SensorEntity)
         self._unique_base = unique_base
         self._attr_name = f"{name} {description.name}"
         self._attr_unique_id = f"{unique_base}:sensor:{description.key}"
+        self._deadband: DeadbandFilter | None = None
+        if description.has_deadband:
+            self._deadband = DeadbandFilter(
+                absolute=description.deadband,
+                percent=description.deadband_pct,
+                max_age=description.deadband_max_age.total_seconds(),
+            )
 
-    @property
-    def native_value(self) -> Any:
-        """Return sensor value."""
+    async def async_added_to_hass(self) -> None:
+        """Also check the deadband heartbeat on polls that change nothing."""
+        await super().async_added_to_hass()
+        if self._deadband is not None:
+            self.async_on_remove(self.coordinator.async_add_sample_listener(self._handle_sample))
+
+    @callback
+    def _handle_sample(self, state: DuepiEvoState) -> None:
+        """Publish a held value once ``max_age`` expires on an unchanged poll.
+
+        The coordinator does not call its listeners for a snapshot equal to
+        the last one, so without this a value resting inside the band would
+        never be refreshed.
+        """
+        if state == self.coordinator.data:
+            self._handle_coordinator_update()
+
+    def _raw_value(self) -> Any:
+        """Return the unfiltered value of the current snapshot."""
         state = self.coordinator.data
         if state is None:
             return None
         return self.entity_description.value_fn(state)
 
     @property
-    def device_info(self):
-        """Return the parent stove device information."""
-        return build_device_info(self._unique_base, self._device_name)
+    def native_value(self) -> Any:
+        """Return sensor value."""
+        if self._deadband is not None and self._deadband.has_value:
+            return self._deadband.value
+        return self._raw_value()
+
+    def _written_value(self) -> Any:
+        """Return the value to publish, holding small changes inside the deadband."""
+        if self._deadband is None:
+            return self._raw_value()
+        return self._deadband.update(self._raw_value(), time.monotonic())
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Mark restored values as stale until the first live poll."""
+        return self._stale_attributes
+
+
+class DuepiEvoAggregateSensorEntity(DuepiEvoEntity, SensorEntity):
+    """Sensor publishing one min/mean/max/last state per aggregation window.
+
+    The state is the window mean; it only changes when a window closes, so
+    fast sampling does not turn into one recorder row per poll.
+    """
+
+    entity_description: DuepiEvoAggregateSensorDescription
+
+    def __init__(
+        self,
+        coordinator: DuepiEvoCoordinator,
+        description: DuepiEvoAggregateSensorDescription,
+        name: str,
+        unique_base: str,
+    ) -> None:
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._device_name = name
+        self._unique_base = unique_base
+        self._attr_name = f"{name} {description.name}"
+        self._attr_unique_id = f"{unique_base}:sensor:{description.key}"
+
+    @property
+    def _snapshot(self) -> AggregateSnapshot | None:
+        return self.coordinator.aggregates.get(self.entity_description.field)
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the mean of the last closed window."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+        return round(snapshot.mean, 2)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return min/max/last and the sample count of the last closed window."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+        return {
+            ATTR_WINDOW_MIN: snapshot.minimum,
+            ATTR_WINDOW_MAX: snapshot.maximum,
+            ATTR_WINDOW_LAST: snapshot.last,
+            ATTR_WINDOW_SAMPLES: snapshot.count,
+        }
+
+    def _written_value(self) -> AggregateSnapshot | None:
+        """Only a closed window changes this sensor."""
+        return self._snapshot
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to closed aggregation windows."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_aggregate_listener(self._handle_coordinator_update)
+        )
+
+
+class DuepiEvoTrendSensorEntity(DuepiEvoEntity, SensorEntity):
+    """Sensor publishing the rate of change of one field.
+
+    The rate is the least-squares slope over the coordinator's telemetry ring
+    buffer, so it is available without derivative helpers querying the
+    recorder. It is refreshed on every poll because the slope moves as old
+    samples leave the buffer even when the latest snapshot is unchanged.
+    """
+
+    entity_description: DuepiEvoTrendSensorDescription
+
+    def __init__(
+        self,
+        coordinator: DuepiEvoCoordinator,
+        description: DuepiEvoTrendSensorDescription,
+        name: str,
+        unique_base: str,
+    ) -> None:
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._device_name = name
+        self._unique_base = unique_base
+        self._attr_name = f"{name} {description.name}"
+        self._attr_unique_id = f"{unique_base}:sensor:{description.key}"
+
+    @property
+    def _series(self) -> RollingSeries:
+        return self.coordinator.telemetry.series(self.entity_description.field)
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the rate of change in the unit of this sensor."""
+        slope = self._series.slope
+        if slope is None:
+            return None
+        return round(slope * self.entity_description.per_seconds, 2)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the rolling mean, variance and sample count of the buffer."""
+        series = self._series
+        if not len(series):
+            return self._stale_attributes
+        return {
+            ATTR_MEAN: round(series.mean, 2),
+            ATTR_VARIANCE: round(series.variance, 3),
+            ATTR_WINDOW_SAMPLES: len(series),
+        }
+
+    def _written_value(self) -> float | None:
+        return self.native_value
+
+    async def async_added_to_hass(self) -> None:
+        """Also refresh on polls that did not change the snapshot."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_sample_listener(
+                lambda _state: self._handle_coordinator_update()
+            )
+        )
+
+
+class DuepiEvoCycleSensorEntity(DuepiEvoEntity, SensorEntity):
+    """Sensor reading the coordinator's burner cycle counters.
+
+    Flame time grows on every poll, so this sensor also listens to polls
+    that did not change the snapshot.
+    """
+
+    entity_description: DuepiEvoCycleSensorDescription
+
+    def __init__(
+        self,
+        coordinator: DuepiEvoCoordinator,
+        description: DuepiEvoCycleSensorDescription,
+        name: str,
+        unique_base: str,
+    ) -> None:
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._device_name = name
+        self._unique_base = unique_base
+        self._attr_name = f"{name} {description.name}"
+        self._attr_unique_id = f"{unique_base}:sensor:{description.key}"
+
+    @property
+    def native_value(self) -> Any:
+        """Return the counter value."""
+        return self.entity_description.value_fn(self.coordinator.cycles)
+
+    def _written_value(self) -> Any:
+        return self.native_value
+
+    async def async_added_to_hass(self) -> None:
+        """Also refresh on polls that did not change the snapshot."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_sample_listener(
+                lambda _state: self._handle_coordinator_update()
+            )
+        )
+
+
+class DuepiEvoMetricSensorEntity(DuepiEvoEntity, SensorEntity):
+    """Sensor reading the client's latency histograms and error counters.
+
+    It stays available and refreshes after failed polls too, since timeouts
+    and protocol errors matter most while the stove is unreachable.
+    """
+
+    entity_description: DuepiEvoMetricSensorDescription
+
+    def __init__(
+        self,
+        coordinator: DuepiEvoCoordinator,
+        description: DuepiEvoMetricSensorDescription,
+        name: str,
+        unique_base: str,
+    ) -> None:
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._device_name = name
+        self._unique_base = unique_base
+        self._attr_name = f"{name} {description.name}"
+        self._attr_unique_id = f"{unique_base}:sensor:{description.key}"
+
+    @property
+    def available(self) -> bool:
+        """Client metrics are known regardless of the last poll result."""
+        return True
+
+    @property
+    def native_value(self) -> Any:
+        """Return the metric value."""
+        return self.entity_description.value_fn(self.coordinator.client.metrics)
+
+    def _written_value(self) -> Any:
+        return self.native_value
+
+    async def async_added_to_hass(self) -> None:
+        """Refresh after every poll attempt."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_poll_listener(self._handle_coordinator_update)
+        )
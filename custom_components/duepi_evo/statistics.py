@@ -0,0 +1,248 @@
+"""Hourly long-term statistics imported straight into the recorder.
+
+Diagnostic values that are mostly looked at as history graphs do not need a
+state row per poll. When the statistics import option is enabled, samples are
+folded into hourly accumulators in memory and each closed hour is written as
+one external statistic row.
+
+The open hour and the counters are kept in a ``Store`` across reloads and
+restarts. An hour is only imported once it is closed, because a later import
+for the same start replaces the row instead of merging into it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+import logging
+from typing import Any
+
+from homeassistant.const import UnitOfTemperature, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util, slugify
+
+from .const import (
+    ATTR_BURN_TIME_SINCE_RESET,
+    ATTR_FLU_GAS_TEMP,
+    ATTR_PCB_TEMP,
+    ATTR_TOTAL_BURN_TIME,
+    DOMAIN,
+    STATISTICS_STORAGE_SAVE_DELAY,
+    STATISTICS_STORAGE_VERSION,
+)
+from .duepi_core import DuepiEvoState
+from .duepi_core.aggregation import StreamingAggregate
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class StatisticSpec:
+    """One state field exported as an external statistic."""
+
+    field: str
+    key: str
+    name: str
+    unit: str
+    cumulative: bool = False
+
+
+STATISTIC_SPECS: tuple[StatisticSpec, ...] = (
+    StatisticSpec("flu_gas_temp_c", ATTR_FLU_GAS_TEMP, "Flu Gas Temperature", UnitOfTemperature.CELSIUS),
+    StatisticSpec("pcb_temp_c", ATTR_PCB_TEMP, "PCB Temperature", UnitOfTemperature.CELSIUS),
+    StatisticSpec(
+        "total_burn_time_h",
+        ATTR_TOTAL_BURN_TIME,
+        "Total Burn Time",
+        UnitOfTime.HOURS,
+        cumulative=True,
+    ),
+    StatisticSpec(
+        "burn_time_since_reset_h",
+        ATTR_BURN_TIME_SINCE_RESET,
+        "Burn Time Since Reset",
+        UnitOfTime.HOURS,
+        cumulative=True,
+    ),
+)
+
+
+def statistic_id(unique_base: str, spec: StatisticSpec) -> str:
+    """Return the external statistic ID of one field of one stove."""
+    return f"{DOMAIN}:{slugify(f'{unique_base}_{spec.key}')}"
+
+
+def statistics_storage_key(entry_id: str) -> str:
+    """Return the storage key holding the open statistics hour of one entry."""
+    return f"{DOMAIN}.{entry_id}.statistics"
+
+
+@dataclass(slots=True)
+class _CounterState:
+    """Tracks increases of a cumulative counter across resets."""
+
+    last_value: float | None = None
+    increase: float = 0.0
+
+    def add(self, value: float) -> None:
+        if self.last_value is not None:
+            # A drop means the counter was reset; count the new value as growth.
+            self.increase += value - self.last_value if value >= self.last_value else value
+        self.last_value = value
+
+
+@dataclass(slots=True)
+class HourlyStatisticsCollector:
+    """Accumulate samples per clock hour and import each closed hour."""
+
+    hass: HomeAssistant
+    unique_base: str
+    name: str
+    specs: tuple[StatisticSpec, ...] = STATISTIC_SPECS
+    storage_key: str | None = None
+    _hour_start: datetime | None = field(default=None, init=False)
+    _accumulators: dict[str, StreamingAggregate] = field(default_factory=dict, init=False)
+    _counters: dict[str, _CounterState] = field(default_factory=dict, init=False)
+    _sums: dict[str, float] = field(default_factory=dict, init=False)
+    _store: Store[dict] | None = field(default=None, init=False)
+    # Imports run one at a time so each continues the sum the previous one stored.
+    _import_lock: asyncio.Lock = field(default_factory=asyncio.Lock, init=False)
+
+    def __post_init__(self) -> None:
+        if self.storage_key is not None:
+            self._store = Store(self.hass, STATISTICS_STORAGE_VERSION, self.storage_key)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the open hour, counters and sums for persistence."""
+        return {
+            "hour_start": self._hour_start.isoformat() if self._hour_start else None,
+            "accumulators": {key: asdict(value) for key, value in self._accumulators.items()},
+            "counters": {key: asdict(value) for key, value in self._counters.items()},
+            "sums": dict(self._sums),
+        }
+
+    async def async_restore(self) -> None:
+        """Resume the open hour and counters saved on the last unload.
+
+        Counters without saved state start from the last imported statistic,
+        so the increase across the restart is still counted.
+        """
+        data = await self._store.async_load() if self._store is not None else None
+        if data:
+            hour_start = data.get("hour_start")
+            self._hour_start = dt_util.parse_datetime(hour_start) if hour_start else None
+            self._accumulators = {
+                key: StreamingAggregate(**value) for key, value in data["accumulators"].items()
+            }
+            self._counters = {key: _CounterState(**value) for key, value in data["counters"].items()}
+            self._sums = {key: float(value) for key, value in data["sums"].items()}
+        for spec in self.specs:
+            if spec.cumulative and spec.key not in self._counters:
+                last = await self._async_last_statistic(spec)
+                if last.get("state") is not None:
+                    self._counters[spec.key] = _CounterState(last_value=float(last["state"]))
+                self._sums.setdefault(spec.key, float(last.get("sum") or 0.0))
+
+    @callback
+    def async_add_sample(self, state: DuepiEvoState, now: datetime | None = None) -> None:
+        """Fold one poll into the current hour, importing the previous hour on rollover."""
+        now = now or dt_util.utcnow()
+        hour_start = now.replace(minute=0, second=0, microsecond=0)
+        if self._hour_start is not None and hour_start != self._hour_start:
+            self.async_flush()
+        if self._hour_start is None:
+            self._hour_start = hour_start
+
+        for spec in self.specs:
+            value = getattr(state, spec.field)
+            if value is None:
+                continue
+            self._accumulators.setdefault(spec.key, StreamingAggregate()).add(value)
+            if spec.cumulative:
+                self._counters.setdefault(spec.key, _CounterState()).add(value)
+        if self._store is not None:
+            self._store.async_delay_save(self.as_dict, STATISTICS_STORAGE_SAVE_DELAY)
+
+    @callback
+    def async_flush(self) -> None:
+        """Import the hour collected so far and start a new one."""
+        if self._hour_start is None:
+            return
+        rows = self.close_hour()
+        self.hass.async_create_task(self._async_import(rows), f"{DOMAIN} statistics import")
+
+    async def async_unload(self) -> None:
+        """Save the open hour; it is imported once it closes after the reload."""
+        if self._store is not None:
+            await self._store.async_save(self.as_dict())
+
+    def close_hour(self) -> list[tuple[StatisticSpec, dict[str, Any]]]:
+        """Return one statistic row per field for the current hour and reset it."""
+        rows: list[tuple[StatisticSpec, dict[str, Any]]] = []
+        for spec in self.specs:
+            accumulator = self._accumulators.get(spec.key)
+            snapshot = accumulator.snapshot() if accumulator else None
+            if snapshot is None:
+                continue
+            row: dict[str, Any] = {"start": self._hour_start}
+            if spec.cumulative:
+                counter = self._counters[spec.key]
+                row["state"] = snapshot.last
+                row["sum"] = counter.increase
+                counter.increase = 0.0
+            else:
+                row["mean"] = snapshot.mean
+                row["min"] = snapshot.minimum
+                row["max"] = snapshot.maximum
+            rows.append((spec, row))
+        self._accumulators = {}
+        self._hour_start = None
+        return rows
+
+    def _metadata(self, spec: StatisticSpec) -> dict[str, Any]:
+        """Build external statistic metadata for one field."""
+        from homeassistant.components.recorder import models
+
+        metadata: dict[str, Any] = {
+            "has_mean": not spec.cumulative,
+            "has_sum": spec.cumulative,
+            "name": f"{self.name} {spec.name}",
+            "source": DOMAIN,
+            "statistic_id": statistic_id(self.unique_base, spec),
+            "unit_of_measurement": spec.unit,
+        }
+        if mean_type := getattr(models, "StatisticMeanType", None):
+            metadata["mean_type"] = mean_type.NONE if spec.cumulative else mean_type.ARITHMETIC
+        return metadata
+
+    async def _async_last_statistic(self, spec: StatisticSpec) -> dict[str, Any]:
+        """Return the last stored row (``state`` and ``sum``) of a counter statistic."""
+        if "recorder" not in self.hass.config.components:
+            return {}
+        from homeassistant.components.recorder import get_instance
+        from homeassistant.components.recorder.statistics import get_last_statistics
+
+        stat_id = statistic_id(self.unique_base, spec)
+        last = await get_instance(self.hass).async_add_executor_job(
+            get_last_statistics, self.hass, 1, stat_id, True, {"state", "sum"}
+        )
+        return (last.get(stat_id) or [{}])[0]
+
+    async def _async_import(self, rows: list[tuple[StatisticSpec, dict[str, Any]]]) -> None:
+        """Write closed hourly rows as external statistics."""
+        from homeassistant.components.recorder.statistics import (
+            async_add_external_statistics,
+        )
+
+        async with self._import_lock:
+            for spec, row in rows:
+                if spec.cumulative:
+                    if spec.key not in self._sums:
+                        last = await self._async_last_statistic(spec)
+                        self._sums[spec.key] = float(last.get("sum") or 0.0)
+                    self._sums[spec.key] += row["sum"]
+                    row["sum"] = self._sums[spec.key]
+                async_add_external_statistics(self.hass, self._metadata(spec), [row])
+        _LOGGER.debug("Imported %s hourly statistics rows for %s", len(rows), self.name)
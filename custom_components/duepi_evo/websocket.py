@@ -0,0 +1,96 @@
+"""Websocket commands of the Duepi EVO integration."""
+
+from __future__ import annotations
+
+from dataclasses import fields
+import time
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+from .coordinator import DuepiEvoCoordinator
+from .duepi_core import DuepiEvoState
+
+LIVE_FIELDS = tuple(field.name for field in fields(DuepiEvoState))
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    """Register the websocket commands of the integration."""
+    websocket_api.async_register_command(hass, websocket_telemetry)
+    websocket_api.async_register_command(hass, websocket_subscribe)
+
+
+def _coordinator(hass: HomeAssistant, entry_id: str) -> DuepiEvoCoordinator | None:
+    return hass.data.get(DOMAIN, {}).get(entry_id)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/telemetry",
+        vol.Required("entry_id"): str,
+    }
+)
+@callback
+def websocket_telemetry(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return the in-memory telemetry buffer of one stove.
+
+    Sample times are reported as UNIX timestamps; the rolling statistics are
+    the ones the trend sensors use, with the slope in units per second.
+    """
+    coordinator = _coordinator(hass, msg["entry_id"])
+    if coordinator is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "Config entry not loaded")
+        return
+    clock_offset = time.time() - time.monotonic()
+    connection.send_result(
+        msg["id"],
+        {
+            "capacity": coordinator.telemetry.capacity,
+            "fields": coordinator.telemetry.as_dict(clock_offset),
+        },
+    )
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/subscribe",
+        vol.Required("entry_id"): str,
+    }
+)
+@callback
+def websocket_subscribe(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Stream raw polls of one stove while the subscription is open.
+
+    The result lists the field names once; each event then carries the poll
+    time as a UNIX timestamp and the values in that order. Polls are sent
+    straight from the coordinator and never reach the state machine.
+    """
+    coordinator = _coordinator(hass, msg["entry_id"])
+    if coordinator is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "Config entry not loaded")
+        return
+
+    @callback
+    def forward_poll(state: DuepiEvoState) -> None:
+        connection.send_message(
+            websocket_api.event_message(
+                msg["id"],
+                {"t": round(time.time(), 3), "v": [getattr(state, name) for name in LIVE_FIELDS]},
+            )
+        )
+
+    connection.subscriptions[msg["id"]] = coordinator.async_add_live_listener(forward_poll)
+    connection.send_result(msg["id"], {"fields": LIVE_FIELDS})
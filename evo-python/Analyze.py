@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Summarize months of stove telemetry: ignitions, heat-up, flue gas, pellet feed, errors.
+
+Usage:
+  python3 Analyze.py living-2026-09.dprec living-2026-10.dprec shed=shed.dprec
+  python3 Analyze.py --ha-db /config/home-assistant_v2.db --stove living --stove shed
+  python3 Analyze.py --ha-db home-assistant_v2.db --stove living --from 2026-10-01 --json
+
+Recordings are written by "duepi.py --host ... record FILE"; give them as
+[name=]FILE, files with the same name (by default the file name up to the
+first "-") are one stove. With --ha-db the states Home Assistant recorded
+for climate.<stove> and its burner status, error code, flue gas and pellet
+speed sensors are read instead (copy the database or stop Home Assistant
+first). Needs NumPy.
+"""
+
+import argparse
+from datetime import datetime
+import json
+import os
+import sqlite3
+import sys
+
+import core_import  # noqa: F401
+
+try:
+    from duepi_core.analysis import format_summaries, load_history, load_recordings, summarize
+except ImportError as err:
+    sys.exit(str(err))
+
+
+def parse_time(text):
+    return None if text is None else datetime.fromisoformat(text).timestamp()
+
+
+def group_recordings(arguments):
+    stoves = {}
+    for argument in arguments:
+        name, separator, path = argument.partition("=")
+        if not separator:
+            path = argument
+            name = os.path.basename(path).split("-", 1)[0].split(".", 1)[0]
+        stoves.setdefault(name, []).append(path)
+    return stoves
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Duepi EVO telemetry analysis")
+    parser.add_argument("recordings", nargs="*", metavar="[name=]file", help="duepi recordings")
+    parser.add_argument("--ha-db", help="Home Assistant recorder database (SQLite)")
+    parser.add_argument(
+        "--stove", action="append", default=[], help="climate entity object id, with --ha-db"
+    )
+    parser.add_argument("--from", dest="start", help="first day or time (ISO)")
+    parser.add_argument("--to", dest="end", help="stop before this day or time (ISO)")
+    parser.add_argument("--json", action="store_true", help="print the summaries as JSON")
+    args = parser.parse_args()
+
+    if bool(args.ha_db) == bool(args.recordings) or bool(args.ha_db) != bool(args.stove):
+        parser.error("give recordings, or --ha-db with one or more --stove")
+    start, end = parse_time(args.start), parse_time(args.end)
+    summaries = []
+    try:
+        if args.ha_db:
+            for stove in args.stove:
+                telemetry = load_history(args.ha_db, stove, start=start, end=end)
+                summaries.append(summarize(telemetry))
+        else:
+            for name, paths in group_recordings(args.recordings).items():
+                telemetry = load_recordings(paths, name).between(start, end)
+                summaries.append(summarize(telemetry))
+    except (OSError, ValueError, sqlite3.Error) as err:
+        sys.exit(str(err))
+
+    if args.json:
+        print(json.dumps(summaries, indent=2))
+    else:
+        for line in format_summaries(summaries):
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
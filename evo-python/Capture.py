@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Inspect, search and slice binary captures written by Proxy.py --capture.
+
+Usage:
+  python3 Capture.py info stove.dpcap
+  python3 Capture.py show stove.dpcap --from 03:10 --to 03:15 [--client 2]
+  python3 Capture.py export stove.dpcap slice.dpcap --from "2026-10-19 03:10" --to 03:15
+  python3 Capture.py reindex stove.dpcap
+
+Times are local; "HH:MM[:SS]" means that time on the day the capture starts
+(or the day after, if it is earlier than the start). The sidecar index lets
+show and export start at the requested time without reading the capture
+before it. Exported slices replay with ReplayBench.py.
+"""
+
+import argparse
+from datetime import datetime, timedelta
+import sys
+
+import core_import  # noqa: F401
+from duepi_core.capture import CaptureReader, rebuild_index
+from duepi_core.trace import DIRECTION_TX
+
+
+def parse_time(text, reference):
+    if text is None:
+        return None
+    try:
+        return datetime.fromisoformat(text).timestamp()
+    except ValueError:
+        pass
+    start = datetime.fromtimestamp(reference)
+    clock = datetime.strptime(text, "%H:%M:%S" if text.count(":") == 2 else "%H:%M").time()
+    moment = datetime.combine(start.date(), clock)
+    if moment < start.replace(microsecond=0) - timedelta(seconds=1):
+        moment += timedelta(days=1)
+    return moment.timestamp()
+
+
+def format_time(timestamp):
+    return datetime.fromtimestamp(timestamp).isoformat(sep=" ", timespec="milliseconds")
+
+
+def command_info(reader):
+    time_range = reader.time_range()
+    print(f"size:    {reader.size} bytes")
+    if time_range is None:
+        print("records: 0")
+        return
+    print(f"from:    {format_time(time_range[0])}")
+    print(f"to:      {format_time(time_range[1])}")
+
+
+def command_show(reader, args, start, end):
+    for record in reader.records(start, end, client_id=args.client):
+        direction = "tx" if record.direction == DIRECTION_TX else "rx"
+        cached = " cached" if record.cached else ""
+        print(f"{format_time(record.timestamp)} #{record.client_id:<3} {direction}{cached} {record.frame!r}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Duepi EVO proxy capture tool")
+    parser.add_argument("command", choices=["info", "show", "export", "reindex"])
+    parser.add_argument("capture", help="capture file written by Proxy.py --capture")
+    parser.add_argument("output", nargs="?", help="destination of export")
+    parser.add_argument("--from", dest="start", help="first request time")
+    parser.add_argument("--to", dest="end", help="stop before this request time")
+    parser.add_argument("--client", type=int, help="only this proxy client id")
+    args = parser.parse_args()
+
+    if args.command == "reindex":
+        print(f"{rebuild_index(args.capture)} index entries")
+        return
+    with CaptureReader(args.capture) as reader:
+        if args.command == "info":
+            command_info(reader)
+            return
+        time_range = reader.time_range()
+        reference = time_range[0] if time_range else datetime.now().timestamp()
+        start = parse_time(args.start, reference)
+        end = parse_time(args.end, reference)
+        if args.command == "show":
+            command_show(reader, args, start, end)
+        elif args.output is None:
+            sys.exit("export needs an output file")
+        else:
+            count = reader.export(args.output, start, end, client_id=args.client)
+            print(f"{count} records written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,10 +4,12 @@ Virtual Duepi EVO Pellet Stove Emulator
 Emulates the TCP protocol used by the duepi_evo Home Assistant integration.
 
 Usage:
-  python3 virtual_stove.py [--host 0.0.0.0] [--port 2000] [--ui-port 8080]
+  python3 virtual_stove.py [--host 0.0.0.0] [--port 2000] [--ui-port 8080] [--pty]
 
 Then open http://localhost:8080 in your browser to control the virtual stove.
 Configure Home Assistant to connect to host: <your-ip>, port: 2000
+With --pty the stove also answers on a pseudo-terminal, like a board wired to
+a local serial port; use the printed /dev/pts/N path as host.
 """
 
 import argparse
@@ -15,9 +17,11 @@ import asyncio
 import json
 import logging
 import math
+import os
 import socketserver
 import threading
 import time
+import tty
 from http.server import BaseHTTPRequestHandler, HTTPServer
 from urllib.parse import urlparse, parse_qs
 
@@ -380,6 +384,43 @@ class ThreadedTCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
     daemon_threads = True
 
 
+# ---------------------------------------------------------------------------
+# Serial (pty) server
+# ---------------------------------------------------------------------------
+
+def serve_pty(stove: StoveState) -> str:
+    """Answer frames on a new pseudo-terminal; return the device path to open.
+
+    The simulator keeps the slave side open so clients can connect and
+    disconnect like on a real serial port.
+    """
+    master, slave = os.openpty()
+    tty.setraw(slave)
+    thread = threading.Thread(target=_pty_loop, args=(stove, master, slave), daemon=True)
+    thread.start()
+    return os.ttyname(slave)
+
+
+def _pty_loop(stove: StoveState, master: int, _slave: int) -> None:
+    buf = b""
+    while True:
+        try:
+            chunk = os.read(master, 64)
+        except OSError:
+            time.sleep(0.01)
+            continue
+        buf += chunk
+        while b"&" in buf:
+            idx = buf.index(b"&")
+            frame = buf[:idx + 1]
+            buf = buf[idx + 1:]
+            cmd = parse_frame(frame)
+            if cmd:
+                os.write(master, stove.handle_command(cmd))
+            else:
+                log.warning("Bad frame: %r", frame)
+
+
 # ---------------------------------------------------------------------------
 # HTTP UI server
 # ---------------------------------------------------------------------------
@@ -911,6 +952,7 @@ def main():
     parser.add_argument("--host",    default="0.0.0.0",  help="TCP bind host (default: 0.0.0.0)")
     parser.add_argument("--port",    default=2000, type=int, help="TCP port for stove protocol (default: 2000)")
     parser.add_argument("--ui-port", default=8080, type=int, help="HTTP port for web UI (default: 8080)")
+    parser.add_argument("--pty", action="store_true", help="also answer on a pseudo-terminal (serial)")
     args = parser.parse_args()
 
     STOVE = StoveState()
@@ -922,6 +964,9 @@ def main():
     tcp_thread.start()
     log.info("TCP stove emulator listening on %s:%d", args.host, args.port)
 
+    if args.pty:
+        log.info("Serial stove emulator on %s", serve_pty(STOVE))
+
     # HTTP UI server thread
     ui_server = HTTPServer((args.host, args.ui_port), UIHandler)
     ui_thread = threading.Thread(target=ui_server.serve_forever, daemon=True)
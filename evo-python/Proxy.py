@@ -1,41 +1,92 @@
-#Set up a simple packet sniffer for the Duepi connections
-
-#The address of the machine this code runs on
-#This will be the address/port used by the DPREmote app to connect to the stove
-SERVER_IP = '192.168.101.9'
-SERVER_PORT = 24
-#The address of the pelletstove
-STOVE_IP = '192.168.103.11'
-STOVE_PORT = 23
-
-
-import socket
-server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-server_address = (SERVER_IP, SERVER_PORT)
-server_socket.bind(server_address)
-server_socket.listen(1)
-print('Waiting for a connection...')
-client_socket, client_address = server_socket.accept()
-print('Connected by', client_address)
-server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-
-server_address = (STOVE_IP, STOVE_PORT)
-server_socket.connect(server_address)
-prtstr = ""
-while True:
-    data = client_socket.recv(16)
-    if not data:
-        break
-
-    prtstr = "tx: " + str(data)
-    server_socket.sendall(data)
-
-    data = server_socket.recv(16)
-    if not data:
-        break
-    prtstr = prtstr + ",rx: "+ str(data)
-    print(prtstr)
-    client_socket.sendall(data)
-
-client_socket.close()
-server_socket.close()
+#!/usr/bin/env python3
+"""
+Share one Duepi EVO bridge between Home Assistant, the myDPRemote app and scripts.
+
+Usage:
+  python3 Proxy.py 192.168.103.11 [--bridge-port 23] [--listen 0.0.0.0] [--port 24]
+                   [--ttl 2.0] [--show-cached] [--quiet] [--capture stove.dpcap]
+
+Point every client at this machine and port instead of the bridge. Their frames
+are queued onto one connection to the bridge; GET_* reads are answered from a
+cache for --ttl seconds, writes go straight through and drop the cached
+registers they change. Each exchange with the stove is printed as
+"tx: b'...',rx: b'...'", the format ReplayBench.py reads back. For long runs,
+--capture appends every exchange (with timestamp and client id) to an indexed
+binary capture that Capture.py can search and slice.
+"""
+
+import argparse
+import asyncio
+import logging
+
+import core_import  # noqa: F401
+from duepi_core.capture import CaptureWriter
+from duepi_core.proxy import PROXY_CACHE_TTL, DuepiEvoProxy
+
+CAPTURE_FLUSH_INTERVAL = 5.0
+
+
+def print_exchange(show_cached):
+    def on_exchange(frame, response, cached):
+        if not cached:
+            print(f"tx: {frame!r},rx: {response!r}", flush=True)
+        elif show_cached:
+            print(f"cached tx: {frame!r},rx: {response!r}", flush=True)
+
+    return on_exchange
+
+
+async def flush_periodically(capture):
+    while True:
+        await asyncio.sleep(CAPTURE_FLUSH_INTERVAL)
+        capture.flush()
+
+
+async def run(args):
+    capture = CaptureWriter(args.capture) if args.capture else None
+    proxy = DuepiEvoProxy(
+        args.bridge,
+        args.bridge_port,
+        cache_ttl=args.ttl,
+        on_exchange=None if args.quiet else print_exchange(args.show_cached),
+        capture=capture,
+    )
+    flusher = asyncio.create_task(flush_periodically(capture)) if capture else None
+    server = await proxy.async_start(args.listen, args.port)
+    port = server.sockets[0].getsockname()[1]
+    print(f"Proxying {args.listen}:{port} -> {args.bridge}:{args.bridge_port}", flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        if flusher is not None:
+            flusher.cancel()
+        await proxy.async_close()
+        if capture is not None:
+            capture.close()
+        print(proxy.stats.as_dict())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Duepi EVO caching multi-client proxy")
+    parser.add_argument("bridge", help="bridge address")
+    parser.add_argument("--bridge-port", type=int, default=23, help="bridge port (default 23)")
+    parser.add_argument("--listen", default="0.0.0.0", help="address to listen on")
+    parser.add_argument("--port", type=int, default=24, help="port to listen on (default 24)")
+    parser.add_argument(
+        "--ttl", type=float, default=PROXY_CACHE_TTL, help="seconds a GET answer is reused"
+    )
+    parser.add_argument("--show-cached", action="store_true", help="also print cached answers")
+    parser.add_argument("--quiet", action="store_true", help="do not print exchanges")
+    parser.add_argument("--capture", help="append exchanges to this binary capture file")
+    parser.add_argument("--debug", action="store_true", help="log client and upstream events")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.WARNING)
+    try:
+        asyncio.run(run(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
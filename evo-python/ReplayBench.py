@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Replay a recorded wire trace through DuepiEvoClient and time every snapshot.
+
+Usage:
+  python3 ReplayBench.py diagnostics.json [--realtime] [--speed 10] [--repeat 5]
+
+The trace is the "wire_trace" of a Home Assistant diagnostics download or the
+output of Proxy.py. Without --realtime responses are served as fast as
+possible, which measures the client's own parsing overhead.
+"""
+
+import argparse
+import statistics
+
+import core_import  # noqa: F401
+from duepi_core import DuepiEvoClient, DuepiEvoClientError
+from duepi_core.replay import ReplayTransport, load_trace, replay_polls
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a Duepi EVO wire trace")
+    parser.add_argument("trace", help="diagnostics JSON or Proxy.py log")
+    parser.add_argument("--realtime", action="store_true", help="keep recorded response delays")
+    parser.add_argument("--speed", type=float, default=1.0, help="speed-up factor in realtime mode")
+    parser.add_argument("--repeat", type=int, default=1, help="replay the trace this many times")
+    parser.add_argument("--init-command", action="store_true", help="client sends the init command")
+    args = parser.parse_args()
+
+    transport = ReplayTransport(load_trace(args.trace), realtime=args.realtime, speed=args.speed)
+    client = DuepiEvoClient(
+        host="replay",
+        port=0,
+        min_temp=16.0,
+        max_temp=30.0,
+        no_feedback=16.0,
+        auto_reset=False,
+        init_command=args.init_command,
+        transport=transport,
+    )
+
+    durations = []
+    errors = 0
+    for _ in range(args.repeat):
+        transport.rewind()
+        for duration_ms, result in replay_polls(client, transport):
+            if isinstance(result, DuepiEvoClientError):
+                errors += 1
+                print("error:", result)
+                continue
+            durations.append(duration_ms)
+            print(f"{duration_ms:8.2f} ms  {result.burner_status:18} {result.current_temp_c} C")
+
+    if durations:
+        print(
+            f"snapshots={len(durations)} errors={errors} "
+            f"mean={statistics.mean(durations):.2f} ms "
+            f"median={statistics.median(durations):.2f} ms max={max(durations):.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
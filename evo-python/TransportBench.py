@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Compare snapshot latency over TCP, a pty-backed serial line and a loopback.
+
+Usage:
+  python3 TransportBench.py [--polls 50] [--pipeline]
+
+Starts EVO-sim in-process, once behind a TCP server on 127.0.0.1 and once on
+a pseudo-terminal opened as a serial device (115200 8N1), and times
+fetch_state over each transport. The loopback transport answers from the same
+simulator without any I/O and shows the client's own overhead. With
+--pipeline every transport is also measured with pipelined snapshots.
+"""
+
+import argparse
+import importlib.util
+import logging
+import os
+import statistics
+import threading
+import time
+
+import core_import  # noqa: F401
+from duepi_core import DuepiEvoClient
+from duepi_core.transport import LoopbackTransport, SerialTransport, TcpTransport
+
+SIM_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "EVO-sim.py")
+
+
+def load_simulator():
+    spec = importlib.util.spec_from_file_location("evo_sim", SIM_PATH)
+    sim = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(sim)
+    logging.getLogger("virtual_stove").setLevel(logging.WARNING)
+    return sim
+
+
+def percentile(values, percent):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * percent / 100), len(ordered) - 1)]
+
+
+def bench(transport, polls, pipeline):
+    client = DuepiEvoClient(
+        host="bench",
+        port=0,
+        min_temp=16.0,
+        max_temp=30.0,
+        no_feedback=16.0,
+        auto_reset=False,
+        init_command=False,
+        transport=transport,
+        pipeline=pipeline,
+    )
+    client.fetch_state()  # warm-up
+    durations = []
+    for _ in range(polls):
+        started = time.perf_counter()
+        client.fetch_state()
+        durations.append((time.perf_counter() - started) * 1000)
+    return durations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Duepi EVO transport latency comparison")
+    parser.add_argument("--polls", type=int, default=50, help="snapshots per transport")
+    parser.add_argument("--pipeline", action="store_true", help="also measure pipelined snapshots")
+    args = parser.parse_args()
+
+    sim = load_simulator()
+    stove = sim.StoveState()
+    stove.status = "on"
+    stove.power_level = 3
+    sim.STOVE = stove
+
+    server = sim.ThreadedTCPServer(("127.0.0.1", 0), sim.StoveHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    device = sim.serve_pty(stove)
+
+    transports = [
+        ("tcp", TcpTransport(*server.server_address)),
+        ("serial-pty", SerialTransport(device)),
+        ("loopback", LoopbackTransport(lambda frame: stove.handle_command(sim.parse_frame(frame)))),
+    ]
+    modes = [False, True] if args.pipeline else [False]
+
+    print(f"{'transport':12} {'pipeline':8} {'mean':>9} {'median':>9} {'p95':>9} {'max':>9}")
+    for name, transport in transports:
+        for pipeline in modes:
+            durations = bench(transport, args.polls, pipeline)
+            print(
+                f"{name:12} {str(pipeline):8} "
+                f"{statistics.mean(durations):7.3f}ms {statistics.median(durations):7.3f}ms "
+                f"{percentile(durations, 95):7.3f}ms {max(durations):7.3f}ms"
+            )
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+"""Make the integration's Home-Assistant-free protocol core importable.
+
+The ``duepi_core`` package lives inside the custom component; scripts in this
+directory import this module first and then ``import duepi_core``.
+"""
+
+import os
+import sys
+
+CORE_PARENT = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "custom_components", "duepi_evo"
+)
+
+if CORE_PARENT not in sys.path:
+    sys.path.insert(0, CORE_PARENT)
@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""
+Query and control one or many Duepi EVO stoves from the command line.
+
+Usage:
+  python3 duepi.py --host 192.168.103.11 status temperature error
+  python3 duepi.py --host 192.168.103.11 set-setpoint 21 set-power 3 power
+  python3 duepi.py --host 192.168.103.11 send D9000
+  python3 duepi.py --inventory stoves.txt --json state
+
+All commands of one call share a single connection per stove; an inventory
+('[name] host[:port]' per line) is queried in parallel. Replaces Status.py,
+GetTemperature.py, SetPoint.py, SetPowerLevel_x.py, Error.py and SendX.py.
+"""
+
+import sys
+
+import core_import  # noqa: F401
+from duepi_core.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -29,6 +29,11 @@ def _install_homeassistant_stubs() -> None:
         OFF = "off"
         HEAT = "heat"
 
+    class HVACAction(str, enum.Enum):
+        OFF = "off"
+        HEATING = "heating"
+        IDLE = "idle"
+
     class Platform(str, enum.Enum):
         CLIMATE = "climate"
         SENSOR = "sensor"
@@ -84,6 +89,7 @@ def _install_homeassistant_stubs() -> None:
         """Minimal update failure stub."""
 
     ha_climate_mod.HVACMode = HVACMode
+    ha_climate_mod.HVACAction = HVACAction
     ha_binary_sensor_mod.BinarySensorEntity = BinarySensorEntity
     ha_binary_sensor_mod.BinarySensorEntityDescription = BinarySensorEntityDescription
     ha_sensor_mod.SensorDeviceClass = SensorDeviceClass
@@ -0,0 +1,175 @@
+"""Tests for the vectorized offline telemetry analysis."""
+
+from __future__ import annotations
+
+import json
+import math
+import sqlite3
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from custom_components.duepi_evo.duepi_core.analysis import (  # noqa: E402
+    STATUS_NAMES,
+    format_summaries,
+    load_history,
+    load_recordings,
+    status_codes,
+    summarize,
+)
+from custom_components.duepi_evo.duepi_core.const import (  # noqa: E402
+    STATE_COOL,
+    STATE_OFF,
+    STATE_ON,
+    STATE_START,
+)
+from custom_components.duepi_evo.duepi_core.protocol import decode_status  # noqa: E402
+from custom_components.duepi_evo.duepi_core.recording import RecordingWriter  # noqa: E402
+
+START = 1_790_000_000.0
+
+
+def _day_rows(offset: float) -> list[list[float]]:
+    """Every 10 s: off, a 300 s ignition, an hour of flame, cooling, a failed ignition."""
+    rows = []
+    for second in range(0, 7200, 10):
+        error = 0
+        if second < 600:
+            flags, room = STATE_OFF, 19.0
+        elif second < 900:
+            flags, room = STATE_START, 19.0
+        elif second < 4500:
+            # Reaches the 21 degree setpoint 30 minutes after ignition start.
+            flags, room = STATE_ON | 0x20, min(21.5, 19.0 + (second - 900) / 750)
+        elif second < 5100:
+            flags, room = STATE_COOL, 21.0
+        elif second < 6000:
+            flags, room = STATE_OFF, 20.0
+        elif second < 6300:
+            flags, room = STATE_START, 20.0
+        else:
+            flags, room, error = STATE_OFF, 20.0, 1
+        flame = STATE_ON & flags
+        # Flue gas peaks at 220 before settling at 180.
+        flue = (220.0 if 1500 <= second < 1600 else 180.0) if flame else 30.0
+        # The auger pauses for the last quarter of every 40 seconds.
+        pellet = (0.0 if second % 40 >= 30 else 20.0) if flame else 0.0
+        rows.append(
+            [offset + second, flags, 3, room, 21.0, flue, 500.0, pellet, error, math.nan, 40.0]
+        )
+    return rows
+
+
+def test_status_codes_follow_decode_status() -> None:
+    """Vectorized decoding gives the same names as the per-poll decoder."""
+    flags = [0, STATE_OFF, STATE_START, STATE_ON | STATE_OFF, STATE_COOL, 0x04000000, 0x10000000]
+    assert [STATUS_NAMES[code] for code in status_codes(np.array(flags))] == [
+        decode_status(flag) for flag in flags
+    ]
+
+
+def test_recordings_summarize_cycles_heatup_flue_pellets_and_errors(tmp_path) -> None:
+    """Two monthly files of one stove are merged; the gap between them is a hole."""
+    paths = [tmp_path / "living-09.dprec", tmp_path / "living-10.dprec"]
+    for index, path in enumerate(paths):
+        with RecordingWriter(path, chunk_rows=100) as writer:
+            for row in _day_rows(START + index * 86400):
+                writer.append(row)
+
+    telemetry = load_recordings(list(reversed(paths)), name="living")
+    summary = summarize(telemetry)
+
+    assert summary["samples"] == 1440
+    assert summary["ignitions"] == 4
+    assert summary["failed_ignitions"] == 2
+    assert summary["failed_ignition_rate"] == 50.0
+    assert summary["ignition_median_s"] == 300.0
+    assert summary["cycles"] == summary["completed_cycles"] == 2
+    assert summary["flame_on_hours"] == 2.0
+    assert summary["cold_starts"] == summary["setpoint_reached"] == 2
+    assert summary["to_setpoint_median_min"] == 30.0
+    assert summary["flue_peak_mean"] == 220.0
+    assert summary["flue_overshoot_mean"] == 40.0
+    assert summary["pellet_duty"] == 75.0
+    assert summary["pellet_speed_mean"] == 15.0
+    assert summary["errors"] == {"Ignition failure": 2}
+
+    first_day = summarize(telemetry.between(end=START + 86400))
+    assert first_day["ignitions"] == 2
+    lines = format_summaries([summary, first_day])
+    assert lines[0].split()[:3] == ["Stove", "Days", "Flame"]
+    assert lines[-1] == "living errors: Ignition failure x1"
+
+
+def _history_database(path) -> None:
+    connection = sqlite3.connect(path)
+    connection.executescript(
+        "CREATE TABLE states_meta (metadata_id INTEGER PRIMARY KEY, entity_id TEXT);"
+        "CREATE TABLE state_attributes (attributes_id INTEGER PRIMARY KEY, shared_attrs TEXT);"
+        "CREATE TABLE states (state_id INTEGER PRIMARY KEY, state TEXT, last_updated_ts FLOAT,"
+        " metadata_id INTEGER, attributes_id INTEGER);"
+    )
+    history = {
+        "sensor.living_burner_status": [
+            (0, "Off"), (100, "Ignition starting"), (400, "Flame On"), (2000, "unavailable"),
+            (2100, "Flame On"), (4000, "Cooling down"), (4600, "Off"),
+        ],
+        "sensor.living_error_code": [(0, "All OK"), (2000, "unavailable"), (2100, "All OK")],
+        "sensor.living_flu_gas_temperature": [
+            (0, "30"), (600, "160"), (900, "230"), (1200, "190"),
+            (2000, "unavailable"), (2100, "190"),
+        ],
+        "sensor.living_pellet_speed": [(0, "0"), (400, "25"), (4000, "0")],
+        "climate.living": [
+            (0, {"current_temperature": 19.5, "temperature": 21}),
+            (1300, {"current_temperature": 21.0, "temperature": 21}),
+        ],
+    }
+    for metadata_id, (entity_id, changes) in enumerate(history.items(), 1):
+        connection.execute("INSERT INTO states_meta VALUES (?, ?)", (metadata_id, entity_id))
+        for stamp, state in changes:
+            attributes_id = None
+            if isinstance(state, dict):
+                cursor = connection.execute(
+                    "INSERT INTO state_attributes (shared_attrs) VALUES (?)", (json.dumps(state),)
+                )
+                attributes_id, state = cursor.lastrowid, "heat"
+            connection.execute(
+                "INSERT INTO states (state, last_updated_ts, metadata_id, attributes_id)"
+                " VALUES (?, ?, ?, ?)",
+                (state, START + stamp, metadata_id, attributes_id),
+            )
+    connection.commit()
+    connection.close()
+
+
+def test_home_assistant_history_is_read_in_chunks_and_held_between_changes(tmp_path) -> None:
+    """Changes of every entity are aligned; unavailable breaks the flame run."""
+    database = tmp_path / "home-assistant_v2.db"
+    _history_database(database)
+
+    telemetry = load_history(database, "living", chunk_rows=2)
+    assert telemetry.max_gap is None
+    assert len(telemetry) == len(np.unique(telemetry.timestamp)) == 11
+    index = int(np.searchsorted(telemetry.timestamp, START + 1300))
+    assert telemetry.room_temp[index] == 21.0
+    assert telemetry.pellet_speed[index] == 25.0
+    assert STATUS_NAMES[telemetry.status[index]] == "Flame On"
+
+    summary = summarize(telemetry)
+    assert summary["ignitions"] == 1
+    assert summary["failed_ignitions"] == 0
+    assert summary["ignition_median_s"] == 300.0
+    # Split by the unavailable period: only the first run reaches the setpoint.
+    assert summary["cycles"] == 2
+    assert summary["completed_cycles"] == 1
+    assert summary["setpoint_reached"] == 1
+    assert summary["to_setpoint_median_min"] == 20.0
+    assert summary["flame_on_hours"] == round((1600 + 1900) / 3600, 1)
+    assert summary["flue_overshoot_mean"] == 20.0
+    assert summary["pellet_duty"] == 100.0
+    assert summary["errors"] == {}
+
+    with pytest.raises(ValueError):
+        load_history(database, "shed")
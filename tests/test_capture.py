@@ -0,0 +1,97 @@
+"""Tests for the indexed binary proxy capture."""
+
+from __future__ import annotations
+
+import pytest
+
+from custom_components.duepi_evo.duepi_core.capture import (
+    CaptureFormatError,
+    CaptureReader,
+    CaptureWriter,
+    index_path,
+    rebuild_index,
+)
+from custom_components.duepi_evo.duepi_core.replay import ReplayTransport, load_trace
+from custom_components.duepi_evo.duepi_core.trace import DIRECTION_RX, DIRECTION_TX
+
+STATUS = b"\x1bRD90005F&"
+TEMPERATURE = b"\x1bRD100057&"
+
+
+def _write_hour(path, start: float = 1_000_000.0) -> None:
+    """One request pair every 10 s for an hour, two clients alternating."""
+    now = [start]
+    with CaptureWriter(path, index_interval=60.0, clock=lambda: now[0]) as writer:
+        for step in range(360):
+            now[0] = start + step * 10
+            writer.write_exchange(
+                step % 2 + 1,
+                STATUS,
+                b"\x1b02000000&" if step != 200 else b"",
+                cached=step % 3 == 0,
+            )
+
+
+def test_records_round_trip_and_seek_uses_the_index(tmp_path) -> None:
+    """A time window is read back exactly, starting from an indexed offset."""
+    path = tmp_path / "stove.dpcap"
+    _write_hour(path)
+
+    with CaptureReader(path) as reader:
+        assert len(list(reader)) == 720
+        assert reader.time_range()[0] == 1_000_000.0
+        start = 1_000_000.0 + 1995
+        assert reader.seek(start) > reader.seek(1_000_000.0)
+        window = list(reader.records(start, start + 60))
+
+    assert [record.direction for record in window] == [DIRECTION_TX, DIRECTION_RX] * 6
+    assert window[0].timestamp == 1_000_000.0 + 2000
+    assert window[1].frame == b""  # the stove stayed silent at step 200
+    assert all(record.client_id in (1, 2) for record in window)
+    assert (tmp_path / "stove.dpcap.idx").stat().st_size == 60 * 16
+
+
+def test_reopening_trims_a_torn_record_and_keeps_appending(tmp_path) -> None:
+    """A record cut short by a crash is dropped before new records are added."""
+    path = tmp_path / "stove.dpcap"
+    _write_hour(path)
+    with open(path, "ab") as file:
+        file.write(b"\x00" * 7)
+
+    with CaptureWriter(path, clock=lambda: 2_000_000.0) as writer:
+        writer.write_exchange(9, TEMPERATURE, b"\x1b00D70000&")
+
+    with CaptureReader(path) as reader:
+        records = list(reader)
+        assert len(records) == 722
+        assert [record.client_id for record in reader.records(1_999_999.0)] == [9, 9]
+
+
+def test_exported_slice_replays_without_cached_answers(tmp_path) -> None:
+    """Exported slices load as replay traces; cache hits never reached the stove."""
+    path = tmp_path / "stove.dpcap"
+    _write_hour(path)
+
+    with CaptureReader(path) as reader:
+        assert reader.export(tmp_path / "slice.dpcap", 1_000_000.0, 1_000_060.0, client_id=2) == 6
+
+    trace = load_trace(tmp_path / "slice.dpcap")
+    # Steps 1, 3 and 5 belong to client 2; step 3 was a cache hit.
+    assert [entry[0] for entry in trace] == [1_000_010.0, 1_000_010.0, 1_000_050.0, 1_000_050.0]
+    assert ReplayTransport(trace).match(STATUS)[1][0][1] == b"\x1b02000000&"
+
+
+def test_index_is_rebuilt_and_foreign_files_are_refused(tmp_path) -> None:
+    """A lost index is recreated from the records; other files are rejected."""
+    path = tmp_path / "stove.dpcap"
+    _write_hour(path)
+    expected = index_path(path).read_bytes()
+    index_path(path).unlink()
+
+    assert rebuild_index(path) == 60
+    assert index_path(path).read_bytes() == expected
+
+    other = tmp_path / "trace.json"
+    other.write_text("{}")
+    with pytest.raises(CaptureFormatError):
+        CaptureReader(other)
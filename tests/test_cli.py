@@ -0,0 +1,130 @@
+"""Tests for the ``duepi`` command line interface."""
+
+from __future__ import annotations
+
+import json
+import socketserver
+import threading
+import time
+
+import pytest
+
+from custom_components.duepi_evo.duepi_core import DuepiEvoClient, LoopbackTransport
+from custom_components.duepi_evo.duepi_core.cli import (
+    Stove,
+    main,
+    parse_batch,
+    parse_inventory,
+    run_inventory,
+)
+
+REGISTERS = {
+    b"D9000": b"\x1b02000000&",  # status => Flame On
+    b"D3000": b"\x1b00030000&",  # power level => Medium
+    b"D1000": b"\x1b00D70000&",  # ambient => 21.5 C
+    b"D4000": b"\x1b00140000&",  # pellet speed => 20
+    b"D0000": b"\x1b00C80000&",  # flugas => 200 C
+    b"EF000": b"\x1b00320000&",  # exh fan => 500 rpm
+    b"DA000": b"\x1b00050000&",  # error => Out of pellets
+    b"C6000": b"\x1b00170000&",  # setpoint => 23
+    b"DF000": b"\x1b001E0000&",  # PCB => 30 C
+    b"ED000": b"\x1b00100000&",  # total burn time
+    b"EE000": b"\x1b00020000&",  # burn time since reset
+    b"C0000": b"\x1b01000000&",  # pressure switch
+}
+ACK = b"\x1b00000020&"
+
+
+def _respond(frame: bytes) -> bytes | None:
+    command = frame[2:7]
+    if command.startswith(b"F"):
+        return ACK
+    return REGISTERS.get(command)
+
+
+def test_batch_and_inventory_parsing() -> None:
+    """Arguments bind to the command before them; inventories allow comments."""
+    assert parse_batch(["status", "set-setpoint", "21", "send", "D9000"]) == [
+        ("status", None),
+        ("set-setpoint", "21"),
+        ("send", "D9000"),
+    ]
+    with pytest.raises(ValueError):
+        parse_batch(["set-power"])
+    with pytest.raises(ValueError):
+        parse_batch(["temprature"])
+
+    assert parse_inventory("# fleet\nliving 192.168.1.20:2000\n192.168.1.21  # shed\n") == [
+        Stove("living", "192.168.1.20", 2000),
+        Stove("192.168.1.21", "192.168.1.21", 23),
+    ]
+
+
+def test_inventory_runs_stoves_in_parallel_over_one_connection_each() -> None:
+    """Each stove's batch shares a connection; slow stoves overlap."""
+    transports: dict[str, LoopbackTransport] = {}
+
+    def slow(frame: bytes) -> bytes | None:
+        time.sleep(0.02)
+        return _respond(frame)
+
+    def factory(stove: Stove) -> DuepiEvoClient:
+        transports[stove.name] = LoopbackTransport(_respond if stove.name != "slow" else slow)
+        return DuepiEvoClient(
+            stove.host,
+            stove.port,
+            min_temp=0,
+            max_temp=100,
+            no_feedback=16,
+            auto_reset=False,
+            init_command=False,
+            transport=transports[stove.name],
+            persistent=True,
+        )
+
+    stoves = [Stove(name, "127.0.0.1") for name in ("a", "b", "slow")]
+    batch = parse_batch(["status", "temperature", "set-power", "low", "error", "setpoint"])
+    started = time.perf_counter()
+    results = run_inventory(stoves, batch, client_factory=factory)
+    elapsed = time.perf_counter() - started
+
+    assert [result["name"] for result in results] == ["a", "b", "slow"]
+    values = [item["value"] for item in results[2]["results"]]
+    assert values == ["Flame On", 21.5, "OK", "Out of pellets", 23]
+    assert all(transport.connections == 1 for transport in transports.values())
+    assert elapsed < 0.2
+
+
+class _StoveHandler(socketserver.BaseRequestHandler):
+    def handle(self) -> None:
+        buffer = b""
+        while chunk := self.request.recv(64):
+            buffer += chunk
+            while b"&" in buffer:
+                frame, _, buffer = buffer.partition(b"&")
+                if (response := _respond(frame + b"&")) is not None:
+                    self.request.sendall(response)
+
+
+@pytest.mark.usefixtures("socket_enabled")
+def test_main_prints_json_and_fails_on_errors(capsys) -> None:
+    """JSON output carries every result; a silent register ends the batch with exit 1."""
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _StoveHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    address = "127.0.0.1:%d" % server.server_address[1]
+    try:
+        assert main(["--host", address, "--json", "status", "send", "C6000", "state"]) == 0
+        result = json.loads(capsys.readouterr().out)
+        assert main(["--host", address, "--timeout", "0.1", "power", "send", "D8000", "status"]) == 1
+        text = capsys.readouterr().out
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert result["results"][0]["value"] == "Flame On"
+    assert result["results"][1]["value"] == "\x1b00170000&"
+    assert result["results"][2]["value"]["power_level"] == "Medium"
+    assert result["connects"] == 1
+    assert text.splitlines()[0] == "power: Medium"
+    assert text.splitlines()[1].startswith("error: send: Time-out")
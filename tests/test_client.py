@@ -8,11 +8,13 @@ import pytest
 
 from homeassistant.components.climate import HVACMode
 
-from custom_components.duepi_evo import client as client_module
+from custom_components.duepi_evo.duepi_core import transport as transport_module
 from custom_components.duepi_evo.client import (
     DuepiEvoClient,
     DuepiEvoProtocolError,
 )
+from custom_components.duepi_evo.duepi_core import DuepiEvoCapabilities
+from custom_components.duepi_evo.duepi_core.probe import UNSUPPORTED_AFTER_TIMEOUTS
 
 
 class FakeSocket:
@@ -80,7 +82,7 @@ def test_set_temperature_sends_init_command_when_enabled(monkeypatch: pytest.Mon
         return sock
 
     monkeypatch.setattr("socket.socket", fake_socket)
-    monkeypatch.setattr(client_module.select, "select", lambda _read, _write, _error, _timeout: ([], [], []))
+    monkeypatch.setattr(transport_module.select, "select", lambda _read, _write, _error, _timeout: ([], [], []))
 
     client = _client(init_command=True)
     client.set_temperature(23)
@@ -161,6 +163,25 @@ def test_fetch_state_parses_protocol_frames(monkeypatch: pytest.MonkeyPatch) ->
     assert b"RC0000" in sent_frames
 
 
+def test_fetch_state_records_latency_histograms(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Each poll records connect, per-command and snapshot latencies."""
+    monkeypatch.setattr(
+        "socket.socket",
+        lambda *_args, **_kwargs: FakeSocket(["\x1b00000020&"] + ["\x1b00000000&"] * 11),
+    )
+    client = _client(init_command=False)
+
+    client.fetch_state()
+    client.fetch_state()
+
+    metrics = client.metrics
+    assert metrics.connect.count == 2
+    assert metrics.snapshot.count == 2
+    assert metrics.command("D9000").count == 2
+    assert set(metrics.commands) == {"D9", "D1", "D4", "D0", "EF", "DA", "C6", "DF", "ED", "EE", "C0"}
+    assert metrics.timeouts == 0
+
+
 def test_fetch_state_keeps_snapshot_when_pressure_switch_payload_is_unknown(
     monkeypatch: pytest.MonkeyPatch,
     caplog: pytest.LogCaptureFixture,
@@ -223,5 +244,98 @@ def test_fetch_state_raises_protocol_error_on_malformed_frame(monkeypatch: pytes
 
     monkeypatch.setattr("socket.socket", fake_socket)
 
+    client = _client(init_command=False)
     with pytest.raises(DuepiEvoProtocolError):
-        _client(init_command=False).fetch_state()
+        client.fetch_state()
+    assert client.metrics.protocol_errors == 1
+    assert client.metrics.snapshot.count == 0
+
+
+def test_probe_reads_status_and_builds_capability_profile(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Probe should only need the status frame and flag unanswered optional registers."""
+    responses = [
+        "\x1b00000020&",  # status => Off
+        "\x1b002D0000&",  # pcb temp answered
+        "bad",  # total burn time not supported
+        "\x1b00002A00&",  # burn time since reset answered
+        "\x1b01000000&",  # pressure switch answered
+    ]
+    created: list[FakeSocket] = []
+
+    def fake_socket(*_args: Any, **_kwargs: Any) -> FakeSocket:
+        sock = FakeSocket(responses)
+        created.append(sock)
+        return sock
+
+    monkeypatch.setattr("socket.socket", fake_socket)
+
+    result = _client().probe(optional_timeout=0.1)
+
+    assert result.burner_status == "Off"
+    assert result.connect_latency_ms >= 0
+    assert result.status_latency_ms >= 0
+    assert result.capabilities == DuepiEvoCapabilities(total_burn_time=False)
+    assert created[0].timeout == 0.1
+    assert b"RD9000" in created[0].sent[0]
+
+
+def test_probe_retries_an_optional_register_after_a_dropped_frame(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Only repeated timeouts mark an optional register unsupported."""
+    responses: list[str | None] = [
+        "\x1b00000020&",  # status => Off
+        None,  # pcb temp frame dropped once
+        "\x1b002D0000&",  # pcb temp answered on retry
+        *[None] * UNSUPPORTED_AFTER_TIMEOUTS,  # total burn time never answers
+        "\x1b00002A00&",
+        "\x1b01000000&",
+    ]
+
+    class DroppingSocket(FakeSocket):
+        def recv(self, size: int) -> bytes:
+            if self.responses and self.responses[0] is None:
+                self.responses.pop(0)
+                raise TimeoutError
+            return super().recv(size)
+
+    monkeypatch.setattr("socket.socket", lambda *_args, **_kwargs: DroppingSocket(responses))
+
+    result = _client().probe(optional_timeout=0.1)
+
+    assert result.capabilities == DuepiEvoCapabilities(total_burn_time=False)
+
+
+def test_fetch_state_skips_registers_missing_from_capability_profile(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Unsupported optional registers should not cost a frame or a timeout."""
+    responses = [
+        "\x1b00000020&",  # status => Off, so no power level read
+        "\x1b00D70000&",
+        "\x1b00000000&",
+        "\x1b00500000&",
+        "\x1b00000000&",
+        "\x1b00000000&",
+        "\x1b00140000&",
+    ]
+    created: list[FakeSocket] = []
+
+    def fake_socket(*_args: Any, **_kwargs: Any) -> FakeSocket:
+        sock = FakeSocket(responses)
+        created.append(sock)
+        return sock
+
+    monkeypatch.setattr("socket.socket", fake_socket)
+    client = _client()
+    client.capabilities = DuepiEvoCapabilities(
+        pcb_temp=False,
+        total_burn_time=False,
+        burn_time_since_reset=False,
+        pressure_switch=False,
+    )
+
+    state = client.fetch_state()
+
+    assert state.burner_status == "Off"
+    assert state.pcb_temp_c is None
+    assert state.pressure_switch_active is None
+    assert len(created[0].sent) == 7
@@ -17,7 +17,11 @@ pytestmark = [pytest.mark.usefixtures("enable_custom_integrations")]
 def _entity_with_state(state: SimpleNamespace | None) -> DuepiEvoClimateEntity:
     """Create a minimal climate entity bound to a specific coordinator state."""
     entity = DuepiEvoClimateEntity.__new__(DuepiEvoClimateEntity)
-    entity.coordinator = SimpleNamespace(data=state)
+    entity.coordinator = SimpleNamespace(data=state, data_version=0, stale=False)
+    entity._legacy_attributes = True
+    entity._legacy_attr_warning_logged = False
+    entity._cache = {}
+    entity._cache_version = None
     return entity
 
 
@@ -75,3 +79,28 @@ def test_hvac_action_mapping(
     entity = _entity_with_state(state)
 
     assert entity.hvac_action == expected_action
+
+
+def test_derived_properties_are_memoized_per_data_version() -> None:
+    """Derived properties should be recomputed only when the snapshot changes."""
+    state = SimpleNamespace(burner_status="Flame On", heating=True, hvac_mode=HVACMode.HEAT)
+    entity = _entity_with_state(state)
+
+    assert entity.hvac_action == HVACAction.HEATING
+    state.heating = False
+    assert entity.hvac_action == HVACAction.HEATING
+
+    entity.coordinator.data_version += 1
+    assert entity.hvac_action == HVACAction.IDLE
+
+
+def test_legacy_attributes_opt_out() -> None:
+    """Disabling legacy attributes should leave only the stale marker."""
+    state = SimpleNamespace(burner_status="Flame On", heating=True, hvac_mode=HVACMode.HEAT)
+    entity = _entity_with_state(state)
+    entity._legacy_attributes = False
+
+    assert entity.extra_state_attributes is None
+
+    entity.coordinator.stale = True
+    assert entity.extra_state_attributes == {"stale": True}
@@ -11,15 +11,19 @@ from homeassistant.const import CONF_HOST, CONF_NAME, CONF_PORT, CONF_SCAN_INTER
 
 from custom_components.duepi_evo.const import (
     CONF_AUTO_RESET,
+    CONF_CAPABILITIES,
+    CONF_ENDPOINTS,
     CONF_INIT_COMMAND,
     CONF_MAX_TEMP,
     CONF_MIN_TEMP,
     CONF_NOFEEDBACK,
+    CONF_PROBE_LATENCY,
     CONF_UNIQUE_ID,
     DEFAULT_INIT_COMMAND,
     DEFAULT_UNIQUE_ID,
     DOMAIN,
 )
+from custom_components.duepi_evo.duepi_core import DuepiEvoCapabilities, DuepiEvoProbeResult
 
 pytestmark = [
     pytest.mark.asyncio,
@@ -27,21 +31,40 @@ pytestmark = [
 ]
 
 
+def _probe_result(**capabilities: bool) -> DuepiEvoProbeResult:
+    """Build a successful probe result with an optional capability override."""
+    return DuepiEvoProbeResult(
+        burner_status="Off",
+        connect_latency_ms=1.0,
+        status_latency_ms=2.0,
+        capabilities=DuepiEvoCapabilities(**capabilities),
+    )
+
+
 def _schema_fields(schema) -> set[str]:
     """Return field names from a voluptuous schema."""
     return {getattr(key, "schema", key) for key in schema.schema}
 
 
+async def _start_manual_flow(hass):
+    """Start the user flow and choose manual host entry from its menu."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN,
+        context={"source": "user"},
+    )
+    assert result["type"] == "menu"
+    return await hass.config_entries.flow.async_configure(
+        result["flow_id"], user_input={"next_step_id": "manual"}
+    )
+
+
 async def _create_user_entry(hass, *, host: str, init_command: bool):
     """Create a config entry through the user flow."""
     with patch(
         "custom_components.duepi_evo.config_flow.DuepiEvoConfigFlow._async_validate_connection",
         new=AsyncMock(return_value=True),
     ):
-        result = await hass.config_entries.flow.async_init(
-            DOMAIN,
-            context={"source": "user"},
-        )
+        result = await _start_manual_flow(hass)
         result = await hass.config_entries.flow.async_configure(
             result["flow_id"],
             user_input={
@@ -59,10 +82,7 @@ async def _create_user_entry(hass, *, host: str, init_command: bool):
 
 async def test_user_step_exposes_init_command_and_hides_unique_id(hass) -> None:
     """Initial UI flow should ask for init_command, not unique_id."""
-    result = await hass.config_entries.flow.async_init(
-        DOMAIN,
-        context={"source": "user"},
-    )
+    result = await _start_manual_flow(hass)
 
     assert result["type"] == "form"
     fields = _schema_fields(result["data_schema"])
@@ -89,10 +109,7 @@ async def test_user_flow_returns_cannot_connect_without_crashing(hass) -> None:
         "custom_components.duepi_evo.config_flow.DuepiEvoConfigFlow._async_validate_connection",
         new=AsyncMock(return_value=False),
     ):
-        result = await hass.config_entries.flow.async_init(
-            DOMAIN,
-            context={"source": "user"},
-        )
+        result = await _start_manual_flow(hass)
         result = await hass.config_entries.flow.async_configure(
             result["flow_id"],
             user_input={
@@ -128,20 +145,92 @@ async def test_options_flow_opens_and_saves_init_command(hass) -> None:
         CONF_SCAN_INTERVAL,
     }.issubset(fields)
 
-    result = await hass.config_entries.options.async_configure(
-        result["flow_id"],
-        user_input={
-            CONF_MIN_TEMP: 17.0,
-            CONF_MAX_TEMP: 29.0,
-            CONF_AUTO_RESET: True,
-            CONF_NOFEEDBACK: 18.0,
-            CONF_INIT_COMMAND: True,
-            CONF_SCAN_INTERVAL: 30,
-        },
+    with patch(
+        "custom_components.duepi_evo.config_flow.DuepiEvoOptionsFlow._async_validate_connection",
+        new=AsyncMock(return_value=_probe_result(pcb_temp=False)),
+    ):
+        result = await hass.config_entries.options.async_configure(
+            result["flow_id"],
+            user_input={
+                CONF_MIN_TEMP: 17.0,
+                CONF_MAX_TEMP: 29.0,
+                CONF_AUTO_RESET: True,
+                CONF_NOFEEDBACK: 18.0,
+                CONF_INIT_COMMAND: True,
+                CONF_SCAN_INTERVAL: 30,
+            },
+        )
+
+    assert result["type"] == "create_entry"
+    assert result["data"][CONF_INIT_COMMAND] is True
+    assert entry.data[CONF_CAPABILITIES]["pcb_temp"] is False
+    assert entry.data[CONF_PROBE_LATENCY] == {"connect_ms": 1.0, "status_ms": 2.0}
+
+
+async def test_options_flow_saves_options_when_probe_fails(hass) -> None:
+    """An offline stove keeps its stored capabilities and the options are still saved."""
+    _, entry = await _create_user_entry(
+        hass,
+        host="192.168.1.17",
+        init_command=False,
     )
 
+    hass.config_entries.async_update_entry(
+        entry, data={**entry.data, CONF_CAPABILITIES: DuepiEvoCapabilities(pcb_temp=False).as_dict()}
+    )
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    with patch(
+        "custom_components.duepi_evo.config_flow.DuepiEvoOptionsFlow._async_validate_connection",
+        new=AsyncMock(return_value=None),
+    ):
+        result = await hass.config_entries.options.async_configure(
+            result["flow_id"],
+            user_input={
+                CONF_MIN_TEMP: 17.0,
+                CONF_MAX_TEMP: 29.0,
+                CONF_AUTO_RESET: False,
+                CONF_NOFEEDBACK: 18.0,
+                CONF_INIT_COMMAND: True,
+                CONF_SCAN_INTERVAL: 30,
+            },
+        )
+
     assert result["type"] == "create_entry"
     assert result["data"][CONF_INIT_COMMAND] is True
+    assert entry.data[CONF_CAPABILITIES]["pcb_temp"] is False
+
+
+async def test_options_flow_rejects_invalid_endpoints_without_probing(hass) -> None:
+    """Extra bridge endpoints must be ports or host:port pairs."""
+    _, entry = await _create_user_entry(
+        hass,
+        host="192.168.1.18",
+        init_command=False,
+    )
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    assert CONF_ENDPOINTS in _schema_fields(result["data_schema"])
+    probe = AsyncMock(return_value=_probe_result())
+    with patch(
+        "custom_components.duepi_evo.config_flow.DuepiEvoOptionsFlow._async_validate_connection",
+        new=probe,
+    ):
+        result = await hass.config_entries.options.async_configure(
+            result["flow_id"],
+            user_input={
+                CONF_MIN_TEMP: 17.0,
+                CONF_MAX_TEMP: 29.0,
+                CONF_AUTO_RESET: False,
+                CONF_NOFEEDBACK: 18.0,
+                CONF_INIT_COMMAND: False,
+                CONF_SCAN_INTERVAL: 30,
+                CONF_ENDPOINTS: "2000, telnet",
+            },
+        )
+
+    assert result["type"] == "form"
+    assert result["errors"] == {CONF_ENDPOINTS: "invalid_endpoints"}
+    probe.assert_not_awaited()
 
 
 async def test_import_flow_keeps_init_command_in_options(hass) -> None:
@@ -0,0 +1,336 @@
+"""Unit tests for the Duepi EVO coordinator."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+import threading
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.duepi_evo.const import (
+    CYCLE_STORAGE_SAVE_DELAY,
+    CYCLE_STORAGE_VERSION,
+    STATE_STORAGE_SAVE_DELAY,
+    STATE_STORAGE_VERSION,
+)
+from custom_components.duepi_evo import coordinator as coordinator_module
+from custom_components.duepi_evo.coordinator import (
+    DuepiEvoCoordinator,
+    cycle_storage_key,
+    state_storage_key,
+)
+from custom_components.duepi_evo.duepi_core import DuepiEvoCapabilities, DuepiEvoState
+from custom_components.duepi_evo.duepi_core.hooks import DuepiEvoHooks
+
+pytestmark = [pytest.mark.usefixtures("enable_custom_integrations")]
+
+
+def _state(**overrides: Any) -> DuepiEvoState:
+    """Build a representative Duepi EVO state snapshot."""
+    values = {
+        "burner_status": "Flame On",
+        "error_code": "All OK",
+        "exh_fan_speed_rpm": 500,
+        "flu_gas_temp_c": 200,
+        "pellet_speed": 20,
+        "power_level": "Low",
+        "pcb_temp_c": 45,
+        "total_burn_time_h": 500,
+        "burn_time_since_reset_h": 42,
+        "pressure_switch_active": True,
+        "current_temp_c": 21.5,
+        "target_temp_c": 23.0,
+        "hvac_mode": "heat",
+        "heating": True,
+    }
+    values.update(overrides)
+    return DuepiEvoState(**values)
+
+
+def _coordinator(hass, fetched: DuepiEvoState) -> DuepiEvoCoordinator:
+    client = SimpleNamespace(auto_reset=False, fetch_state=lambda: fetched)
+    return DuepiEvoCoordinator(
+        hass=hass,
+        client=client,
+        name="Pellet Stove",
+        update_interval=timedelta(seconds=60),
+        storage_key=state_storage_key("entry-1"),
+    )
+
+
+async def test_restore_seeds_stale_state_until_first_poll(hass, hass_storage) -> None:
+    """A persisted snapshot should be served immediately and marked stale."""
+    hass_storage[state_storage_key("entry-1")] = {
+        "version": STATE_STORAGE_VERSION,
+        "key": state_storage_key("entry-1"),
+        "data": _state(current_temp_c=19.0).as_dict(),
+    }
+    coordinator = _coordinator(hass, _state())
+
+    assert await coordinator.async_restore_last_state() is True
+    assert coordinator.data.current_temp_c == 19.0
+    assert coordinator.stale is True
+
+    await coordinator.async_refresh()
+
+    assert coordinator.data.current_temp_c == 21.5
+    assert coordinator.stale is False
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=STATE_STORAGE_SAVE_DELAY + 1))
+    await hass.async_block_till_done()
+    assert hass_storage[state_storage_key("entry-1")]["data"] == _state().as_dict()
+
+
+async def test_restore_ignores_missing_or_incompatible_snapshots(hass, hass_storage) -> None:
+    """Startup should fall back to an empty coordinator when nothing usable is stored."""
+    coordinator = _coordinator(hass, _state())
+    assert await coordinator.async_restore_last_state() is False
+
+    hass_storage[state_storage_key("entry-1")] = {
+        "version": STATE_STORAGE_VERSION,
+        "key": state_storage_key("entry-1"),
+        "data": {"burner_status": "Off"},
+    }
+    coordinator = _coordinator(hass, _state())
+    assert await coordinator.async_restore_last_state() is False
+    assert coordinator.data is None
+    assert coordinator.stale is False
+
+
+async def test_equal_snapshots_do_not_notify_listeners(hass) -> None:
+    """Unchanged polls should skip the listener fan-out and keep the data version."""
+    coordinator = _coordinator(hass, _state())
+    notified: list[int] = []
+    unsubscribe = coordinator.async_add_listener(lambda: notified.append(coordinator.data_version))
+
+    await coordinator.async_refresh()
+    await coordinator.async_refresh()
+
+    assert notified == [1]
+    assert coordinator.data_version == 1
+    assert coordinator.write_stats.unchanged_polls == 1
+    unsubscribe()
+
+
+async def test_equal_snapshot_still_clears_restored_stale_marker(hass, hass_storage) -> None:
+    """Listeners must run once when a live poll confirms the restored values."""
+    hass_storage[state_storage_key("entry-1")] = {
+        "version": STATE_STORAGE_VERSION,
+        "key": state_storage_key("entry-1"),
+        "data": _state().as_dict(),
+    }
+    coordinator = _coordinator(hass, _state())
+    await coordinator.async_restore_last_state()
+    notified: list[bool] = []
+    unsubscribe = coordinator.async_add_listener(lambda: notified.append(coordinator.stale))
+
+    await coordinator.async_refresh()
+
+    assert notified == [False]
+    unsubscribe()
+
+
+async def test_aggregate_window_closes_even_for_unchanged_polls(hass, monkeypatch) -> None:
+    """Closed windows reach aggregate listeners independently of the data fan-out."""
+    client = SimpleNamespace(auto_reset=False, fetch_state=_state)
+    coordinator = DuepiEvoCoordinator(
+        hass=hass,
+        client=client,
+        name="Pellet Stove",
+        update_interval=timedelta(seconds=5),
+        aggregate_window=timedelta(seconds=60),
+    )
+    closed: list[float] = []
+    coordinator.async_add_aggregate_listener(
+        lambda: closed.append(coordinator.aggregates["current_temp_c"].mean)
+    )
+
+    for now in (0, 30, 61):
+        monkeypatch.setattr(coordinator_module, "time", SimpleNamespace(monotonic=lambda now=now: now))
+        await coordinator.async_refresh()
+
+    assert closed == [21.5]
+    assert coordinator.aggregates["flu_gas_temp_c"].count == 2
+
+
+async def test_polls_feed_telemetry_buffer_and_websocket(hass) -> None:
+    """Every poll lands in the ring buffer, which is readable over the websocket."""
+    from custom_components.duepi_evo.const import DOMAIN
+    from custom_components.duepi_evo.websocket import websocket_telemetry
+
+    coordinator = _coordinator(hass, _state())
+    await coordinator.async_refresh()
+    await coordinator.async_refresh()
+    assert len(coordinator.telemetry.series("current_temp_c")) == 2
+
+    hass.data[DOMAIN] = {"entry-1": coordinator}
+    results: list = []
+    errors: list = []
+    connection = SimpleNamespace(
+        send_result=lambda msg_id, result: results.append(result),
+        send_error=lambda msg_id, code, message: errors.append(code),
+    )
+
+    websocket_telemetry(hass, connection, {"id": 1, "type": f"{DOMAIN}/telemetry", "entry_id": "entry-1"})
+    websocket_telemetry(hass, connection, {"id": 2, "type": f"{DOMAIN}/telemetry", "entry_id": "missing"})
+
+    fields = results[0]["fields"]
+    assert [value for _, value in fields["current_temp_c"]["samples"]] == [21.5, 21.5]
+    assert fields["flu_gas_temp_c"]["mean"] == 200.0
+    assert errors == ["not_found"]
+
+
+async def test_cycle_counters_resume_from_storage_and_are_persisted(hass, hass_storage) -> None:
+    """Burner cycle counters continue from the stored values and are saved again."""
+    hass_storage[cycle_storage_key("entry-1")] = {
+        "version": CYCLE_STORAGE_VERSION,
+        "key": cycle_storage_key("entry-1"),
+        "data": {"ignitions": 4, "last_status": "Ignition starting"},
+    }
+    client = SimpleNamespace(auto_reset=False, fetch_state=lambda: _state(burner_status="Flame On"))
+    coordinator = DuepiEvoCoordinator(
+        hass=hass,
+        client=client,
+        name="Pellet Stove",
+        update_interval=timedelta(seconds=60),
+        cycle_storage_key=cycle_storage_key("entry-1"),
+    )
+    await coordinator.async_restore_cycle_stats()
+    await coordinator.async_refresh()
+
+    assert coordinator.cycles.ignitions == 4
+    assert coordinator.cycles.successful_ignitions == 1
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=CYCLE_STORAGE_SAVE_DELAY + 1))
+    await hass.async_block_till_done()
+    stored = hass_storage[cycle_storage_key("entry-1")]["data"]
+    assert stored["successful_ignitions"] == 1
+    assert stored["last_status"] == "Flame On"
+
+
+async def test_live_subscription_polls_fast_without_publishing(hass) -> None:
+    """Live polls reach subscribers only; entities keep the regular cadence."""
+    from custom_components.duepi_evo.const import DOMAIN
+    from custom_components.duepi_evo.websocket import LIVE_FIELDS, websocket_subscribe
+
+    states = iter([_state(), _state(current_temp_c=21.6), _state(current_temp_c=21.7)])
+    client = SimpleNamespace(auto_reset=False, fetch_state=lambda: next(states))
+    coordinator = DuepiEvoCoordinator(
+        hass=hass,
+        client=client,
+        name="Pellet Stove",
+        update_interval=timedelta(seconds=60),
+    )
+    hass.data[DOMAIN] = {"entry-1": coordinator}
+    connection = SimpleNamespace(subscriptions={}, results=[], events=[])
+    connection.send_result = lambda msg_id, result: connection.results.append(result)
+    connection.send_message = lambda message: connection.events.append(message)
+
+    websocket_subscribe(hass, connection, {"id": 5, "type": f"{DOMAIN}/subscribe", "entry_id": "entry-1"})
+    assert connection.results == [{"fields": LIVE_FIELDS}]
+    assert coordinator.update_interval == timedelta(seconds=2)
+
+    polls: list[None] = []
+    coordinator.async_add_poll_listener(lambda: polls.append(None))
+    await coordinator.async_refresh()
+    await coordinator.async_refresh()
+
+    # Poll listeners (the metric sensors) only see the published poll.
+    assert len(polls) == 1
+    assert coordinator.data.current_temp_c == 21.5
+    assert coordinator.data_version == 1
+    assert len(coordinator.telemetry.series("current_temp_c")) == 1
+    temp_index = LIVE_FIELDS.index("current_temp_c")
+    assert [event["event"]["v"][temp_index] for event in connection.events] == [21.5, 21.6]
+
+    connection.subscriptions.pop(5)()
+    assert coordinator.update_interval == timedelta(seconds=60)
+    await coordinator.async_refresh()
+    assert coordinator.data.current_temp_c == 21.7
+    assert len(connection.events) == 2
+    assert len(polls) == 2
+
+
+async def test_coordinator_runs_against_replayed_trace(hass) -> None:
+    """Coordinator policies can be exercised deterministically from a recorded trace."""
+    from custom_components.duepi_evo.client import DuepiEvoClient
+    from custom_components.duepi_evo.duepi_core.replay import ReplayTransport
+    from custom_components.duepi_evo.duepi_core.trace import DIRECTION_RX, DIRECTION_TX
+
+    def poll(status: str, temp: str) -> list:
+        frames = []
+        for command, response in (
+            ("D9000", status),
+            ("D1000", temp),
+            ("D4000", "00000000"),
+            ("D0000", "00000000"),
+            ("EF000", "00000000"),
+            ("DA000", "00000000"),
+            ("C6000", "00170000"),
+        ):
+            frames.append((0.0, DIRECTION_TX, DuepiEvoClient.generate_command(command).encode()))
+            frames.append((0.0, DIRECTION_RX, f"\x1b{response}&".encode()))
+        return frames
+
+    transport = ReplayTransport(
+        poll("00000020", "00D70000") + poll("00000020", "00D70000") + poll("00000020", "00D80000")
+    )
+    client = DuepiEvoClient(
+        host="replay",
+        port=0,
+        min_temp=16.0,
+        max_temp=30.0,
+        no_feedback=16.0,
+        auto_reset=False,
+        init_command=False,
+        capabilities=DuepiEvoCapabilities(
+            pcb_temp=False,
+            total_burn_time=False,
+            burn_time_since_reset=False,
+            pressure_switch=False,
+        ),
+        transport=transport,
+    )
+    coordinator = DuepiEvoCoordinator(
+        hass=hass, client=client, name="Replay", update_interval=timedelta(seconds=60)
+    )
+
+    while not transport.exhausted:
+        await coordinator.async_refresh()
+
+    assert coordinator.data.current_temp_c == 21.6
+    assert coordinator.data_version == 2
+    assert coordinator.write_stats.unchanged_polls == 1
+
+
+async def test_auto_reset_retry_hook_runs_off_the_event_loop(hass) -> None:
+    """Hooks may block, so the auto-reset retry is emitted in the executor job."""
+    states = iter([_state(error_code="Out of pellets"), _state()])
+    resets = []
+    hook_threads = []
+    hooks = DuepiEvoHooks()
+    hooks.add("retry", lambda _event, _fields: hook_threads.append(threading.current_thread()))
+    client = SimpleNamespace(
+        auto_reset=True,
+        hooks=hooks,
+        fetch_state=lambda: next(states),
+        remote_reset=resets.append,
+    )
+    coordinator = DuepiEvoCoordinator(
+        hass=hass,
+        client=client,
+        name="Pellet Stove",
+        update_interval=timedelta(seconds=60),
+        storage_key=state_storage_key("entry-1"),
+    )
+
+    await coordinator.async_refresh()
+
+    assert resets == ["Out of pellets"]
+    assert coordinator.data.error_code == "All OK"
+    assert hook_threads and hook_threads[0] is not threading.main_thread()
@@ -0,0 +1,31 @@
+"""Checks that the protocol core stays importable without Home Assistant."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import subprocess
+import sys
+
+CORE_PARENT = Path(__file__).resolve().parents[1] / "custom_components" / "duepi_evo"
+
+
+def test_core_imports_without_homeassistant() -> None:
+    """Importing duepi_core must not pull in any homeassistant module."""
+    script = (
+        "import sys\n"
+        f"sys.path.insert(0, {str(CORE_PARENT)!r})\n"
+        "import duepi_core\n"
+        "client = duepi_core.DuepiEvoClient('127.0.0.1', 2000, 16, 30, 16, False, False)\n"
+        "assert client.generate_command('D1000') == '\\x1bRD100057&'\n"
+        "leaked = sorted(name for name in sys.modules if name.startswith('homeassistant'))\n"
+        "assert not leaked, leaked\n"
+    )
+    subprocess.run([sys.executable, "-c", script], check=True)
+
+
+def test_core_state_uses_plain_hvac_mode_names() -> None:
+    """Core state carries plain mode names that the HA adapter maps onto enums."""
+    from custom_components.duepi_evo.duepi_core import hvac_from_status
+
+    assert hvac_from_status("Off") == ("off", False)
+    assert hvac_from_status("Flame On") == ("heat", True)
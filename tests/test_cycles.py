@@ -0,0 +1,102 @@
+"""Unit tests for the burner cycle analytics."""
+
+from __future__ import annotations
+
+from custom_components.duepi_evo.duepi_core.cycles import BurnerCycleStats
+
+
+def _run(stats: BurnerCycleStats, polls: list[tuple[float, str]], day: str = "2026-01-01") -> None:
+    for now, status in polls:
+        stats.update(status, now, day)
+
+
+def test_ignition_cycle_counts_and_durations() -> None:
+    """A full Off -> Ignition -> Flame On -> Cooling cycle updates every counter."""
+    stats = BurnerCycleStats()
+    _run(
+        stats,
+        [
+            (0, "Off"),
+            (60, "Ignition starting"),
+            (300, "Ignition starting"),
+            (420, "Flame On"),
+            (720, "Flame On"),
+            (1020, "Cooling down"),
+            (1320, "Off"),
+        ],
+    )
+
+    assert stats.ignitions == 1
+    assert stats.successful_ignitions == 1
+    assert stats.failed_ignitions == 0
+    assert stats.completed_cycles == 1
+    assert stats.average_ignition_seconds == 360
+    assert stats.flame_on_seconds == 600
+    assert stats.flame_on_today_seconds == 600
+    assert stats.failed_ignition_rate == 0.0
+
+
+def test_failed_ignition_and_rate() -> None:
+    """Cooling down without a flame counts as a failed ignition."""
+    stats = BurnerCycleStats()
+    _run(
+        stats,
+        [
+            (0, "Ignition starting"),
+            (300, "Flame On"),
+            (600, "Cooling down"),
+            (900, "Ignition starting"),
+            (1200, "Cooling down"),
+        ],
+    )
+
+    assert stats.ignitions == 2
+    assert stats.failed_ignitions == 1
+    assert stats.failed_ignition_rate == 50.0
+
+
+def test_cancelled_or_unknown_ignition_ends_are_not_failures() -> None:
+    """Off without an error and unknown states are cancelled; an error is a failure."""
+    stats = BurnerCycleStats()
+    _run(
+        stats,
+        [
+            (0, "Ignition starting"),
+            (300, "Flame On"),
+            (600, "Cooling down"),
+            (900, "Ignition starting"),
+            (1000, "Off"),
+            (1100, "Ignition starting"),
+            (1200, "Unknown state"),
+        ],
+    )
+    stats.update("Ignition starting", 1300, "2026-01-01")
+    stats.update("Off", 1600, "2026-01-01", error_code="Ignition failure")
+
+    assert stats.ignitions == 4
+    assert stats.successful_ignitions == 1
+    assert stats.cancelled_ignitions == 2
+    assert stats.failed_ignitions == 1
+    assert stats.failed_ignition_rate == 50.0
+
+
+def test_long_gaps_are_not_counted_and_days_roll_over() -> None:
+    """Downtime is not flame time, and the daily counter moves to the previous day."""
+    stats = BurnerCycleStats()
+    _run(stats, [(0, "Flame On"), (300, "Flame On"), (10_000, "Flame On")])
+    assert stats.flame_on_seconds == 300
+
+    stats.update("Flame On", 10_200, "2026-01-02")
+    assert stats.flame_on_previous_day_seconds == 300
+    assert stats.flame_on_today_seconds == 200
+
+
+def test_round_trip_through_storage_dict() -> None:
+    """Counters survive an as_dict/from_dict round trip and ignore unknown keys."""
+    stats = BurnerCycleStats()
+    _run(stats, [(0, "Ignition starting"), (100, "Flame On")])
+
+    restored = BurnerCycleStats.from_dict({**stats.as_dict(), "unknown": 1})
+
+    assert restored == stats
+    assert BurnerCycleStats.from_dict(None) == BurnerCycleStats()
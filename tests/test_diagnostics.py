@@ -0,0 +1,106 @@
+"""Unit tests for the Duepi EVO diagnostics download."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from custom_components.duepi_evo.client import DuepiEvoClient
+from custom_components.duepi_evo.const import CONF_ENDPOINTS, DOMAIN
+from custom_components.duepi_evo.coordinator import DuepiEvoWriteStats
+from custom_components.duepi_evo.diagnostics import async_get_config_entry_diagnostics
+from custom_components.duepi_evo.duepi_core import DuepiEvoCapabilities
+from custom_components.duepi_evo.duepi_core.cycles import BurnerCycleStats
+
+
+class FakeSocket:
+    """Fake bridge answering every command with the same frame."""
+
+    def __init__(self, response: str) -> None:
+        self.response = response
+
+    def settimeout(self, _timeout: float) -> None:
+        return None
+
+    def connect(self, _address: tuple[str, int]) -> None:
+        return None
+
+    def send(self, data: bytes) -> int:
+        return len(data)
+
+    def recv(self, _size: int) -> bytes:
+        return self.response.encode()
+
+    def close(self) -> None:
+        return None
+
+    def __enter__(self) -> "FakeSocket":
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        return None
+
+
+@pytest.mark.asyncio
+async def test_diagnostics_include_trace_plan_and_statistics(monkeypatch: pytest.MonkeyPatch) -> None:
+    """The download carries raw frames, the query plan, capabilities and histograms."""
+    monkeypatch.setattr("socket.socket", lambda *_args, **_kwargs: FakeSocket("\x1b00000020&"))
+    client = DuepiEvoClient(
+        host="192.168.1.12",
+        port=2000,
+        min_temp=16.0,
+        max_temp=30.0,
+        no_feedback=16.0,
+        auto_reset=False,
+        init_command=False,
+        capabilities=DuepiEvoCapabilities(pressure_switch=False),
+    )
+    state = client.fetch_state()
+    coordinator = SimpleNamespace(
+        client=client,
+        data=state,
+        stale=False,
+        cycles=BurnerCycleStats(),
+        write_stats=DuepiEvoWriteStats(),
+        last_update_success=True,
+        last_exception=None,
+        update_interval=timedelta(seconds=60),
+    )
+    hass = SimpleNamespace(data={DOMAIN: {"entry-1": coordinator}})
+    entry = SimpleNamespace(
+        entry_id="entry-1",
+        data={"host": "192.168.1.12", "port": 2000, "name": "Pellet Stove"},
+        options={"scan_interval": 60, CONF_ENDPOINTS: "192.168.1.12:23, 192.168.1.13"},
+    )
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+
+    assert diagnostics["entry"]["data"]["host"] == "**REDACTED**"
+    assert diagnostics["entry"]["options"] == {
+        "scan_interval": 60,
+        CONF_ENDPOINTS: "**REDACTED**",
+    }
+    assert diagnostics["capabilities"]["pressure_switch"] is False
+    assert diagnostics["query_plan"] == [
+        "D9000",
+        "D1000",
+        "D4000",
+        "D0000",
+        "EF000",
+        "DA000",
+        "C6000",
+        "DF000",
+        "ED000",
+        "EE000",
+    ]
+    assert diagnostics["connection"]["connects"] == 1
+    assert diagnostics["connection"]["transport"] == "TcpTransport"
+    assert diagnostics["latency"]["snapshot"]["count"] == 1
+    trace = diagnostics["wire_trace"]
+    assert len(trace) == 20
+    assert trace[0]["dir"] == "tx"
+    assert trace[0]["frame"].startswith("\x1bRD9000")
+    assert trace[1] == {"t": trace[1]["t"], "dir": "rx", "frame": "\x1b00000020&"}
@@ -0,0 +1,151 @@
+"""Tests for LAN discovery of stove bridges."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from homeassistant.const import CONF_HOST, CONF_NAME, CONF_PORT
+
+from custom_components.duepi_evo.const import CONF_BRIDGE, CONF_INIT_COMMAND, CONF_NETWORK, DOMAIN
+from custom_components.duepi_evo.duepi_core.discovery import (
+    DiscoveredBridge,
+    async_discover,
+    discovery_hosts,
+)
+
+
+async def _serve(answer: bytes | None) -> asyncio.AbstractServer:
+    """Start a localhost server answering every request frame with ``answer``."""
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while await reader.readuntil(b"&"):
+                if answer is not None:
+                    writer.write(answer)
+                    await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, "127.0.0.1", 0)
+
+
+def _port(server: asyncio.AbstractServer) -> int:
+    return server.sockets[0].getsockname()[1]
+
+
+def test_discovery_hosts_expands_subnets_and_rejects_large_ones() -> None:
+    """A /24 yields its 254 hosts, a single address itself, a /16 is refused."""
+    assert len(discovery_hosts("192.168.1.17/24")) == 254
+    assert discovery_hosts("127.0.0.1") == ["127.0.0.1"]
+    with pytest.raises(ValueError):
+        discovery_hosts("10.0.0.0/16")
+    with pytest.raises(ValueError):
+        discovery_hosts("not-a-network")
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("socket_enabled")
+async def test_discover_finds_only_ports_that_answer_like_a_stove() -> None:
+    """Several simulated stoves are found; silent and foreign services are not."""
+    servers = [
+        await _serve(b" 02000000\r"),  # EVO-sim style, Flame On
+        await _serve(b"\x1b00000020&"),  # real bridge style, Off
+        await _serve(None),  # accepts, never answers
+        await _serve(b"HTTP/1.1 400 Bad Request\r\n"),
+    ]
+    closed = await _serve(None)
+    closed_port = _port(closed)
+    closed.close()
+    await closed.wait_closed()
+    ports = [_port(server) for server in servers] + [closed_port]
+
+    try:
+        bridges = await async_discover("127.0.0.1/32", ports, probe_timeout=0.2)
+    finally:
+        for server in servers:
+            server.close()
+            await server.wait_closed()
+
+    assert [(bridge.port, bridge.burner_status) for bridge in bridges] == [
+        (ports[0], "Flame On"),
+        (ports[1], "Off"),
+    ]
+    assert all(bridge.host == "127.0.0.1" and bridge.latency_ms >= 0 for bridge in bridges)
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("enable_custom_integrations")
+async def test_scan_step_creates_entry_for_picked_bridge(hass) -> None:
+    """The scan step lists found bridges and creates the entry for the chosen one."""
+    bridges = [
+        DiscoveredBridge("192.168.1.40", 23, "Off", 4.0),
+        DiscoveredBridge("192.168.1.41", 2000, "Flame On", 6.0),
+    ]
+    result = await hass.config_entries.flow.async_init(DOMAIN, context={"source": "user"})
+    with patch(
+        "custom_components.duepi_evo.config_flow.guess_local_network",
+        return_value="192.168.1.0/24",
+    ):
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], user_input={"next_step_id": "scan"}
+        )
+    assert result["step_id"] == "scan"
+
+    with patch(
+        "custom_components.duepi_evo.config_flow.async_discover",
+        new=AsyncMock(return_value=bridges),
+    ) as discover:
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], user_input={CONF_NETWORK: "192.168.1.0/24"}
+        )
+    discover.assert_awaited_once_with("192.168.1.0/24")
+    assert result["step_id"] == "pick"
+
+    with patch(
+        "custom_components.duepi_evo.config_flow.DuepiEvoConfigFlow._async_validate_connection",
+        new=AsyncMock(return_value=True),
+    ):
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"],
+            user_input={
+                CONF_BRIDGE: "192.168.1.41:2000",
+                CONF_NAME: "Living room",
+                CONF_INIT_COMMAND: False,
+            },
+        )
+
+    assert result["type"] == "create_entry"
+    assert result["data"][CONF_HOST] == "192.168.1.41"
+    assert result["data"][CONF_PORT] == 2000
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("enable_custom_integrations")
+async def test_scan_step_reports_empty_and_invalid_networks(hass) -> None:
+    """An invalid subnet or a scan without results keeps the form open."""
+    result = await hass.config_entries.flow.async_init(DOMAIN, context={"source": "user"})
+    with patch(
+        "custom_components.duepi_evo.config_flow.guess_local_network",
+        return_value="192.168.7.0/24",
+    ):
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], user_input={"next_step_id": "scan"}
+        )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], user_input={CONF_NETWORK: "10.0.0.0/8"}
+    )
+    assert result["errors"] == {CONF_NETWORK: "invalid_network"}
+
+    with patch(
+        "custom_components.duepi_evo.config_flow.async_discover",
+        new=AsyncMock(return_value=[]),
+    ):
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], user_input={CONF_NETWORK: "192.168.7.0/24"}
+        )
+    assert result["errors"] == {"base": "no_bridges_found"}
@@ -0,0 +1,27 @@
+"""Unit tests for telemetry publish filters."""
+
+from __future__ import annotations
+
+from custom_components.duepi_evo.filters import DeadbandFilter
+
+
+def test_deadband_holds_wobble_and_publishes_real_transitions() -> None:
+    """Samples inside the absolute band keep the published value."""
+    deadband = DeadbandFilter(absolute=50, max_age=900)
+
+    assert deadband.update(1200, now=0) == 1200
+    assert deadband.update(1230, now=10) == 1200
+    assert deadband.update(1170, now=20) == 1200
+    assert deadband.update(1260, now=30) == 1260
+    assert deadband.update(None, now=40) is None
+    assert deadband.update(1260, now=50) == 1260
+
+
+def test_deadband_percent_band_and_heartbeat() -> None:
+    """Percent bands scale with the value and max_age forces a refresh."""
+    deadband = DeadbandFilter(percent=5, max_age=60)
+
+    assert deadband.update(200, now=0) == 200
+    assert deadband.update(209, now=10) == 200
+    assert deadband.update(209, now=60) == 209
+    assert deadband.update(220, now=61) == 220
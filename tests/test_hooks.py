@@ -0,0 +1,130 @@
+"""Unit tests for the instrumentation hooks and the NDJSON span exporter."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from custom_components.duepi_evo.client import DuepiEvoClient
+from custom_components.duepi_evo.duepi_core.hooks import DuepiEvoHooks, NdjsonSpanExporter
+
+
+class FakeSocket:
+    """Fake bridge answering every command with the same frame."""
+
+    def __init__(self, response: str) -> None:
+        self.response = response
+
+    def settimeout(self, _timeout: float) -> None:
+        return None
+
+    def connect(self, _address: tuple[str, int]) -> None:
+        return None
+
+    def send(self, data: bytes) -> int:
+        return len(data)
+
+    def recv(self, _size: int) -> bytes:
+        return self.response.encode()
+
+    def close(self) -> None:
+        return None
+
+    def __enter__(self) -> "FakeSocket":
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        return None
+
+
+def _client() -> DuepiEvoClient:
+    return DuepiEvoClient(
+        host="192.168.1.12",
+        port=2000,
+        min_temp=16.0,
+        max_temp=30.0,
+        no_feedback=16.0,
+        auto_reset=False,
+        init_command=False,
+    )
+
+
+def test_registry_tracks_enabled_flag_and_rejects_unknown_events() -> None:
+    """The enabled flag follows registration so emit sites can skip cheaply."""
+    hooks = DuepiEvoHooks()
+    assert hooks.enabled is False
+
+    remove = hooks.add("poll_start", lambda event, fields: None)
+    assert hooks.enabled is True
+    remove()
+    assert hooks.enabled is False
+
+    with pytest.raises(ValueError):
+        hooks.add("unknown", lambda event, fields: None)
+
+
+def test_fetch_state_emits_poll_connect_and_frame_events(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A poll reports its connect, every frame and its end, and survives failing hooks."""
+    monkeypatch.setattr("socket.socket", lambda *_args, **_kwargs: FakeSocket("\x1b00000020&"))
+    client = _client()
+    events: list[str] = []
+    for event in ("poll_start", "poll_end", "connect", "frame_send", "frame_recv"):
+        client.hooks.add(event, lambda name, fields: events.append(name))
+    client.hooks.add("poll_end", lambda name, fields: 1 / 0)
+
+    client.fetch_state()
+
+    assert events[:3] == ["poll_start", "connect", "frame_send"]
+    assert events[-1] == "poll_end"
+    assert events.count("frame_send") == events.count("frame_recv") == 11
+
+
+def test_span_exporter_writes_one_json_line_per_span(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """The exporter writes poll, connect and command spans tagged with the poll number."""
+    monkeypatch.setattr("socket.socket", lambda *_args, **_kwargs: FakeSocket("\x1b00000020&"))
+    client = _client()
+    path = tmp_path / "spans.ndjson"
+    exporter = NdjsonSpanExporter(str(path))
+    detach = exporter.attach(client.hooks)
+
+    client.fetch_state()
+    client.fetch_state()
+    detach()
+    exporter.close()
+    client.fetch_state()
+
+    spans = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [span["name"] for span in spans].count("poll") == 2
+    assert {span["poll"] for span in spans} == {1, 2}
+    recv = next(span for span in spans if span["name"] == "frame_recv")
+    assert recv["command"] == "D9000"
+    assert recv["ok"] is True
+    assert recv["duration_ms"] >= 0
+    assert client.hooks.enabled is False
+
+
+def test_span_exporter_rolls_over_to_one_backup(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """A full span file becomes ``.1`` at the end of a poll; older backups are dropped."""
+    monkeypatch.setattr("socket.socket", lambda *_args, **_kwargs: FakeSocket("\x1b00000020&"))
+    client = _client()
+    path = tmp_path / "spans.ndjson"
+    exporter = NdjsonSpanExporter(str(path), max_bytes=1)
+    exporter.attach(client.hooks)
+
+    for _ in range(3):
+        client.fetch_state()
+    exporter.close()
+
+    assert not path.exists()
+    backup = tmp_path / "spans.ndjson.1"
+    spans = [json.loads(line) for line in backup.read_text(encoding="utf-8").splitlines()]
+    assert {span["poll"] for span in spans} == {3}
+    assert spans[-1]["name"] == "poll"
+    assert sorted(item.name for item in tmp_path.iterdir()) == ["spans.ndjson.1"]
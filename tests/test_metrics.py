@@ -0,0 +1,40 @@
+"""Unit tests for client latency histograms."""
+
+from __future__ import annotations
+
+import pytest
+
+from custom_components.duepi_evo.duepi_core.metrics import DuepiEvoClientMetrics, LatencyHistogram
+
+
+def test_histogram_percentiles_interpolate_within_buckets() -> None:
+    """Percentiles fall inside the bucket holding the requested rank."""
+    histogram = LatencyHistogram(bounds=(10, 20, 50))
+    for latency in [5] * 50 + [15] * 45 + [40] * 5:
+        histogram.observe(latency)
+
+    assert histogram.counts == [50, 45, 5, 0]
+    assert histogram.percentile(50) == pytest.approx(10.0)
+    assert 10 < histogram.percentile(95) <= 20
+    assert 20 < histogram.percentile(99) <= 40
+    assert histogram.mean == pytest.approx(11.25)
+
+
+def test_histogram_overflow_bucket_is_capped_by_maximum() -> None:
+    """Latencies beyond the last bound are estimated up to the observed maximum."""
+    histogram = LatencyHistogram(bounds=(10,))
+    histogram.observe(300)
+
+    assert histogram.counts == [0, 1]
+    assert histogram.percentile(99) <= 300
+    assert LatencyHistogram().percentile(50) is None
+
+
+def test_command_histograms_are_keyed_by_register() -> None:
+    """Set commands with different values share one histogram."""
+    metrics = DuepiEvoClientMetrics()
+    metrics.command("F2150").observe(3)
+    metrics.command("F21A0").observe(4)
+
+    assert list(metrics.commands) == ["F2"]
+    assert metrics.as_dict()["commands"]["F2"]["count"] == 2
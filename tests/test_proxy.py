@@ -0,0 +1,165 @@
+"""Tests for the caching multi-client proxy."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.duepi_evo.duepi_core.capture import CaptureReader, CaptureWriter
+from custom_components.duepi_evo.duepi_core.protocol import generate_command
+from custom_components.duepi_evo.duepi_core.proxy import DuepiEvoProxy
+
+STATUS = generate_command("D9000").encode()
+SETPOINT = generate_command("C6000").encode()
+TEMPERATURE = generate_command("D1000").encode()
+POWER_ON = generate_command("F0010").encode()
+SET_TEMPERATURE = generate_command("F2170").encode()
+
+
+class FakeStove:
+    """Localhost bridge answering every frame, counting what it received."""
+
+    def __init__(self) -> None:
+        self.frames: list[bytes] = []
+        self.status = b"\x1b00000020&"
+        self.connections = 0
+        self.writers: list[asyncio.StreamWriter] = []
+        self.server: asyncio.AbstractServer | None = None
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        self.writers.append(writer)
+        try:
+            while frame := await reader.readuntil(b"&"):
+                self.frames.append(frame)
+                await asyncio.sleep(0.01)
+                writer.write(self.status if frame == STATUS else b"\x1b00170000&")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self) -> int:
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+
+async def _ask(port: int, *frames: bytes) -> list[bytes]:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    answers = []
+    try:
+        for frame in frames:
+            writer.write(frame)
+            answers.append(await asyncio.wait_for(reader.readexactly(10), 1))
+    finally:
+        writer.close()
+    return answers
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("socket_enabled")
+async def test_concurrent_clients_share_one_upstream_read() -> None:
+    """Several pollers asking at once cause a single read on the bridge."""
+    stove = FakeStove()
+    proxy = DuepiEvoProxy("127.0.0.1", await stove.start())
+    server = await proxy.async_start("127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        answers = await asyncio.gather(*(_ask(port, STATUS, TEMPERATURE) for _ in range(5)))
+    finally:
+        server.close()
+        await proxy.async_close()
+        await stove.stop()
+
+    assert all(answer == [b"\x1b00000020&", b"\x1b00170000&"] for answer in answers)
+    assert stove.frames == [STATUS, TEMPERATURE]
+    assert stove.connections == 1
+    assert proxy.stats.clients == 5
+    assert proxy.stats.cache_hits == 8
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("socket_enabled")
+async def test_writes_pass_through_and_invalidate_affected_registers() -> None:
+    """Switching on refreshes the status, leaving the cached setpoint alone."""
+    stove = FakeStove()
+    proxy = DuepiEvoProxy("127.0.0.1", await stove.start())
+    exchanges = []
+    proxy.on_exchange = lambda frame, response, cached: exchanges.append((frame, cached))
+    try:
+        await proxy.async_request(STATUS)
+        await proxy.async_request(SETPOINT)
+        stove.status = b"\x1b01000020&"
+        await proxy.async_request(POWER_ON)
+        await proxy.async_request(POWER_ON)
+        assert await proxy.async_request(STATUS) == b"\x1b01000020&"
+        await proxy.async_request(SETPOINT)
+        await proxy.async_request(SET_TEMPERATURE)
+        await proxy.async_request(SETPOINT)
+    finally:
+        await proxy.async_close()
+        await stove.stop()
+
+    assert stove.frames == [STATUS, SETPOINT, POWER_ON, POWER_ON, STATUS, SET_TEMPERATURE, SETPOINT]
+    assert (SETPOINT, True) in exchanges
+    assert proxy.stats.invalidations == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("socket_enabled")
+async def test_cache_expires_and_upstream_reconnects() -> None:
+    """Old answers are refetched; a dropped bridge connection is reopened."""
+    now = [0.0]
+    stove = FakeStove()
+    proxy = DuepiEvoProxy("127.0.0.1", await stove.start(), cache_ttl=2.0, clock=lambda: now[0])
+    try:
+        await proxy.async_request(STATUS)
+        now[0] = 1.5
+        await proxy.async_request(STATUS)
+        now[0] = 3.0
+        for writer in stove.writers:
+            writer.close()
+        await asyncio.sleep(0.01)
+        assert await proxy.async_request(STATUS) == b""
+        assert await proxy.async_request(STATUS) == b"\x1b00000020&"
+    finally:
+        await proxy.async_close()
+        await stove.stop()
+
+    assert proxy.stats.upstream_errors == 1
+    assert proxy.stats.upstream_connects == 2
+    assert stove.frames == [STATUS, STATUS]
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("socket_enabled")
+async def test_capture_records_every_client_exchange(tmp_path) -> None:
+    """Cached and forwarded answers are captured with the asking client's id."""
+    stove = FakeStove()
+    capture = CaptureWriter(tmp_path / "proxy.dpcap")
+    proxy = DuepiEvoProxy("127.0.0.1", await stove.start(), capture=capture)
+    server = await proxy.async_start("127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        await _ask(port, STATUS)
+        await _ask(port, STATUS)
+    finally:
+        server.close()
+        await proxy.async_close()
+        await stove.stop()
+        capture.close()
+
+    with CaptureReader(tmp_path / "proxy.dpcap") as reader:
+        records = [(record.client_id, record.cached, record.frame) for record in reader]
+    assert records == [
+        (1, False, STATUS),
+        (1, False, b"\x1b00000020&"),
+        (2, True, STATUS),
+        (2, True, b"\x1b00000020&"),
+    ]
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from dataclasses import replace
 from types import SimpleNamespace
 
 import pytest
@@ -9,11 +10,22 @@ import pytest
 from homeassistant.components.climate import HVACMode
 from homeassistant.const import EntityCategory
 
+from custom_components.duepi_evo import sensor as sensor_module
 from custom_components.duepi_evo.binary_sensor import async_setup_entry as async_setup_binary_sensor_entry
 from custom_components.duepi_evo.client import DuepiEvoState
 from custom_components.duepi_evo.climate import async_setup_entry as async_setup_climate_entry
 from custom_components.duepi_evo.const import DOMAIN
-from custom_components.duepi_evo.sensor import async_setup_entry as async_setup_sensor_entry
+from custom_components.duepi_evo.duepi_core.aggregation import WindowedAggregator
+from custom_components.duepi_evo.duepi_core.cycles import BurnerCycleStats
+from custom_components.duepi_evo.duepi_core.metrics import DuepiEvoClientMetrics
+from custom_components.duepi_evo.duepi_core.telemetry import TelemetryBuffer
+from custom_components.duepi_evo.sensor import (
+    DuepiEvoCycleSensorEntity,
+    DuepiEvoMetricSensorEntity,
+    DuepiEvoSensorEntity,
+    DuepiEvoTrendSensorEntity,
+    async_setup_entry as async_setup_sensor_entry,
+)
 
 
 def _state(*, pressure_switch_active: bool | None = True) -> DuepiEvoState:
@@ -36,6 +48,21 @@ def _state(*, pressure_switch_active: bool | None = True) -> DuepiEvoState:
     )
 
 
+def _coordinator(state: DuepiEvoState | None = None) -> SimpleNamespace:
+    """Build a minimal coordinator-like object serving one snapshot."""
+    return SimpleNamespace(
+        data=state or _state(),
+        stale=False,
+        last_update_success=True,
+        aggregation_enabled=False,
+        aggregates={},
+        telemetry=TelemetryBuffer(("current_temp_c", "flu_gas_temp_c"), 10),
+        cycles=BurnerCycleStats(),
+        client=SimpleNamespace(metrics=DuepiEvoClientMetrics()),
+        write_stats=SimpleNamespace(performed=0, skipped=0),
+    )
+
+
 def _entry() -> SimpleNamespace:
     """Build a minimal config-entry-like object for entity setup."""
     return SimpleNamespace(
@@ -53,11 +80,12 @@ def _entry() -> SimpleNamespace:
 @pytest.mark.asyncio
 async def test_sensor_setup_exposes_expected_read_only_entities() -> None:
     """Sensor platform should create all read-only diagnostic entities."""
-    coordinator = SimpleNamespace(data=_state())
+    coordinator = _coordinator()
     hass = SimpleNamespace(data={DOMAIN: {"entry-1": coordinator}})
     entities: list = []
 
     await async_setup_sensor_entry(hass, _entry(), entities.extend)
+    entities = [entity for entity in entities if isinstance(entity, DuepiEvoSensorEntity)]
 
     assert {entity.entity_description.key for entity in entities} == {
         "burner_status",
@@ -107,7 +135,7 @@ async def test_sensor_setup_exposes_expected_read_only_entities() -> None:
 @pytest.mark.asyncio
 async def test_binary_sensor_setup_maps_pressure_switch_state() -> None:
     """Binary sensor platform should expose the pressure switch as a bool."""
-    coordinator = SimpleNamespace(data=_state(pressure_switch_active=True))
+    coordinator = _coordinator(_state(pressure_switch_active=True))
     hass = SimpleNamespace(data={DOMAIN: {"entry-1": coordinator}})
     entities: list = []
 
@@ -128,7 +156,7 @@ async def test_binary_sensor_setup_maps_pressure_switch_state() -> None:
 @pytest.mark.asyncio
 async def test_climate_sensor_and_binary_sensor_share_same_device() -> None:
     """All entities for one stove should attach to the same HA device."""
-    coordinator = SimpleNamespace(data=_state())
+    coordinator = _coordinator()
     hass = SimpleNamespace(data={DOMAIN: {"entry-1": coordinator}})
     climate_entities: list = []
     sensor_entities: list = []
@@ -145,3 +173,172 @@ async def test_climate_sensor_and_binary_sensor_share_same_device() -> None:
     assert sensor_entities[0].device_info["identifiers"] == shared_identifiers
     assert binary_sensor_entities[0].device_info["identifiers"] == shared_identifiers
     assert climate_entities[0].device_info["name"] == "Pellet Stove"
+
+
+@pytest.mark.asyncio
+async def test_sensor_skips_state_write_when_value_is_unchanged() -> None:
+    """Coordinator updates should only write sensor state when the value changed."""
+    coordinator = _coordinator()
+    hass = SimpleNamespace(data={DOMAIN: {"entry-1": coordinator}})
+    entities: list = []
+    await async_setup_sensor_entry(hass, _entry(), entities.extend)
+    entity = next(entity for entity in entities if entity.entity_description.key == "pcb_temp")
+    writes: list = []
+    entity.async_write_ha_state = lambda: writes.append(entity.native_value)
+
+    entity._handle_coordinator_update()
+    entity._handle_coordinator_update()
+    coordinator.data = _state(pressure_switch_active=False)
+    entity._handle_coordinator_update()
+    coordinator.data = replace(_state(), pcb_temp_c=50)
+    entity._handle_coordinator_update()
+
+    assert writes == [45, 50]
+    assert coordinator.write_stats.performed == 2
+    assert coordinator.write_stats.skipped == 2
+
+
+@pytest.mark.asyncio
+async def test_exhaust_fan_sensor_deadband_suppresses_wobble() -> None:
+    """RPM wobble inside the deadband should not produce a state write."""
+    coordinator = _coordinator()
+    hass = SimpleNamespace(data={DOMAIN: {"entry-1": coordinator}})
+    entities: list = []
+    await async_setup_sensor_entry(hass, _entry(), entities.extend)
+    entity = next(entity for entity in entities if entity.entity_description.key == "exh_fan_speed")
+    writes: list = []
+    entity.async_write_ha_state = lambda: writes.append(entity.native_value)
+
+    for rpm in (500, 530, 470, 520, 600):
+        coordinator.data = replace(_state(), exh_fan_speed_rpm=rpm)
+        entity._handle_coordinator_update()
+
+    assert writes == [500, 600]
+    assert entity.native_value == 600
+
+
+@pytest.mark.asyncio
+async def test_deadband_heartbeat_publishes_unchanged_in_band_value(monkeypatch) -> None:
+    """Polls equal to the last snapshot still publish the held value after max_age."""
+    coordinator = _coordinator()
+    hass = SimpleNamespace(data={DOMAIN: {"entry-1": coordinator}})
+    entities: list = []
+    await async_setup_sensor_entry(hass, _entry(), entities.extend)
+    entity = next(entity for entity in entities if entity.entity_description.key == "exh_fan_speed")
+    writes: list = []
+    entity.async_write_ha_state = lambda: writes.append(entity.native_value)
+    max_age = entity.entity_description.deadband_max_age.total_seconds()
+    now = [1000.0]
+    monkeypatch.setattr(sensor_module, "time", SimpleNamespace(monotonic=lambda: now[0]))
+
+    entity._handle_coordinator_update()
+    coordinator.data = replace(_state(), exh_fan_speed_rpm=530)
+    entity._handle_coordinator_update()
+    now[0] += max_age / 2
+    entity._handle_sample(coordinator.data)
+    assert writes == [500]
+
+    now[0] += max_age / 2
+    entity._handle_sample(coordinator.data)
+    assert writes == [500, 530]
+
+
+@pytest.mark.asyncio
+async def test_aggregate_sensors_publish_closed_window_statistics() -> None:
+    """Aggregate sensors appear when enabled and report the last closed window."""
+    coordinator = _coordinator()
+    coordinator.aggregation_enabled = True
+    hass = SimpleNamespace(data={DOMAIN: {"entry-1": coordinator}})
+    entities: list = []
+    await async_setup_sensor_entry(hass, _entry(), entities.extend)
+    entity = next(
+        entity for entity in entities if entity.entity_description.key == "flu_gas_temp_window"
+    )
+    assert entity.native_value is None
+
+    aggregator = WindowedAggregator(fields=("flu_gas_temp_c",), window=60)
+    for now, temp in ((0, 190), (20, 200), (40, 216), (60, 230)):
+        closed = aggregator.add(replace(_state(), flu_gas_temp_c=temp), now)
+    coordinator.aggregates = closed
+
+    assert entity.native_value == 202.0
+    assert entity.extra_state_attributes == {"min": 190, "max": 216, "last": 216, "samples": 3}
+
+
+@pytest.mark.asyncio
+async def test_trend_sensors_report_rate_of_change_from_telemetry() -> None:
+    """Trend sensors report the buffer slope, scaled to their unit."""
+    coordinator = _coordinator()
+    hass = SimpleNamespace(data={DOMAIN: {"entry-1": coordinator}})
+    entities: list = []
+    await async_setup_sensor_entry(hass, _entry(), entities.extend)
+    trends = {
+        entity.entity_description.key: entity
+        for entity in entities
+        if isinstance(entity, DuepiEvoTrendSensorEntity)
+    }
+    assert set(trends) == {"current_temp_trend", "flu_gas_temp_ramp"}
+    assert trends["current_temp_trend"].native_value is None
+
+    for minute, (room, flue) in enumerate(((20.0, 100), (20.1, 130), (20.2, 160))):
+        state = replace(_state(), current_temp_c=room, flu_gas_temp_c=flue)
+        coordinator.telemetry.add(state, minute * 60.0)
+
+    assert trends["current_temp_trend"].native_value == 6.0
+    assert trends["flu_gas_temp_ramp"].native_value == 30.0
+    assert trends["flu_gas_temp_ramp"].extra_state_attributes == {
+        "mean": 130.0,
+        "variance": 600.0,
+        "samples": 3,
+    }
+
+
+@pytest.mark.asyncio
+async def test_cycle_sensors_read_burner_cycle_counters() -> None:
+    """Cycle sensors expose the coordinator's running ignition counters."""
+    coordinator = _coordinator()
+    hass = SimpleNamespace(data={DOMAIN: {"entry-1": coordinator}})
+    entities: list = []
+    await async_setup_sensor_entry(hass, _entry(), entities.extend)
+    cycles = {
+        entity.entity_description.key: entity
+        for entity in entities
+        if isinstance(entity, DuepiEvoCycleSensorEntity)
+    }
+    assert cycles["average_ignition_duration"].native_value is None
+
+    for now, status in ((0, "Off"), (60, "Ignition starting"), (600, "Flame On"), (4200, "Flame On")):
+        coordinator.cycles.update(status, now, "2026-01-01", max_gap=7200)
+
+    assert cycles["ignitions"].native_value == 1
+    assert cycles["failed_ignition_rate"].native_value == 0.0
+    assert cycles["average_ignition_duration"].native_value == 540
+    assert cycles["flame_on_today"].native_value == 1.0
+
+
+@pytest.mark.asyncio
+async def test_metric_sensors_are_disabled_diagnostics_that_stay_available() -> None:
+    """Latency and error sensors are opt-in and remain available after failures."""
+    coordinator = _coordinator()
+    coordinator.last_update_success = False
+    hass = SimpleNamespace(data={DOMAIN: {"entry-1": coordinator}})
+    entities: list = []
+    await async_setup_sensor_entry(hass, _entry(), entities.extend)
+    metrics = {
+        entity.entity_description.key: entity
+        for entity in entities
+        if isinstance(entity, DuepiEvoMetricSensorEntity)
+    }
+    assert all(
+        entity.entity_description.entity_registry_enabled_default is False
+        and entity.entity_description.entity_category is EntityCategory.DIAGNOSTIC
+        for entity in metrics.values()
+    )
+
+    coordinator.client.metrics.timeouts = 3
+    for latency in (120, 130, 140):
+        coordinator.client.metrics.snapshot.observe(latency)
+
+    assert metrics["timeouts"].available is True
+    assert metrics["timeouts"].native_value == 3
+    assert 100 <= metrics["snapshot_latency_p50"].native_value <= 200
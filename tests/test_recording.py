@@ -0,0 +1,158 @@
+"""Tests for the chunked columnar recorder."""
+
+from __future__ import annotations
+
+from array import array
+import math
+
+import pytest
+
+from custom_components.duepi_evo.duepi_core import DuepiEvoClient, LoopbackTransport
+from custom_components.duepi_evo.duepi_core.probe import UNSUPPORTED_AFTER_TIMEOUTS
+from custom_components.duepi_evo.duepi_core.recording import (
+    RECORDING_COLUMNS,
+    Recorder,
+    RecordingFormatError,
+    RecordingReader,
+    RecordingWriter,
+)
+
+COLUMNS = [("timestamp", "d"), ("status", "I"), ("room_temp", "f"), ("error_code", "h")]
+
+REGISTERS = {
+    b"D9000": b"\x1b02000000&",  # status => Flame On
+    b"D3000": b"\x1b00030000&",  # power level => Medium
+    b"D1000": b"\x1b00D70000&",  # ambient => 21.5 C
+    b"D4000": b"\x1b00140000&",  # pellet speed => 20
+    b"D0000": b"\x1b00C80000&",  # flugas => 200 C
+    b"EF000": b"\x1b00320000&",  # exh fan => 500 rpm
+    b"DA000": b"\x1b00000000&",  # error => All OK
+    b"C6000": b"\x1b00170000&",  # setpoint => 23
+}
+
+
+def _rows(count: int) -> list[tuple[float, int, float, int]]:
+    return [(1_000_000.0 + i, 0x02000000, 20.0 + i / 10, i % 3) for i in range(count)]
+
+
+def test_rows_round_trip_through_chunks(tmp_path) -> None:
+    """Full and partial chunks read back per column, copied or as views."""
+    path = tmp_path / "stove.dprec"
+    with RecordingWriter(path, COLUMNS, chunk_rows=4) as writer:
+        for row in _rows(10):
+            writer.append(row)
+        assert writer.rows_written == 8
+
+    with RecordingReader(path) as reader:
+        assert len(reader) == 10
+        assert [rows for _, rows in reader.chunks] == [4, 4, 2]
+        assert reader.column("timestamp") == array("d", [row[0] for row in _rows(10)])
+        assert list(reader.column("error_code")) == [i % 3 for i in range(10)]
+        views = reader.column_views("room_temp")
+        assert [round(value, 1) for view in views for value in view] == [
+            round(20.0 + i / 10, 1) for i in range(10)
+        ]
+        assert views[0].format == "f"
+        for view in views:
+            view.release()
+
+
+def test_reopening_trims_a_torn_chunk_and_appends(tmp_path) -> None:
+    """A chunk cut short by a crash is dropped; other column sets are refused."""
+    path = tmp_path / "stove.dprec"
+    with RecordingWriter(path, COLUMNS, chunk_rows=4) as writer:
+        for row in _rows(4):
+            writer.append(row)
+    with open(path, "ab") as file:
+        file.write(b"CHNK\x04\x00\x00\x00" + b"\x00" * 20)
+
+    with RecordingWriter(path, COLUMNS) as writer:
+        writer.append(_rows(5)[4])
+
+    with RecordingReader(path) as reader:
+        assert list(reader.column("status")) == [0x02000000] * 5
+    with pytest.raises(RecordingFormatError):
+        RecordingWriter(path, COLUMNS[:2])
+
+
+def _loopback_client(respond) -> DuepiEvoClient:
+    return DuepiEvoClient(
+        "127.0.0.1",
+        23,
+        min_temp=16,
+        max_temp=30,
+        no_feedback=16,
+        auto_reset=False,
+        init_command=False,
+        timeout=0.01,
+        transport=LoopbackTransport(respond),
+        pipeline=True,
+        persistent=True,
+    )
+
+
+def test_recorder_pipelines_every_register_into_one_row(tmp_path) -> None:
+    """Each sample is one pipelined exchange; a missing optional register reads NaN."""
+    sent = []
+
+    def respond(frame: bytes) -> bytes | None:
+        sent.append(frame[2:7])
+        return REGISTERS.get(frame[2:7])
+
+    client = _loopback_client(respond)
+    now = [1_000_000.0]
+
+    def clock() -> float:
+        now[0] += 1
+        return now[0]
+
+    path = tmp_path / "stove.dprec"
+    with RecordingWriter(path) as writer:
+        recorder = Recorder(client, writer, interval=0, clock=clock)
+        recorder.run(samples=3)
+
+    assert recorder.skipped == {"pcb_temp"}
+    assert sent.count(b"DF000") == UNSUPPORTED_AFTER_TIMEOUTS
+    assert sent.count(b"D9000") == 3
+    with RecordingReader(path) as reader:
+        assert list(reader.columns.items()) == list(RECORDING_COLUMNS)
+        assert list(reader.column("timestamp")) == [1_000_001.0, 1_000_002.0, 1_000_003.0]
+        assert list(reader.column("status")) == [0x02000000] * 3
+        assert list(reader.column("power_level")) == [3] * 3
+        assert list(reader.column("exh_fan_speed")) == [500.0] * 3
+        assert all(math.isnan(value) for value in reader.column("pcb_temp"))
+
+
+def test_recorder_keeps_dropped_registers_and_rechecks_skipped_ones(tmp_path) -> None:
+    """One lost frame does not skip a register; a skipped one is asked again later."""
+    pcb_answers = iter([None, b"\x1b002D0000&"])
+
+    def respond(frame: bytes) -> bytes | None:
+        if frame[2:7] == b"DF000":
+            return next(pcb_answers, b"\x1b002D0000&")
+        return REGISTERS.get(frame[2:7])
+
+    with RecordingWriter(tmp_path / "dropped.dprec") as writer:
+        recorder = Recorder(_loopback_client(respond), writer, interval=0)
+        recorder.detect_optional()
+    assert recorder.skipped == set()
+
+    pcb_answering = [False]
+
+    def respond_later(frame: bytes) -> bytes | None:
+        if frame[2:7] == b"DF000":
+            return b"\x1b002D0000&" if pcb_answering[0] else None
+        return REGISTERS.get(frame[2:7])
+
+    path = tmp_path / "recheck.dprec"
+    with RecordingWriter(path) as writer:
+        recorder = Recorder(_loopback_client(respond_later), writer, interval=0, recheck_skipped=2)
+        recorder.detect_optional()
+        assert recorder.skipped == {"pcb_temp"}
+        pcb_answering[0] = True
+        recorder.run(samples=3)
+    assert recorder.skipped == set()
+    with RecordingReader(path) as reader:
+        pcb = list(reader.column("pcb_temp"))
+    assert math.isnan(pcb[0]) and math.isnan(pcb[1])
+    assert pcb[2] == 45.0
@@ -0,0 +1,199 @@
+"""Unit tests for replaying recorded wire traces through the client."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import time
+from typing import Any
+
+import pytest
+
+from custom_components.duepi_evo.client import DuepiEvoClient, DuepiEvoTimeoutError
+from custom_components.duepi_evo.duepi_core.replay import (
+    ReplayMismatchError,
+    ReplayTransport,
+    load_trace,
+    replay_polls,
+    trace_from_diagnostics,
+)
+from custom_components.duepi_evo.duepi_core.trace import DIRECTION_RX, DIRECTION_TX
+
+RESPONSES = [
+    "\x1b02000000&",  # status => Flame On
+    "\x1b00020000&",  # power level => Low
+    "\x1b00D70000&",  # ambient => 21.5 C
+    "\x1b00140000&",  # pellet speed => 20
+    "\x1b00C80000&",  # flugas => 200 C
+    "\x1b00320000&",  # exh fan => 500 rpm
+    "\x1b00000000&",  # error => All OK
+    "\x1b00170000&",  # setpoint => 23
+    "\x1b002D0000&",  # pcb temp => 45 C
+    "\x1b0001F400&",  # total burn time => 500 h
+    "\x1b00002A00&",  # burn time since reset => 42 h
+    "\x1b02000000&",  # pressure switch => no pressure
+]
+
+
+class FakeSocket:
+    """Fake bridge returning a fixed list of frames."""
+
+    def __init__(self, responses: list[str]) -> None:
+        self.responses = list(responses)
+
+    def settimeout(self, _timeout: float) -> None:
+        return None
+
+    def connect(self, _address: tuple[str, int]) -> None:
+        return None
+
+    def send(self, data: bytes) -> int:
+        return len(data)
+
+    def recv(self, _size: int) -> bytes:
+        return self.responses.pop(0).encode()
+
+    def close(self) -> None:
+        return None
+
+    def __enter__(self) -> "FakeSocket":
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        return None
+
+
+def _client(**kwargs: Any) -> DuepiEvoClient:
+    return DuepiEvoClient(
+        host="192.168.1.12",
+        port=2000,
+        min_temp=16.0,
+        max_temp=30.0,
+        no_feedback=16.0,
+        auto_reset=False,
+        init_command=False,
+        **kwargs,
+    )
+
+
+def _recorded_client(monkeypatch: pytest.MonkeyPatch) -> DuepiEvoClient:
+    monkeypatch.setattr("socket.socket", lambda *_args, **_kwargs: FakeSocket(RESPONSES))
+    client = _client()
+    client.fetch_state()
+    return client
+
+
+def _spread(entries: list, delay: float) -> list:
+    """Give every response the same recorded delay after its request."""
+    timed = []
+    sent_at = 0.0
+    for _, direction, frame in entries:
+        if direction == DIRECTION_TX:
+            sent_at += 1.0
+            timed.append((sent_at, direction, frame))
+        else:
+            timed.append((sent_at + delay, direction, frame))
+    return timed
+
+
+def test_replay_of_diagnostics_trace_reproduces_snapshot(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """A trace taken from a diagnostics download replays into the same state."""
+    recorder = _recorded_client(monkeypatch)
+    path = tmp_path / "diagnostics.json"
+    path.write_text(json.dumps({"data": {"wire_trace": recorder.trace.as_list()}}), encoding="utf-8")
+
+    transport = ReplayTransport(load_trace(path))
+    state = _client(transport=transport).fetch_state()
+
+    assert state.burner_status == "Flame On"
+    assert state.current_temp_c == 21.5
+    assert state.total_burn_time_h == 500
+    assert transport.exhausted
+    assert transport.connections == 1
+
+
+def test_replay_ends_when_only_writes_or_unsent_frames_remain(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A trailing write is not waited for, nor a frame this client never sends."""
+    entries = _recorded_client(monkeypatch).trace.entries()
+    entries += [(0.0, DIRECTION_TX, b"\x1bRF00305B&"), (0.0, DIRECTION_RX, b"\x1b00000020&")]
+    transport = ReplayTransport(entries)
+
+    polls = list(replay_polls(_client(transport=transport), transport))
+    assert len(polls) == 1
+    assert transport.exhausted
+
+    # Recorded with the init command, replayed without it: the poll matches nothing.
+    entries = [(0.0, DIRECTION_TX, b"\x1bRDC00069&"), (0.0, DIRECTION_RX, b"\x1b00000000&")]
+    transport = ReplayTransport(entries)
+    polls = list(replay_polls(_client(transport=transport, timeout=0.01), transport))
+    assert len(polls) == 1
+    assert not transport.exhausted
+
+
+def test_pipelined_writes_replay_frame_by_frame(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A pipelined client replays sequential and pipelined traces alike."""
+    monkeypatch.setattr("socket.socket", lambda *_args, **_kwargs: FakeSocket(RESPONSES))
+    pipelined = _client(pipeline=True)
+    pipelined.fetch_state()
+    traces = [_recorded_client(monkeypatch).trace.entries(), pipelined.trace.entries()]
+
+    for entries in traces:
+        transport = ReplayTransport(entries, strict=True)
+        polls = list(replay_polls(_client(transport=transport, pipeline=True), transport))
+
+        assert len(polls) == 1
+        state = polls[0][1]
+        assert state.burner_status == "Flame On"
+        assert state.total_burn_time_h == 500
+        assert transport.exhausted
+
+
+def test_realtime_replay_keeps_recorded_response_delay(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Realtime mode waits for the recorded delay; fast mode does not."""
+    entries = _spread(_recorded_client(monkeypatch).trace.entries(), delay=0.02)
+
+    started = time.monotonic()
+    _client(transport=ReplayTransport(entries)).fetch_state()
+    fast = time.monotonic() - started
+
+    started = time.monotonic()
+    _client(transport=ReplayTransport(entries, realtime=True)).fetch_state()
+    realtime = time.monotonic() - started
+
+    assert realtime >= 12 * 0.02
+    assert fast < realtime
+
+
+def test_recorded_delay_beyond_timeout_raises_timeout(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A response slower than the client timeout replays as a time-out."""
+    entries = _spread(_recorded_client(monkeypatch).trace.entries(), delay=5.0)
+    transport = ReplayTransport(entries, realtime=True, speed=100.0)
+
+    with pytest.raises(DuepiEvoTimeoutError):
+        _client(transport=transport, timeout=0.01).fetch_state()
+
+
+def test_proxy_log_and_strict_mismatch(tmp_path: Path) -> None:
+    """Proxy output loads as untimed frames; strict replays reject unexpected frames."""
+    path = tmp_path / "proxy.log"
+    path.write_text(
+        "Waiting for a connection...\n"
+        "tx: b'\\x1bRD900058&',rx: b'\\x1b00000020&'\n",
+        encoding="utf-8",
+    )
+    entries = load_trace(path)
+    assert entries == [(0.0, DIRECTION_TX, b"\x1bRD900058&"), (0.0, DIRECTION_RX, b"\x1b00000020&")]
+
+    transport = ReplayTransport(entries, strict=True)
+    with pytest.raises(ReplayMismatchError):
+        transport.match(b"\x1bRD100057&")
+
+
+def test_trace_from_diagnostics_accepts_bare_data() -> None:
+    """Both the full download and its data part are accepted."""
+    data = {"wire_trace": [{"t": 1.5, "dir": "rx", "frame": "\x1b00000020&"}]}
+    assert trace_from_diagnostics(data) == [(1.5, DIRECTION_RX, b"\x1b00000020&")]
@@ -0,0 +1,130 @@
+"""Unit tests for hourly long-term statistics aggregation."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import replace
+from datetime import UTC, datetime
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.duepi_evo.duepi_core import DuepiEvoState
+from custom_components.duepi_evo.statistics import (
+    STATISTIC_SPECS,
+    HourlyStatisticsCollector,
+    statistic_id,
+    statistics_storage_key,
+)
+
+
+def _state(**overrides) -> DuepiEvoState:
+    values = {
+        "burner_status": "Flame On",
+        "error_code": "All OK",
+        "exh_fan_speed_rpm": 500,
+        "flu_gas_temp_c": 200,
+        "pellet_speed": 20,
+        "power_level": "Low",
+        "pcb_temp_c": 45,
+        "total_burn_time_h": 500,
+        "burn_time_since_reset_h": 42,
+        "pressure_switch_active": True,
+        "current_temp_c": 21.5,
+        "target_temp_c": 23.0,
+        "hvac_mode": "heat",
+        "heating": True,
+    }
+    values.update(overrides)
+    return DuepiEvoState(**values)
+
+
+def test_close_hour_builds_mean_and_counter_rows() -> None:
+    """Measurements get mean/min/max; counters get state and the hourly increase."""
+    collector = HourlyStatisticsCollector(hass=None, unique_base="192.168.1.12:2000", name="Stove")
+    hour = datetime(2026, 1, 5, 10, tzinfo=UTC)
+
+    collector.async_add_sample(_state(flu_gas_temp_c=180), hour.replace(minute=1))
+    collector.async_add_sample(_state(flu_gas_temp_c=220, total_burn_time_h=501), hour.replace(minute=30))
+    collector.async_add_sample(
+        replace(_state(flu_gas_temp_c=200, total_burn_time_h=502), burn_time_since_reset_h=1),
+        hour.replace(minute=59),
+    )
+    rows = {spec.key: row for spec, row in collector.close_hour()}
+
+    assert rows["flu_gas_temp"] == {"start": hour, "mean": 200.0, "min": 180, "max": 220}
+    assert rows["total_burn_time"] == {"start": hour, "state": 502, "sum": 2}
+    assert rows["burn_time_since_reset"] == {"start": hour, "state": 1, "sum": 1}
+    assert collector.close_hour() == []
+
+
+def test_statistic_ids_are_valid_external_ids() -> None:
+    """External statistic IDs use the integration domain as source prefix."""
+    assert statistic_id("192.168.1.12:2000", STATISTIC_SPECS[0]) == "duepi_evo:192_168_1_12_2000_flu_gas_temp"
+
+
+async def test_unload_keeps_the_open_hour_and_counters_for_the_next_load(hass, hass_storage) -> None:
+    """A reload saves the partial hour instead of importing it, then resumes it."""
+    key = statistics_storage_key("entry")
+    hour = datetime(2026, 1, 5, 10, tzinfo=UTC)
+    collector = HourlyStatisticsCollector(
+        hass=hass, unique_base="192.168.1.12:2000", name="Stove", storage_key=key
+    )
+    with patch.object(HourlyStatisticsCollector, "_async_import") as import_rows:
+        await collector.async_restore()
+        collector.async_add_sample(_state(flu_gas_temp_c=180), hour.replace(minute=1))
+        collector.async_add_sample(_state(flu_gas_temp_c=220, total_burn_time_h=501), hour.replace(minute=20))
+        await collector.async_unload()
+    import_rows.assert_not_called()
+    assert hass_storage[key]["data"]["hour_start"] == hour.isoformat()
+
+    reloaded = HourlyStatisticsCollector(
+        hass=hass, unique_base="192.168.1.12:2000", name="Stove", storage_key=key
+    )
+    await reloaded.async_restore()
+    reloaded.async_add_sample(_state(flu_gas_temp_c=200, total_burn_time_h=503), hour.replace(minute=50))
+    rows = {spec.key: row for spec, row in reloaded.close_hour()}
+
+    assert rows["flu_gas_temp"] == {"start": hour, "mean": 200.0, "min": 180, "max": 220}
+    assert rows["total_burn_time"] == {"start": hour, "state": 503, "sum": 3}
+
+
+async def test_restore_seeds_counters_from_the_last_imported_statistic(hass) -> None:
+    """Without saved state the counter continues from the recorder's last row."""
+    collector = HourlyStatisticsCollector(hass=hass, unique_base="192.168.1.12:2000", name="Stove")
+    last = {"state": 500.0, "sum": 40.0}
+    with patch.object(HourlyStatisticsCollector, "_async_last_statistic", return_value=last):
+        await collector.async_restore()
+    hour = datetime(2026, 1, 5, 10, tzinfo=UTC)
+    collector.async_add_sample(_state(total_burn_time_h=502), hour.replace(minute=5))
+    rows = {spec.key: row for spec, row in collector.close_hour()}
+
+    assert rows["total_burn_time"] == {"start": hour, "state": 502, "sum": 2}
+
+
+async def test_back_to_back_imports_continue_each_others_sum(hass) -> None:
+    """Concurrent imports read the stored sum once and add both increases."""
+    pytest.importorskip("homeassistant.components.recorder.statistics")
+    collector = HourlyStatisticsCollector(hass=hass, unique_base="192.168.1.12:2000", name="Stove")
+    spec = next(spec for spec in STATISTIC_SPECS if spec.key == "total_burn_time")
+    hour = datetime(2026, 1, 5, 10, tzinfo=UTC)
+
+    async def last_statistic(_spec):
+        await asyncio.sleep(0)
+        return {"state": 500.0, "sum": 10.0}
+
+    with (
+        patch.object(
+            HourlyStatisticsCollector, "_async_last_statistic", side_effect=last_statistic
+        ) as lookup,
+        patch(
+            "homeassistant.components.recorder.statistics.async_add_external_statistics"
+        ) as add_statistics,
+    ):
+        await asyncio.gather(
+            collector._async_import([(spec, {"start": hour, "state": 502, "sum": 2})]),
+            collector._async_import([(spec, {"start": hour, "state": 505, "sum": 3})]),
+        )
+
+    assert lookup.call_count == 1
+    assert [call.args[2][0]["sum"] for call in add_statistics.call_args_list] == [12.0, 15.0]
@@ -0,0 +1,63 @@
+"""Unit tests for the telemetry ring buffer."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.duepi_evo.duepi_core.telemetry import RollingSeries, TelemetryBuffer
+
+
+def _reference(samples: list[tuple[float, float]]) -> tuple[float, float, float]:
+    """Compute mean, population variance and slope from scratch."""
+    n = len(samples)
+    mean_t = sum(t for t, _ in samples) / n
+    mean_v = sum(v for _, v in samples) / n
+    variance = sum((v - mean_v) ** 2 for _, v in samples) / n
+    slope = sum((t - mean_t) * (v - mean_v) for t, v in samples) / sum(
+        (t - mean_t) ** 2 for t, _ in samples
+    )
+    return mean_v, variance, slope
+
+
+def test_rolling_statistics_match_recomputation_across_wraps() -> None:
+    """Incremental sums stay equal to a full recomputation over the window."""
+    series = RollingSeries(8)
+    history = []
+    for step in range(50):
+        now = 1_000_000.0 + step * 30.0
+        value = 20.0 + 0.01 * step + (step % 3) * 0.2
+        series.add(now, value)
+        history.append((now, value))
+
+    window = history[-8:]
+    mean, variance, slope = _reference(window)
+    assert len(series) == 8
+    assert series.samples() == pytest.approx(window)
+    assert series.mean == pytest.approx(mean)
+    assert series.variance == pytest.approx(variance)
+    assert series.slope == pytest.approx(slope)
+    assert series.last == window[-1][1]
+    assert series.span == pytest.approx(210.0)
+
+
+def test_slope_needs_two_samples() -> None:
+    """A single sample has a mean but no slope."""
+    series = RollingSeries(4)
+    assert series.mean is None
+    series.add(5.0, 1.0)
+    assert series.mean == 1.0
+    assert series.slope is None
+
+
+def test_buffer_skips_missing_fields() -> None:
+    """Fields the stove did not report are not recorded."""
+    buffer = TelemetryBuffer(("current_temp_c", "pcb_temp_c"), 4)
+    buffer.add(SimpleNamespace(current_temp_c=21.0, pcb_temp_c=None), 0.0)
+
+    result = buffer.as_dict(clock_offset=100.0)
+
+    assert result["current_temp_c"]["samples"] == [[100.0, 21.0]]
+    assert result["pcb_temp_c"]["samples"] == []
+    assert result["pcb_temp_c"]["mean"] is None
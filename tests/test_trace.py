@@ -0,0 +1,29 @@
+"""Unit tests for the wire trace ring buffer."""
+
+from __future__ import annotations
+
+from custom_components.duepi_evo.duepi_core.trace import DIRECTION_RX, DIRECTION_TX, WireTrace
+
+
+def test_trace_keeps_last_frames_in_order() -> None:
+    """Only the newest frames are kept, oldest first."""
+    trace = WireTrace(capacity=3)
+    for index in range(5):
+        trace.record(DIRECTION_TX if index % 2 == 0 else DIRECTION_RX, f"f{index}".encode())
+
+    entries = trace.entries()
+    assert [frame for _, _, frame in entries] == [b"f2", b"f3", b"f4"]
+    assert [direction for _, direction, _ in entries] == [DIRECTION_TX, DIRECTION_RX, DIRECTION_TX]
+    assert entries[0][0] <= entries[-1][0]
+
+
+def test_trace_serializes_bytes_losslessly() -> None:
+    """Raw bytes survive the JSON form, escape characters included."""
+    trace = WireTrace(capacity=4)
+    trace.record(DIRECTION_TX, b"\x1bRD900058&")
+    trace.record(DIRECTION_RX, b"\x1b02000000&\xff")
+
+    serialized = trace.as_list()
+
+    assert [entry["dir"] for entry in serialized] == ["tx", "rx"]
+    assert serialized[1]["frame"].encode("latin-1") == b"\x1b02000000&\xff"
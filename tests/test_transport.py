@@ -0,0 +1,290 @@
+"""Unit tests for the pluggable transports and the framed reader."""
+
+from __future__ import annotations
+
+import os
+import select
+import socket
+import threading
+
+import pytest
+
+from custom_components.duepi_evo.duepi_core import DuepiEvoCapabilities, DuepiEvoClient
+from custom_components.duepi_evo.duepi_core.transport import (
+    DuepiEvoTransport,
+    FailoverTransport,
+    LoopbackTransport,
+    SerialTransport,
+    TcpTransport,
+    configure_keepalive,
+    create_transport,
+    parse_endpoints,
+    read_frame,
+)
+
+REGISTERS = {
+    b"D9000": b"\x1b02000000&",  # status => Flame On
+    b"D3000": b"\x1b00030000&",  # power level => Medium
+    b"D1000": b"\x1b00D70000&",  # ambient => 21.5 C
+    b"D4000": b"\x1b00140000&",  # pellet speed => 20
+    b"D0000": b"\x1b00C80000&",  # flugas => 200 C
+    b"EF000": b"\x1b00320000&",  # exh fan => 500 rpm
+    b"DA000": b"\x1b00000000&",  # error => All OK
+    b"C6000": b"\x1b00170000&",  # setpoint => 23
+}
+
+
+def _respond(frame: bytes) -> bytes | None:
+    return REGISTERS.get(frame[2:7])
+
+
+def _client(**kwargs) -> DuepiEvoClient:
+    return DuepiEvoClient(
+        host="127.0.0.1",
+        port=2000,
+        min_temp=16.0,
+        max_temp=30.0,
+        no_feedback=16.0,
+        auto_reset=False,
+        init_command=False,
+        capabilities=DuepiEvoCapabilities(
+            pcb_temp=False,
+            total_burn_time=False,
+            burn_time_since_reset=False,
+            pressure_switch=False,
+        ),
+        **kwargs,
+    )
+
+
+class ChunkedConnection:
+    """Connection delivering a response in fixed pieces, like a serial line."""
+
+    def __init__(self, chunks: list[bytes]) -> None:
+        self.chunks = list(chunks)
+
+    def recv(self, size: int) -> bytes:
+        chunk = self.chunks.pop(0)
+        assert len(chunk) <= size
+        return chunk
+
+    def wait_readable(self, _timeout: float) -> bool:
+        return bool(self.chunks)
+
+
+def test_read_frame_reassembles_split_frames() -> None:
+    """A frame arriving in pieces is returned whole, the next one untouched."""
+    conn = ChunkedConnection([b"\x1b02", b"0000", b"00&", b"\x1b00D70000&"])
+
+    assert read_frame(conn) == b"\x1b02000000&"
+    assert read_frame(conn) == b"\x1b00D70000&"
+
+
+def test_read_frame_returns_garbage_and_short_valid_frames_as_is() -> None:
+    """Only chunks that start like a frame are completed."""
+    assert read_frame(ChunkedConnection([b"bad", b"\x1b02000000&"])) == b"bad"
+    assert read_frame(ChunkedConnection([b" 00D70000"])) == b" 00D70000"
+
+
+def test_pipelined_snapshot_matches_sequential_snapshot() -> None:
+    """Pipelining changes the framing on the wire, not the decoded state."""
+    sequential = _client(transport=LoopbackTransport(_respond))
+    pipelined = _client(transport=LoopbackTransport(_respond), pipeline=True)
+
+    assert pipelined.fetch_state() == sequential.fetch_state()
+    assert pipelined.query_plan("Off")[:2] == ["D9000", "D3000"]
+    assert sequential.query_plan("Off")[:2] == ["D9000", "D1000"]
+    assert pipelined.metrics.command("C6000").count == 1
+
+
+def test_create_transport_selects_serial_for_device_paths() -> None:
+    """A device path as host means a stove wired to a local serial port."""
+    assert isinstance(create_transport("/dev/ttyUSB0", 23), SerialTransport)
+    assert isinstance(create_transport("192.168.1.20", 23), TcpTransport)
+    assert create_transport("/dev/ttyUSB0", 23).baudrate == 115200
+
+
+def test_extra_endpoints_build_a_failover_transport() -> None:
+    """Bare ports share the configured host; the primary endpoint is not repeated."""
+    endpoints = parse_endpoints("2000, 192.168.1.21:23 23", "192.168.1.20")
+    assert endpoints == [("192.168.1.20", 2000), ("192.168.1.21", 23), ("192.168.1.20", 23)]
+
+    transport = create_transport("192.168.1.20", 23, endpoints)
+    assert isinstance(transport, FailoverTransport)
+    assert [item.describe() for item in transport.transports] == [
+        "192.168.1.20:23",
+        "192.168.1.20:2000",
+        "192.168.1.21:23",
+    ]
+    with pytest.raises(ValueError):
+        parse_endpoints("23, 70000", "192.168.1.20")
+
+
+class RefusingTransport(DuepiEvoTransport):
+    """Bridge port held by another app."""
+
+    def __init__(self) -> None:
+        self.attempts = 0
+
+    def connect(self, timeout: float | None):
+        self.attempts += 1
+        raise ConnectionRefusedError("Connection refused")
+
+
+def test_transport_without_connect_cannot_be_created() -> None:
+    """A transport that forgets ``connect`` fails when built, not on the first poll."""
+
+    class Unfinished(DuepiEvoTransport):
+        pass
+
+    with pytest.raises(TypeError):
+        Unfinished()
+
+
+def test_failover_skips_a_refused_endpoint_during_its_cooldown() -> None:
+    """A refused connect fails over at once and keeps off that port for a while."""
+    now = [100.0]
+    busy = RefusingTransport()
+    transport = FailoverTransport([busy, LoopbackTransport(_respond)], clock=lambda: now[0])
+    client = _client(transport=transport)
+
+    assert client.fetch_state().burner_status == "Flame On"
+    assert client.fetch_state().burner_status == "Flame On"
+    assert busy.attempts == 1
+    assert transport.active == 1
+    assert transport.failovers == 1
+
+    health = transport.health()
+    assert health[0]["failures"] == 1
+    assert health[0]["cooldown_s"] == 60.0
+    assert health[1]["connects"] == 2
+    assert health[1]["active"] is True
+
+    now[0] += 61
+    assert transport.health()[0]["cooldown_s"] == 0.0
+    assert transport.candidates() == [1, 0]
+
+
+def test_failover_retries_a_poll_that_stalls_after_connecting() -> None:
+    """A port that accepts but stays silent is cooled down and the poll retried."""
+    silent = LoopbackTransport(lambda _frame: None)
+    answering = LoopbackTransport(_respond)
+    transport = FailoverTransport([silent, answering])
+    client = _client(transport=transport, timeout=0.01)
+    retries = []
+    client.hooks.add("retry", lambda _event, fields: retries.append(fields))
+
+    assert client.fetch_state().current_temp_c == 21.5
+    assert retries == [{"reason": "failover", "endpoint": "loopback"}]
+    assert transport.active == 1
+    assert transport.health()[0]["consecutive_failures"] == 1
+    assert transport.health()[1]["latency_ms"] is not None
+
+
+def test_failover_prefers_the_faster_endpoint() -> None:
+    """Measured endpoints are tried fastest first, unmeasured ones after them."""
+    transport = FailoverTransport([LoopbackTransport(_respond) for _ in range(3)])
+    transport.active = 1
+    transport.report_success(40.0)
+    transport.active = 2
+    transport.report_success(10.0)
+
+    assert transport.candidates() == [2, 1, 0]
+
+
+def test_persistent_client_reuses_one_connection() -> None:
+    """Polls and the heartbeat share the connection while it keeps answering."""
+    transport = LoopbackTransport(_respond)
+    client = _client(transport=transport, persistent=True, heartbeat_interval=0)
+
+    client.fetch_state()
+    assert client.heartbeat() is True
+    client.fetch_state()
+
+    assert transport.connections == 1
+    assert client.metrics.stale_connections == 0
+    client.close()
+
+
+def test_heartbeat_replaces_a_half_open_connection() -> None:
+    """A connection that stopped answering is swapped before the next poll."""
+    silent = [False]
+    transport = LoopbackTransport(lambda frame: None if silent[0] else _respond(frame))
+    client = _client(transport=transport, persistent=True, heartbeat_interval=0, timeout=0.01)
+    retries = []
+    client.hooks.add("retry", lambda _event, fields: retries.append(fields))
+
+    client.fetch_state()
+    silent[0] = True
+    assert client.heartbeat() is True
+    assert transport.connections == 2
+    assert client.metrics.stale_connections == 1
+    assert retries[0]["reason"] == "stale_connection"
+
+    silent[0] = False
+    assert client.fetch_state().burner_status == "Flame On"
+    assert transport.connections == 2
+
+
+def test_heartbeat_waits_for_the_idle_interval() -> None:
+    """A recently used connection is not probed."""
+    sent = []
+    transport = LoopbackTransport(lambda frame: sent.append(frame) or _respond(frame))
+    client = _client(transport=transport, persistent=True, heartbeat_interval=60)
+
+    client.fetch_state()
+    count = len(sent)
+    assert client.heartbeat() is True
+    assert len(sent) == count
+
+
+@pytest.mark.usefixtures("socket_enabled")
+def test_configure_keepalive_enables_keepalive_probes() -> None:
+    """The socket is switched to keepalive with the requested idle time."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        configure_keepalive(sock, idle=7, interval=2, count=4)
+        assert sock.getsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE) == 1
+        if hasattr(socket, "TCP_KEEPIDLE"):
+            assert sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE) == 7
+            assert sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT) == 4
+
+
+@pytest.mark.skipif(not hasattr(os, "openpty"), reason="needs a pseudo-terminal")
+def test_serial_transport_polls_over_a_pty() -> None:
+    """The serial transport reads a full snapshot from a pty-backed stove."""
+    master, slave = os.openpty()
+    device = os.ttyname(slave)
+    stop = threading.Event()
+
+    def stove() -> None:
+        buffer = b""
+        while not stop.is_set():
+            if not select.select([master], [], [], 0.05)[0]:
+                continue
+            try:
+                buffer += os.read(master, 64)
+            except OSError:
+                continue
+            while b"&" in buffer:
+                frame, _, buffer = buffer.partition(b"&")
+                response = _respond(frame + b"&")
+                if response:
+                    # Answer in two writes to exercise the framed reader.
+                    os.write(master, response[:4])
+                    os.write(master, response[4:])
+
+    thread = threading.Thread(target=stove, daemon=True)
+    thread.start()
+    try:
+        client = _client(transport=SerialTransport(device), timeout=1.0, pipeline=True)
+        state = client.fetch_state()
+    finally:
+        stop.set()
+        thread.join()
+        os.close(slave)
+        os.close(master)
+
+    assert state.burner_status == "Flame On"
+    assert state.power_level == "Medium"
+    assert state.current_temp_c == 21.5
+    assert state.target_temp_c == 23.0
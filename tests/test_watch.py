@@ -0,0 +1,170 @@
+"""Tests for the live ``duepi watch`` view."""
+
+from __future__ import annotations
+
+from collections import Counter
+import io
+
+import pytest
+
+from custom_components.duepi_evo.duepi_core import DuepiEvoClient, LoopbackTransport
+from custom_components.duepi_evo.duepi_core.cli import (
+    Stove,
+    parse_inventory,
+    run_command,
+    watch_stoves,
+)
+from custom_components.duepi_evo.duepi_core.watch import (
+    SLOW_TIER,
+    UNSUPPORTED_AFTER_TIMEOUTS,
+    WATCH_FIELDS,
+    StoveWatcher,
+    WatchScreen,
+)
+
+REGISTERS = {
+    b"D9000": b"\x1b02000000&",  # status => Flame On
+    b"D3000": b"\x1b00030000&",  # power level => Medium
+    b"D1000": b"\x1b00D70000&",  # ambient => 21.5 C
+    b"D4000": b"\x1b00140000&",  # pellet speed => 20
+    b"D0000": b"\x1b00C80000&",  # flugas => 200 C
+    b"EF000": b"\x1b00320000&",  # exh fan => 500 rpm
+    b"DA000": b"\x1b00000000&",  # error => All OK
+    b"C6000": b"\x1b00170000&",  # setpoint => 23
+    b"DF000": b"\x1b001E0000&",  # PCB => 30 C
+}
+
+
+class CountingStove:
+    """Loopback stove counting reads per register; burn time is unsupported."""
+
+    def __init__(self) -> None:
+        self.reads: Counter[bytes] = Counter()
+        self.registers = dict(REGISTERS)
+
+    def __call__(self, frame: bytes) -> bytes | None:
+        self.reads[frame[2:7]] += 1
+        return self.registers.get(frame[2:7])
+
+
+def _client(stove: CountingStove) -> DuepiEvoClient:
+    return DuepiEvoClient(
+        "127.0.0.1",
+        23,
+        min_temp=0,
+        max_temp=100,
+        no_feedback=16,
+        auto_reset=False,
+        init_command=False,
+        timeout=0.01,
+        transport=LoopbackTransport(stove),
+        persistent=True,
+    )
+
+
+def _watcher(stove: CountingStove) -> StoveWatcher:
+    return StoveWatcher(
+        "living", _client(stove), lambda client, command: run_command(client, command, None)
+    )
+
+
+def test_registers_are_read_in_tiers() -> None:
+    """Status every tick, combustion values every fifth, counters every thirtieth."""
+    stove = CountingStove()
+    watcher = _watcher(stove)
+
+    for tick in range(SLOW_TIER + 1):
+        watcher.poll(tick)
+
+    assert stove.reads[b"D9000"] == 31
+    assert stove.reads[b"D1000"] == 31
+    assert stove.reads[b"D0000"] == 7
+    assert stove.reads[b"C6000"] == 2
+    # Unanswered optional register: asked again on the slow tier only.
+    assert stove.reads[b"EE000"] == 2
+    assert watcher.values["burn-time"] == "-"
+    assert watcher.values["temperature"] == "21.5"
+    assert watcher.error is None
+
+
+def test_optional_register_is_hidden_only_after_repeated_timeouts() -> None:
+    """A dropped answer keeps the last value; a register that never answers is given up."""
+    stove = CountingStove()
+    watcher = _watcher(stove)
+    watcher.poll(0)
+    del stove.registers[b"DF000"]
+
+    watcher.poll(SLOW_TIER)
+    assert watcher.values["pcb-temp"] == "30"
+    stove.registers[b"DF000"] = REGISTERS[b"DF000"]
+    watcher.poll(2 * SLOW_TIER)
+    assert watcher.timeouts == {"burn-time": 3}
+    assert watcher.unsupported == {"burn-time"}
+
+    del stove.registers[b"DF000"]
+    for tick in range(3, 3 + UNSUPPORTED_AFTER_TIMEOUTS):
+        watcher.poll(tick * SLOW_TIER)
+    assert "pcb-temp" in watcher.unsupported
+    reads = stove.reads[b"DF000"]
+    watcher.poll(10 * SLOW_TIER)
+    assert stove.reads[b"DF000"] == reads
+
+
+def test_status_change_refreshes_every_field_on_the_next_tick() -> None:
+    """A new burner status means the slow fields may be stale too."""
+    stove = CountingStove()
+    watcher = _watcher(stove)
+    watcher.poll(0)
+    stove.registers[b"D9000"] = b"\x1b00000020&"
+    stove.registers[b"D3000"] = b"\x1b00000000&"
+
+    assert watcher.poll(1) == {"status": "Off"}
+    assert watcher.poll(2) == {"power": "Off"}
+    assert stove.reads[b"C6000"] == 2
+
+
+def test_screen_rewrites_only_changed_cells() -> None:
+    """The second frame only addresses the cell whose text changed."""
+    stream = io.StringIO()
+    screen = WatchScreen(stream, ["living", "shed"], WATCH_FIELDS)
+    rows = [{"name": "living", "status": "Off"}, {"name": "shed", "status": "Flame On"}]
+    screen.draw(rows, "tick 0")
+    first = screen.cells_written
+    stream.seek(0)
+    stream.truncate()
+
+    rows[1] = {"name": "shed", "status": "Cooling down"}
+    screen.draw(rows, "tick 1")
+
+    assert first == 2 * (len(WATCH_FIELDS) + 2)
+    assert screen.cells_written == first + 1
+    assert "Cooling down" in stream.getvalue()
+    assert "living" not in stream.getvalue()
+
+
+def test_watch_logs_changes_when_not_on_a_terminal() -> None:
+    """Several stoves are watched from one process; pipes get change lines."""
+    stoves = {"living": CountingStove(), "shed": CountingStove()}
+    stream = io.StringIO()
+
+    code = watch_stoves(
+        [Stove(name, "127.0.0.1") for name in stoves],
+        lambda stove: _client(stoves[stove.name]),
+        interval=0,
+        stream=stream,
+        ticks=2,
+    )
+
+    lines = stream.getvalue().splitlines()
+    assert code == 0
+    assert [line.split()[1] for line in lines] == ["living", "shed"]
+    assert "status=Flame On" in lines[0]
+    assert all(stove.reads[b"D9000"] == 2 for stove in stoves.values())
+
+
+def test_empty_inventory_is_rejected() -> None:
+    """Watching nothing is an error rather than an idle loop."""
+    with pytest.raises(ValueError):
+        parse_inventory("# no stoves yet\n")
+    with pytest.raises(ValueError):
+        watch_stoves([], lambda stove: None, stream=io.StringIO(), ticks=1)